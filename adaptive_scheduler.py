@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+적응형 수집 주기 스케줄러
+- 과열도/축적도 점수가 액션 레벨 경계(get_heat_action/get_accumulation_action)에 가깝거나
+  개별 지표가 자기 임계값에 가까우면 주기를 줄임
+- 최근 가격 변동성이 크면 주기를 줄임
+- 사이클이 직접 호출하는 소스의 남은 호출 예산(현재 호출 속도로 예상한 잔여 포함)이 부족하면 주기를 늘림
+  (트렌드 워커가 자기 주기로 쓰는 google_trends 예산은 수집 주기와 무관)
+"""
+
+import math
+import time
+import threading
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional
+
+from strategy_engine import PROFILES, GROUPS
+
+logger = logging.getLogger(__name__)
+
+# 액션 레벨 경계 (BitcoinHalvingStrategy.get_heat_action / get_accumulation_action)
+HEAT_LEVELS = (30, 50, 70, 85)
+ACCUMULATION_LEVELS = (30, 50, 70)
+
+
+def _proximity(distance: float, band: float) -> float:
+    """경계까지 거리 -> 근접도 (0: band 밖, 1: 경계 위)"""
+    return max(0.0, 1 - distance / band) if band > 0 else 0.0
+
+
+class AdaptiveScheduler:
+    """다음 수집까지의 대기 시간 계산
+
+    interval = max_interval에서 근접도(urgency)만큼 min_interval 쪽으로 당긴 뒤
+    변동성으로 나누고, 남은 호출 예산이 budget_floor 아래면 그 비율만큼 늘린다.
+    """
+
+    def __init__(self, profile: str = 'halving', market=None,
+                 min_interval: float = 60, max_interval: float = 900,
+                 score_band: float = 10, indicator_band: float = 0.1,
+                 volatility_ref: float = 0.01, budget_floor: float = 0.5,
+                 budget_max_interval: float = 3600):
+        self.profile = PROFILES[profile]
+        self.market = market
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.score_band = score_band
+        self.indicator_band = indicator_band
+        self.volatility_ref = volatility_ref
+        self.budget_floor = budget_floor
+        self.budget_max_interval = budget_max_interval
+
+        self.prices = deque(maxlen=12)
+        self.heat_score = None
+        self.acc_score = None
+        self.values = {}
+        self.last_decision = None
+        self._wake = threading.Event()
+
+    # ===== 관측 =====
+
+    def observe(self, heat_score: float, acc_score: float, price: Optional[float] = None,
+                values: Optional[Dict[str, float]] = None):
+        """한 사이클 결과 기록"""
+        self.heat_score = heat_score
+        self.acc_score = acc_score
+        if price:
+            self.prices.append(price)
+        if values:
+            self.values = dict(values)
+
+    # ===== 요인 =====
+
+    def score_urgency(self) -> float:
+        """점수가 액션 레벨 경계에 가까운 정도"""
+        urgency = 0.0
+        for score, levels in ((self.heat_score, HEAT_LEVELS), (self.acc_score, ACCUMULATION_LEVELS)):
+            if score is None:
+                continue
+            distance = min(abs(score - level) for level in levels)
+            urgency = max(urgency, _proximity(distance, self.score_band))
+        return urgency
+
+    def indicator_urgency(self) -> Dict[str, float]:
+        """지표별 자기 임계값 근접도 (상대 거리 기준)"""
+        urgency = {}
+        for group in GROUPS:
+            for name, spec in self.profile.get(group, {}).items():
+                threshold = spec.get('above', spec.get('below'))
+                value = self.values.get(name)
+                if threshold is None or value is None or isinstance(value, bool):
+                    continue
+                distance = abs(value - threshold) / max(abs(threshold), 1e-9)
+                urgency[name] = round(_proximity(distance, self.indicator_band), 3)
+        return urgency
+
+    def volatility(self) -> float:
+        """최근 관측 가격의 사이클 간 로그 수익률 표준편차"""
+        prices = [p for p in self.prices if p > 0]
+        if len(prices) < 3:
+            return 0.0
+        returns = [math.log(b / a) for a, b in zip(prices, prices[1:])]
+        mean = sum(returns) / len(returns)
+        return math.sqrt(sum((r - mean) ** 2 for r in returns) / len(returns))
+
+    def budget_remaining(self) -> Dict[str, float]:
+        if self.market is None:
+            return {}
+        return self.market.remaining_budget(self.market.cycle_sources())
+
+    # ===== 결정 =====
+
+    def next_interval(self) -> float:
+        """다음 수집까지 대기 시간 (초)"""
+        indicator_urgency = self.indicator_urgency()
+        urgency = max([self.score_urgency(), *indicator_urgency.values()])
+        interval = self.max_interval - (self.max_interval - self.min_interval) * urgency
+
+        volatility = self.volatility()
+        interval /= 1 + volatility / self.volatility_ref
+
+        budget = self.budget_remaining()
+        warnings = self.market.budget.warnings(sources=self.market.cycle_sources()) if self.market is not None else []
+        if warnings and warnings != (self.last_decision or {}).get('budget_warnings'):
+            logger.warning(f"호출 예산 경고 - 수집 주기 늘림: {'; '.join(warnings)}")
+        tightest = min(budget, key=budget.get) if budget else None
+        if tightest is not None and budget[tightest] < self.budget_floor:
+            interval *= self.budget_floor / max(budget[tightest], 0.05)
+            interval = min(max(interval, self.min_interval), self.budget_max_interval)
+        else:
+            interval = min(max(interval, self.min_interval), self.max_interval)
+
+        self.last_decision = {
+            'interval': round(interval, 1),
+            'urgency': round(urgency, 3),
+            'indicator_urgency': indicator_urgency,
+            'volatility': round(volatility, 5),
+            'tightest_budget': {tightest: round(budget[tightest], 3)} if tightest else None,
+            'budget_warnings': warnings,
+            'decided_at': datetime.now().isoformat(),
+        }
+        return interval
+
+    def wait(self) -> float:
+        """다음 수집 시각까지 대기 (wake() 호출 시 즉시 깨어남)"""
+        interval = self.next_interval()
+        started = time.time()
+        self._wake.wait(interval)
+        self._wake.clear()
+        return time.time() - started
+
+    def wake(self):
+        """대기 중인 수집 루프를 즉시 깨움 (강제 새로고침 등)"""
+        self._wake.set()
+
+    def status(self) -> Dict:
+        return {
+            'min_interval': self.min_interval,
+            'max_interval': self.max_interval,
+            'last_decision': self.last_decision,
+        }
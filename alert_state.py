@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+레벨 변경 알림 상태 머신
+- 히스테리시스: 레벨 경계 근처에서 점수가 오르내려도 band(점수 %p) 이상 넘어가야 레벨 변경
+- 여러 레벨을 한 번에 건너뛰면 건너뛴 경계마다 band를 적용 - band를 넘긴 레벨까지만 후보
+- 최소 체류 시간: 새 레벨이 dwell초 이상 유지돼야 확정 (레벨별로 다르게 지정 가능)
+- 확정은 다음 관측 때 일어나므로 on_due를 지정하면 대기 후보의 체류 만료 시각에 재확인 호출
+- 확정 레벨/국면은 JSON 파일에 저장해 재시작 후에도 같은 알림을 다시 보내지 않음
+
+ALERT_STATE_PATH, ALERT_HYSTERESIS(기본 3), ALERT_DWELL(기본 600초) 환경변수로 기본값 지정
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+from typing import Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+STATE_PATH = os.getenv('ALERT_STATE_PATH', 'alert_state.json')
+DEFAULT_BAND = float(os.getenv('ALERT_HYSTERESIS', 3))
+DEFAULT_DWELL = float(os.getenv('ALERT_DWELL', 600))
+
+# 키별 설정 - dwell은 초 또는 {레벨: 초}
+DEFAULT_CONFIG = {
+    'heat_level': {'band': DEFAULT_BAND, 'dwell': DEFAULT_DWELL},
+    'accumulation_level': {'band': DEFAULT_BAND, 'dwell': DEFAULT_DWELL},
+    'halving_phase': {'band': 0, 'dwell': DEFAULT_DWELL},
+}
+
+_file_lock = threading.Lock()
+
+
+class LevelTracker:
+    """단일 레벨(또는 국면) 상태: 확정값 + 대기 중인 후보"""
+
+    def __init__(self, initial=None, band: float = DEFAULT_BAND,
+                 dwell: Union[float, Dict] = DEFAULT_DWELL):
+        self.level = initial
+        self.band = band
+        self.dwell = dwell
+        self.pending = None
+        self.pending_since = None
+        self.changed_at = None
+
+    def dwell_for(self, level) -> float:
+        if isinstance(self.dwell, dict):
+            return float(self.dwell.get(level, self.dwell.get(str(level), DEFAULT_DWELL)))
+        return float(self.dwell)
+
+    def _band_level(self, level, score: Optional[float], level_fn: Optional[Callable]):
+        """band를 넘긴 레벨 - 점수를 band만큼 되돌려도 도달하는 레벨까지만 (건너뛴 경계마다 적용)"""
+        if score is None or level_fn is None or not self.band or self.level is None:
+            return level
+        if level > self.level:
+            return max(self.level, min(level, level_fn(score - self.band)))
+        return min(self.level, max(level, level_fn(score + self.band)))
+
+    def due_at(self) -> Optional[float]:
+        """대기 후보가 확정 가능해지는 시각 (후보가 없으면 None)"""
+        if self.pending is None or self.pending_since is None:
+            return None
+        return self.pending_since + self.dwell_for(self.pending)
+
+    def update(self, level, score: Optional[float] = None, level_fn: Optional[Callable] = None,
+               now: Optional[float] = None) -> bool:
+        """관측 레벨 반영 -> 확정 레벨이 바뀌었으면 True"""
+        now = time.time() if now is None else now
+        level = self._band_level(level, score, level_fn)
+        if level == self.level:
+            self.pending = None
+            self.pending_since = None
+            return False
+
+        if level != self.pending:
+            self.pending = level
+            self.pending_since = now
+        if now - self.pending_since < self.dwell_for(level):
+            return False
+
+        self.level = level
+        self.changed_at = now
+        self.pending = None
+        self.pending_since = None
+        return True
+
+    def to_dict(self) -> Dict:
+        return {
+            'level': self.level,
+            'pending': self.pending,
+            'pending_since': self.pending_since,
+            'changed_at': self.changed_at,
+        }
+
+    def restore(self, data: Dict):
+        self.level = data.get('level', self.level)
+        self.pending = data.get('pending')
+        self.pending_since = data.get('pending_since')
+        self.changed_at = data.get('changed_at')
+
+
+class AlertState:
+    """전략(프로필:자산)별 레벨 트래커 모음 + 파일 저장
+
+    on_due: 대기 후보의 체류 시간이 끝나면 호출할 재확인 함수 (보통 check_and_alert)
+    - 이벤트 기반 모드처럼 다음 관측이 몇 시간 뒤일 수 있을 때 확정이 그만큼 늦어지지 않게
+    """
+
+    def __init__(self, namespace: str, path: str = STATE_PATH, config: Optional[Dict] = None,
+                 on_due: Optional[Callable] = None):
+        self.namespace = namespace
+        self.path = path
+        self.config = {**DEFAULT_CONFIG, **(config or {})}
+        self.trackers: Dict[str, LevelTracker] = {}
+        self.on_due = on_due
+        self._saved = self._load().get(namespace, {})
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_due: Optional[float] = None
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"알림 상태 파일 읽기 실패 ({self.path}): {e}")
+            return {}
+
+    def tracker(self, key: str, initial=None) -> LevelTracker:
+        if key not in self.trackers:
+            config = self.config.get(key, {})
+            tracker = LevelTracker(initial, config.get('band', DEFAULT_BAND), config.get('dwell', DEFAULT_DWELL))
+            if key in self._saved:
+                tracker.restore(self._saved[key])
+            self.trackers[key] = tracker
+        return self.trackers[key]
+
+    def level(self, key: str, initial=None):
+        """확정 레벨 (저장된 값이 없으면 initial)"""
+        return self.tracker(key, initial).level
+
+    def update(self, key: str, level, score: Optional[float] = None,
+               level_fn: Optional[Callable] = None) -> bool:
+        """관측 반영 -> 확정 레벨이 바뀌었으면 True (상태가 바뀌면 저장)"""
+        with self._lock:
+            tracker = self.tracker(key)
+            before = tracker.to_dict()
+            changed = tracker.update(level, score, level_fn)
+            if tracker.to_dict() != before:
+                self.save()
+            self._schedule_recheck()
+        return changed
+
+    def next_due(self) -> Optional[float]:
+        """가장 먼저 확정 가능해지는 대기 후보의 시각"""
+        due = [d for d in (t.due_at() for t in self.trackers.values()) if d is not None]
+        return min(due) if due else None
+
+    def _schedule_recheck(self):
+        """next_due에 on_due 한 번 호출 (이미 같은 시각으로 잡혀 있으면 그대로)"""
+        if self.on_due is None:
+            return
+        due = self.next_due()
+        if due == self._timer_due:
+            return
+        if self._timer:
+            self._timer.cancel()
+        self._timer = self._timer_due = None
+        if due is None:
+            return
+        delay = max(0.0, due - time.time()) + 1  # 체류 시간을 확실히 넘긴 뒤 관측
+        self._timer = threading.Timer(delay, self._recheck)
+        self._timer.daemon = True
+        self._timer_due = due
+        self._timer.start()
+
+    def _recheck(self):
+        with self._lock:
+            self._timer = self._timer_due = None
+        try:
+            self.on_due()
+        except Exception as e:
+            logger.error(f"알림 상태 재확인 실패 ({self.namespace}): {e}")
+
+    def save(self):
+        """다른 프로세스가 쓴 네임스페이스는 유지한 채 원자적으로 교체"""
+        with _file_lock:
+            data = self._load()
+            data[self.namespace] = {key: tracker.to_dict() for key, tracker in self.trackers.items()}
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"알림 상태 저장 실패 ({self.path}): {e}")
+
+    def status(self) -> Dict:
+        return {key: tracker.to_dict() for key, tracker in self.trackers.items()}
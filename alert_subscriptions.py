@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+사용자별 알림 구독
+- 구독 규칙(레벨 변경, RSI/김프/F&G 사용자 임계값 등)을 로컬 SQLite에 저장
+- 스냅샷마다 전체 구독을 numpy 배열로 한 번에 평가 (사용자별 루프 없음)
+- 상태 전이(임계값 교차, 레벨 변경)만 알림으로 반환, 전이는 DB에 비교 후 갱신(CAS)해서
+  여러 gunicorn 워커가 같은 구독을 평가해도 한 번만 발송
+"""
+
+import os
+import math
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from market_data import ASSETS, DEFAULT_ASSET, TRACKED_ASSETS
+from notifications import validate_subscription_target
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.getenv('ALERT_DB_PATH', 'alert_subscriptions.db')
+
+# 스냅샷에서 뽑는 지표 (열 순서 = METRICS 순서)
+METRICS = {
+    'heat_level': lambda s: s['heat']['level'],
+    'acc_level': lambda s: s['accumulation']['level'],
+    'heat_score': lambda s: s['heat']['score'],
+    'acc_score': lambda s: s['accumulation']['score'],
+    'rsi': lambda s: s['heat']['indicators']['rsi_weekly']['value'],
+    'kimchi': lambda s: s['heat']['indicators']['kimchi_premium']['value'],
+    'fear_greed': lambda s: s['accumulation']['indicators']['fear_greed']['value'],
+}
+METRIC_INDEX = {name: i for i, name in enumerate(METRICS)}
+
+# 규칙 -> (지표, 비교) / change: 값이 바뀌면 발송, above/below: 임계값 교차 시 발송
+RULES = {
+    'heat_level_change': ('heat_level', 'change'),
+    'acc_level_change': ('acc_level', 'change'),
+    'heat_score_above': ('heat_score', 'above'),
+    'acc_score_above': ('acc_score', 'above'),
+    'rsi_above': ('rsi', 'above'),
+    'kimchi_above': ('kimchi', 'above'),
+    'fear_greed_below': ('fear_greed', 'below'),
+}
+RULE_NAMES = list(RULES)
+ASSET_NAMES = list(ASSETS)
+
+_RULE_METRIC = np.array([METRIC_INDEX[RULES[r][0]] for r in RULE_NAMES])
+_RULE_ABOVE = np.array([RULES[r][1] == 'above' for r in RULE_NAMES])
+_RULE_BELOW = np.array([RULES[r][1] == 'below' for r in RULE_NAMES])
+_RULE_CHANGE = np.array([RULES[r][1] == 'change' for r in RULE_NAMES])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    asset TEXT NOT NULL DEFAULT 'BTC',
+    rule TEXT NOT NULL,
+    threshold REAL,
+    channel TEXT NOT NULL DEFAULT 'log',
+    target TEXT,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    last_state REAL,
+    last_fired TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_user ON subscriptions (user_id);
+CREATE TABLE IF NOT EXISTS subscriptions_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO subscriptions_meta (id, version) VALUES (1, 0);
+"""
+
+_COLUMNS = ('id', 'user_id', 'asset', 'rule', 'threshold', 'channel', 'target', 'enabled', 'last_fired', 'created_at')
+
+
+def snapshot_metrics(snapshots: Dict[str, Dict]) -> np.ndarray:
+    """자산별 스냅샷 -> (자산 수, 지표 수) 배열 (없는 값은 NaN)"""
+    matrix = np.full((len(ASSET_NAMES), len(METRICS)), np.nan)
+    for asset, snapshot in snapshots.items():
+        if asset not in ASSETS or not snapshot:
+            continue
+        row = ASSET_NAMES.index(asset)
+        for col, extract in enumerate(METRICS.values()):
+            try:
+                matrix[row, col] = float(extract(snapshot))
+            except (KeyError, TypeError, ValueError):
+                pass
+    return matrix
+
+
+class SubscriptionStore:
+    """SQLite 구독 저장소 + 배치 평가기"""
+
+    def __init__(self, path: str = DB_PATH, assets=TRACKED_ASSETS):
+        self.path = path
+        self.assets = tuple(assets)  # 구독 가능한 자산 = 수집 사이클이 스냅샷을 만드는 자산
+        self._lock = threading.Lock()
+        self._loaded_version = None
+        self._arrays = None
+        self._schema_pid = None
+
+    @contextmanager
+    def _connect(self):
+        """호출마다 연결 (프로세스에서 처음 열 때 스키마 생성 - 웜스타트 마스터에서는 열지 않음)"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if self._schema_pid != os.getpid():
+            conn.executescript(SCHEMA)
+            self._schema_pid = os.getpid()
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _bump_version(conn):
+        conn.execute("UPDATE subscriptions_meta SET version = version + 1 WHERE id = 1")
+
+    # ===== CRUD =====
+
+    def add(self, user_id: str, rule: str, threshold: Optional[float] = None, asset: str = DEFAULT_ASSET,
+            channel: str = 'log', target: Optional[str] = None) -> Dict:
+        """구독 추가 (잘못된 규칙/자산/임계값/채널/대상이면 ValueError)"""
+        asset = str(asset).upper()
+        if rule not in RULES:
+            raise ValueError(f"unknown rule: {rule}")
+        if asset not in self.assets:
+            raise ValueError(f"untracked asset: {asset} (tracked: {', '.join(self.assets)})")
+        if RULES[rule][1] != 'change':
+            if threshold is None:
+                raise ValueError(f"rule {rule} requires a threshold")
+            threshold = float(threshold)
+            if not math.isfinite(threshold):
+                raise ValueError(f"threshold must be a finite number: {threshold}")
+        else:
+            threshold = None
+        target = validate_subscription_target(channel, target)
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO subscriptions (user_id, asset, rule, threshold, channel, target, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user_id, asset, rule, threshold, channel, target, datetime.now().isoformat())
+            )
+            self._bump_version(conn)
+            subscription_id = cursor.lastrowid
+        return self.get(user_id, subscription_id)
+
+    def get(self, user_id: str, subscription_id: int) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM subscriptions WHERE id = ? AND user_id = ?",
+                (subscription_id, user_id)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list(self, user_id: str) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM subscriptions WHERE user_id = ? ORDER BY id",
+                (user_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete(self, user_id: str, subscription_id: int) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM subscriptions WHERE id = ? AND user_id = ?",
+                                  (subscription_id, user_id))
+            if cursor.rowcount:
+                self._bump_version(conn)
+        return cursor.rowcount > 0
+
+    def set_enabled(self, user_id: str, subscription_id: int, enabled: bool) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute("UPDATE subscriptions SET enabled = ? WHERE id = ? AND user_id = ?",
+                                  (int(enabled), subscription_id, user_id))
+            if cursor.rowcount:
+                self._bump_version(conn)
+        return cursor.rowcount > 0
+
+    # ===== 배치 평가 =====
+
+    def _load_arrays(self, conn):
+        """구독이 바뀌었을 때만 전체를 배열로 다시 읽음"""
+        version = conn.execute("SELECT version FROM subscriptions_meta WHERE id = 1").fetchone()[0]
+        if self._arrays is not None and version == self._loaded_version:
+            return self._arrays
+
+        rows = conn.execute(
+            "SELECT id, user_id, asset, rule, threshold, channel, target, last_state "
+            "FROM subscriptions WHERE enabled = 1 ORDER BY id"
+        ).fetchall()
+        rows = [row for row in rows if row['rule'] in RULES and row['asset'] in ASSETS]
+        self._arrays = {
+            'id': np.array([row['id'] for row in rows], dtype=np.int64),
+            'rule': np.array([RULE_NAMES.index(row['rule']) for row in rows], dtype=np.int64),
+            'asset': np.array([ASSET_NAMES.index(row['asset']) for row in rows], dtype=np.int64),
+            'threshold': np.array([np.nan if row['threshold'] is None else row['threshold'] for row in rows],
+                                  dtype=float),
+            'last_state': np.array([np.nan if row['last_state'] is None else row['last_state'] for row in rows],
+                                   dtype=float),
+            'meta': [(row['user_id'], row['rule'], row['asset'], row['channel'], row['target']) for row in rows],
+        }
+        self._loaded_version = version
+        return self._arrays
+
+    def evaluate(self, snapshots: Dict[str, Dict]) -> List[Dict]:
+        """자산별 스냅샷에 대해 전체 구독을 한 번에 평가 -> 발송할 알림 목록"""
+        metrics = snapshot_metrics(snapshots)
+        with self._lock, self._connect() as conn:
+            arrays = self._load_arrays(conn)
+            if len(arrays['id']) == 0:
+                return []
+
+            rule = arrays['rule']
+            value = metrics[arrays['asset'], _RULE_METRIC[rule]]
+            threshold = arrays['threshold']
+            last_state = arrays['last_state']
+
+            # 임계값 규칙은 0/1 상태, 변경 규칙은 값(레벨) 자체가 상태
+            state = np.where(_RULE_ABOVE[rule], (value > threshold).astype(float),
+                             np.where(_RULE_BELOW[rule], (value < threshold).astype(float), value))
+            state[np.isnan(value)] = np.nan
+
+            known = ~np.isnan(state)
+            changed = known & (np.isnan(last_state) | (state != last_state))
+            fired = changed & ~np.isnan(last_state) & (_RULE_CHANGE[rule] | (state == 1))
+
+            ids = arrays['id']
+            now = datetime.now().isoformat()
+
+            # 발송 없는 상태 갱신 (최초 평가, 임계값 해제 등)은 한 번에 기록
+            quiet = np.flatnonzero(changed & ~fired)
+            if len(quiet):
+                conn.executemany("UPDATE subscriptions SET last_state = ? WHERE id = ?",
+                                 zip(state[quiet].tolist(), ids[quiet].tolist()))
+                last_state[quiet] = state[quiet]
+
+            alerts = []
+            for i in np.flatnonzero(fired):
+                previous = float(last_state[i])
+                # 다른 워커가 이미 같은 전이를 기록했으면 건너뜀 (비교 후 갱신)
+                cursor = conn.execute(
+                    "UPDATE subscriptions SET last_state = ?, last_fired = ? WHERE id = ? AND last_state = ?",
+                    (float(state[i]), now, int(ids[i]), previous)
+                )
+                last_state[i] = state[i]
+                if cursor.rowcount == 0:
+                    continue
+                user_id, rule_name, asset, channel, target = arrays['meta'][i]
+                alerts.append({
+                    'subscription_id': int(ids[i]),
+                    'user_id': user_id,
+                    'rule': rule_name,
+                    'asset': asset,
+                    'value': float(value[i]),
+                    'threshold': None if np.isnan(threshold[i]) else float(threshold[i]),
+                    'previous': previous,
+                    'state': float(state[i]),
+                    'channel': channel,
+                    'target': target,
+                    'timestamp': now,
+                })
+        return alerts
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            total, enabled = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(enabled), 0) FROM subscriptions"
+            ).fetchone()
+        return {'total': total, 'enabled': enabled}
+
+
+def describe_alert(alert: Dict) -> str:
+    """알림 한 건을 사람이 읽는 문장으로"""
+    metric, comparison = RULES[alert['rule']]
+    if comparison == 'change':
+        previous = int(alert['previous']) if alert['previous'] is not None else '-'
+        return f"[{alert['asset']}] {metric}: {previous} → {int(alert['value'])}"
+    sign = '>' if comparison == 'above' else '<'
+    return f"[{alert['asset']}] {metric} {alert['value']:.2f} {sign} {alert['threshold']:g}"
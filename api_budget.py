@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+업스트림 API 호출 예산 집계
+- 소스별 호출 수/전송 바이트를 분 단위 버킷으로 로컬 SQLite에 기록 (모든 프로세스/워커 합산)
+- 입력별 캐시 적중/미스 (프로세스 단위)
+- 남은 예산 = 최근 1시간 호출 수 기준, 예상 잔여 = 최근 projection_window 호출 속도로 1시간 환산
+  (예산이 작은 소스는 projection_min_calls번은 들어갈 만큼 창을 넓혀 몇 번의 몰린 호출로 과대 추정하지 않음)
+- 예상 사용량이 예산에 가까우면 경고 -> remaining()이 더 작은 쪽을 돌려줘 스케줄러가 미리 주기를 늘림
+
+API_BUDGET_DB_PATH 환경변수로 파일 위치 지정
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BUDGET_DB_PATH = os.getenv('API_BUDGET_DB_PATH', 'api_budget.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_usage (
+    source TEXT NOT NULL,
+    minute INTEGER NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, minute)
+);
+"""
+
+
+class ApiBudget:
+    """소스별 시간당 호출 예산 추적기"""
+
+    def __init__(self, budgets: Dict[str, int], path: str = BUDGET_DB_PATH,
+                 window: float = 3600, projection_window: float = 600, projection_min_calls: int = 10,
+                 warn_ratio: float = 0.9):
+        self.budgets = dict(budgets)
+        self.path = path
+        self.window = window
+        self.projection_window = projection_window
+        self.projection_min_calls = projection_min_calls
+        self.warn_ratio = warn_ratio
+
+        self.cache_hits = Counter()
+        self.cache_misses = Counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_purge = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 - 처음 쓸 때 열고 스키마 생성 (포크 전 마스터에서 연 연결은 워커에서 쓰지 않음)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # ===== 기록 =====
+
+    def _add(self, source: str, calls: int = 0, nbytes: int = 0):
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT INTO api_usage (source, minute, calls, bytes) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(source, minute) DO UPDATE SET calls = calls + excluded.calls, "
+                "bytes = bytes + excluded.bytes",
+                (source, int(now // 60), calls, nbytes)
+            )
+            if now - self._last_purge > 600:
+                self._last_purge = now
+                conn.execute("DELETE FROM api_usage WHERE minute < ?", (int((now - 2 * self.window) // 60),))
+        except sqlite3.Error as e:
+            logger.error(f"API 예산 기록 실패 ({source}): {e}")
+
+    def record_call(self, source: str):
+        """업스트림 호출 1회 (실패한 호출도 한도에 포함되므로 호출 전에 기록)"""
+        self._add(source, calls=1)
+
+    def record_transfer(self, source: str, nbytes: int):
+        """응답 바이트 수"""
+        if nbytes:
+            self._add(source, nbytes=nbytes)
+
+    def record_cache(self, key: str, hit: bool):
+        with self._lock:
+            (self.cache_hits if hit else self.cache_misses)[key] += 1
+
+    # ===== 조회 =====
+
+    def projection_window_for(self, source: str) -> float:
+        """예상 잔여 계산 창 (초) - 예산이 작으면 projection_min_calls번 호출 간격까지 넓힘 (최대 window)"""
+        budget = self.budgets.get(source)
+        if not budget:
+            return self.projection_window
+        return min(self.window, max(self.projection_window, self.window * self.projection_min_calls / budget))
+
+    def usage(self, sources: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """소스별 최근 1시간 호출/바이트, 최근 호출 속도, 남은/예상 잔여 예산 (sources로 제한 가능)"""
+        now = time.time()
+        rows = []
+        try:
+            rows = self._conn().execute(
+                "SELECT source, minute, SUM(calls), SUM(bytes) FROM api_usage WHERE minute >= ? "
+                "GROUP BY source, minute",
+                (int((now - self.window) // 60),)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"API 예산 조회 실패: {e}")
+        minutes = {}
+        for source, minute, calls, nbytes in rows:
+            minutes.setdefault(source, []).append((minute, calls, nbytes))
+
+        names = set(self.budgets) | set(minutes)
+        if sources is not None:
+            names &= set(sources)
+        usage = {}
+        for source in sorted(names):
+            buckets = minutes.get(source, [])
+            calls = sum(b[1] for b in buckets)
+            nbytes = sum(b[2] for b in buckets)
+            projection_window = self.projection_window_for(source)
+            recent = sum(b[1] for b in buckets if b[0] >= int((now - projection_window) // 60))
+            budget = self.budgets.get(source)
+            rate = recent / projection_window  # 초당 호출
+            projected = rate * self.window
+            entry = {
+                'calls_1h': calls,
+                'bytes_1h': nbytes,
+                'calls_per_min': round(rate * 60, 2),
+                'projection_window': round(projection_window),
+                'budget_1h': budget,
+            }
+            if budget:
+                entry['remaining'] = round(max(0.0, 1 - calls / budget), 3)
+                entry['projected_remaining'] = round(max(0.0, 1 - projected / budget), 3)
+                entry['exhausts_in'] = round(max(budget - calls, 0) / rate) if rate > 0 else None
+            usage[source] = entry
+        return usage
+
+    def remaining(self, sources: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """소스별 남은 예산 비율 (0~1) - 현재 잔여와 예상 잔여 중 작은 값"""
+        return {
+            source: min(entry['remaining'], entry['projected_remaining'])
+            for source, entry in self.usage(sources).items() if 'remaining' in entry
+        }
+
+    def warnings(self, usage: Dict[str, Dict] = None, sources: Optional[Iterable[str]] = None) -> List[str]:
+        """현재 속도면 예산을 넘길 소스"""
+        usage = self.usage(sources) if usage is None else usage
+        floor = round(1 - self.warn_ratio, 3)
+        warnings = []
+        for source, entry in usage.items():
+            if 'remaining' not in entry:
+                continue
+            if entry['remaining'] <= floor:
+                warnings.append(f"{source}: 시간당 예산 {entry['calls_1h']}/{entry['budget_1h']} 사용")
+            elif entry['projected_remaining'] <= floor:
+                minutes = entry['exhausts_in'] / 60 if entry['exhausts_in'] is not None else 0
+                warnings.append(f"{source}: 현재 속도({entry['calls_per_min']}/분)면 약 {minutes:.0f}분 뒤 예산 소진")
+        return warnings
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            keys = set(self.cache_hits) | set(self.cache_misses)
+            return {
+                key: {
+                    'hits': self.cache_hits[key],
+                    'misses': self.cache_misses[key],
+                    'hit_ratio': round(self.cache_hits[key] / (self.cache_hits[key] + self.cache_misses[key]), 3),
+                }
+                for key in sorted(keys)
+            }
+
+    def status(self) -> Dict:
+        usage = self.usage()
+        return {
+            'sources': usage,
+            'cache': self.cache_stats(),
+            'warnings': self.warnings(usage),
+        }
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+대시보드 API 응답 인코딩 (콘텐츠 협상)
+- json: 기존 형식 (기본 - 브라우저의 Accept: */* 도 여기로)
+- columns: 필드별 배열 JSON - 히스토리에서 점마다 반복되던 키 제거, 시각은 epoch 초
+- msgpack: /api/data는 같은 구조, 히스토리는 columns 구조를 MessagePack으로 (msgpack 설치 시)
+- arrow: 히스토리 Arrow IPC 스트림 (pyarrow 설치 시)
+
+?format=columns|msgpack|arrow 가 Accept 헤더보다 우선 - 명시한 형식을 쓸 수 없으면 406
+"""
+
+import importlib.util
+from functools import lru_cache
+from typing import Dict, Sequence
+
+import numpy as np
+from flask import Response, jsonify
+
+import serialization
+
+JSON = 'json'
+COLUMNS = 'columns'
+MSGPACK = 'msgpack'
+ARROW = 'arrow'
+
+MIMETYPES = {
+    JSON: 'application/json',
+    COLUMNS: 'application/vnd.btc-alert.columns+json',
+    MSGPACK: 'application/msgpack',
+    ARROW: 'application/vnd.apache.arrow.stream',
+}
+ALIASES = {'application/x-msgpack': MSGPACK}
+MODULES = {MSGPACK: 'msgpack', ARROW: 'pyarrow'}  # 선택 의존성 - 처음 쓸 때 로드
+
+DATA_FORMATS = (JSON, MSGPACK)
+HISTORY_FORMATS = (JSON, COLUMNS, MSGPACK, ARROW)
+
+
+class NotAcceptable(Exception):
+    """요청한 형식을 이 엔드포인트/환경에서 만들 수 없음 (406)"""
+
+
+@lru_cache(maxsize=None)
+def available(fmt: str) -> bool:
+    """형식에 필요한 모듈이 설치돼 있는지"""
+    module = MODULES.get(fmt)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def negotiate(request, offered: Sequence[str]) -> str:
+    """요청에 맞는 형식 (offered 순서가 우선순위, 맞는 게 없으면 json)"""
+    fmt = request.args.get('format')
+    if fmt:
+        if fmt not in offered or not available(fmt):
+            raise NotAcceptable(fmt)
+        return fmt
+    usable = [f for f in offered if available(f)]
+    mimetypes = [MIMETYPES[f] for f in usable] + [m for m, f in ALIASES.items() if f in usable]
+    best = request.accept_mimetypes.best_match(mimetypes, default=MIMETYPES[JSON])
+    return ALIASES.get(best) or next(f for f in usable if MIMETYPES[f] == best)
+
+
+def not_acceptable(error: NotAcceptable, offered: Sequence[str]):
+    return jsonify({'error': f'unsupported format: {error}',
+                    'formats': [f for f in offered if available(f)]}), 406
+
+
+def pack(obj) -> bytes:
+    """MessagePack 인코딩 (numpy/datetime 값은 serialization.default로)"""
+    import msgpack
+    return msgpack.packb(obj, default=serialization.default)
+
+
+def arrow_stream(window: Dict[str, np.ndarray]) -> bytes:
+    """히스토리 열 배열 -> Arrow IPC 스트림 (배치 하나, timestamp는 timestamp[s])"""
+    import pyarrow as pa
+    arrays = [
+        pa.array(values.astype('datetime64[s]')) if name == 'timestamp' else pa.array(values)
+        for name, values in window.items()
+    ]
+    batch = pa.record_batch(arrays, names=list(window))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _vary(response):
+    response.headers.add('Vary', 'Accept')
+    return response
+
+
+def data_response(data: Dict, fmt: str):
+    """/api/data 응답 (json 또는 msgpack)"""
+    if fmt == MSGPACK:
+        return _vary(Response(pack(data), mimetype=MIMETYPES[MSGPACK]))
+    return _vary(jsonify(data))
+
+
+def history_response(snapshot, fmt: str, since=None, until=None, limit=None):
+    """/api/history 응답 - json은 행 단위 스트리밍, 나머지는 열 단위"""
+    if fmt == ARROW:
+        body = arrow_stream(snapshot.history_window(since, until, limit))
+    elif fmt in (COLUMNS, MSGPACK):
+        columns = snapshot.history_columns(since, until, limit)
+        body = pack(columns) if fmt == MSGPACK else serialization.dumps(columns)
+    else:
+        return _vary(Response(snapshot.history_json(since, until, limit), mimetype=MIMETYPES[JSON]))
+    return _vary(Response(body, mimetype=MIMETYPES[fmt]))
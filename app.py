@@ -72,9 +72,8 @@ def get_status():
 @app.route('/api/refresh')
 def refresh_data():
     try:
-        from dashboard_with_status import update_single_data
-        threading.Thread(target=update_single_data, daemon=True).start()
-        return jsonify({"status": "refreshing"})
+        from dashboard_with_status import refresh_payload
+        return jsonify(refresh_payload())
     except:
         return jsonify({"status": "error"})
 
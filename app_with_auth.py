@@ -1,32 +1,35 @@
 import os
 import json
 import threading
+import time
 from datetime import timedelta
-from flask import Flask, render_template, jsonify, redirect, url_for, session, request
+from flask import Flask, Response, render_template, jsonify, redirect, url_for, session, request
 from flask_cors import CORS
-from flask_session import Session
 from dotenv import load_dotenv
 from auth import AuthManager, generate_secret_key
+import metrics
+import api_encoding
+import serialization
+import static_assets
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
+app.json = serialization.JSONProvider(app)  # numpy values in snapshots serialize natively
 CORS(app)
+static_assets.register(app, ['dashboard_final.html'])  # /assets/<name>.<hash>.css|js (immutable)
 
 # Configure Flask app
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', generate_secret_key())
-app.config['SESSION_TYPE'] = 'filesystem'
+app.config['SESSION_DB_PATH'] = os.getenv('SESSION_DB_PATH', 'sessions.db')  # shared by all workers
 app.config['SESSION_PERMANENT'] = False
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 app.config['SESSION_COOKIE_SECURE'] = os.getenv('FLASK_ENV') == 'production'
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
-# Initialize session
-Session(app)
-
-# Initialize authentication
+# Initialize authentication (also installs the SQLite session interface)
 auth_manager = AuthManager(app)
 
 # Optional auth bypass for staging/demo
@@ -36,9 +39,12 @@ def _no_auth(f):
     return f
 maybe_protect = _no_auth if AUTH_DISABLED else auth_manager.login_required
 
-# Disable caching for dynamic pages/APIs to avoid stale UI
+# Disable caching for the data APIs to avoid stale UI. The dashboard page and
+# its assets carry their own headers from static_assets (ETag / immutable).
 @app.after_request
 def add_no_cache_headers(response):
+    if not request.path.startswith('/api/'):
+        return response
     try:
         response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
         response.headers['Pragma'] = 'no-cache'
@@ -77,7 +83,8 @@ def load_dashboard_data():
                 latest_data = {}
         
         # 백그라운드 업데이트 시작
-        from dashboard_with_status import update_thread
+        from dashboard_with_status import start_background_updates
+        start_background_updates()
         print("Background updates started")
         
     except Exception as e:
@@ -122,8 +129,8 @@ def kakao_callback():
 @app.route('/')
 @maybe_protect
 def index():
-    """Main dashboard (requires login)"""
-    return render_template('dashboard_final.html')
+    """Main dashboard (requires login) - pre-rendered, precompressed shell"""
+    return static_assets.page('dashboard_final.html')
 
 @app.route('/health')
 def health():
@@ -141,15 +148,28 @@ def get_user():
 @maybe_protect
 def get_data():
     """Get dashboard data (requires login if auth enabled)
-    우선 모듈의 실시간 데이터를 참조하고, 없으면 로컬 파일/로컬 캐시를 반환."""
+    우선 모듈의 실시간 데이터를 참조하고, 없으면 로컬 파일/로컬 캐시를 반환.
+    ?asset=ETH 등으로 다른 자산 스냅샷 조회 (BTC 외 자산은 모듈 데이터만 사용)."""
+    asset = request.args.get('asset')
+    try:
+        fmt = api_encoding.negotiate(request, api_encoding.DATA_FORMATS)
+    except api_encoding.NotAcceptable as e:
+        return api_encoding.not_acceptable(e, api_encoding.DATA_FORMATS)
     try:
-        # 1) 대시보드 모듈에서 직접 최신 데이터 참조
-        from dashboard_with_status import latest_data as ds_latest
+        # 1) 대시보드 모듈의 최신 스냅샷 (버전과 데이터가 같은 스냅샷에서 나옴)
+        from dashboard_with_status import store
+        snapshot = store.current()
+        ds_latest = snapshot.asset(asset)
         if isinstance(ds_latest, dict) and ds_latest:
-            return jsonify(ds_latest)
+            response = api_encoding.data_response(ds_latest, fmt)
+            response.headers['X-Snapshot-Version'] = str(snapshot.version)
+            return response
     except Exception:
         pass
 
+    if asset and asset.upper() != 'BTC':
+        return jsonify({"status": "loading", "message": f"{asset.upper()} data is being loaded..."})
+
     # 2) 로컬 캐시가 있으면 반환
     if latest_data:
         return jsonify(latest_data)
@@ -160,7 +180,7 @@ def get_data():
             with open('dashboard_data.json', 'r') as f:
                 content = f.read().strip()
                 if content:
-                    return jsonify(json.loads(content))
+                    return jsonify(serialization.loads(content))
     except Exception:
         pass
 
@@ -169,34 +189,193 @@ def get_data():
 @app.route('/api/history')
 @maybe_protect
 def get_history():
-    """Get historical data (requires login if auth enabled)"""
+    """Get historical data (requires login if auth enabled)
+    ?range=hour|day|week|month, or ?since=&until= (ISO timestamps or epoch
+    seconds) and ?limit=N, select a range. JSON is streamed straight from the
+    ring; Accept or ?format= selects columns, msgpack or arrow instead."""
     try:
-        from dashboard_with_status import historical_data as ds_hist
-        if isinstance(ds_hist, list) and ds_hist:
-            return jsonify(ds_hist)
+        from dashboard_with_status import store, history_query
     except Exception:
-        pass
+        return jsonify(historical_data)
+    try:
+        fmt = api_encoding.negotiate(request, api_encoding.HISTORY_FORMATS)
+    except api_encoding.NotAcceptable as e:
+        return api_encoding.not_acceptable(e, api_encoding.HISTORY_FORMATS)
+    try:
+        since, until, limit = history_query(request.args)
+    except ValueError:
+        return jsonify({'error': 'invalid since/until/limit'}), 400
+    snapshot = store.current()
+    if snapshot.history_end:
+        return api_encoding.history_response(snapshot, fmt, since, until, limit)
 
     return jsonify(historical_data)
 
+# Server-sent events: each connection holds a worker thread, so streams are
+# closed after STREAM_MAX_SECONDS and the browser's EventSource reconnects
+STREAM_POLL_SECONDS = 1
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_MAX_SECONDS = int(os.getenv('STREAM_MAX_SECONDS', 60))
+
+@app.route('/api/stream')
+@maybe_protect
+def stream_data():
+    """Push the dashboard snapshot as server-sent events whenever it changes (?asset=ETH)"""
+    asset = request.args.get('asset')
+
+    def events():
+        try:
+            from dashboard_with_status import store
+        except Exception:
+            store = None
+
+        def current():
+            if store is None:
+                return 0, latest_data
+            snapshot = store.current()
+            return snapshot.version, snapshot.asset(asset)
+
+        yield f"retry: {STREAM_POLL_SECONDS * 1000}\n\n"
+        started = last_sent = time.time()
+        last_version = None
+        while time.time() - started < STREAM_MAX_SECONDS:
+            version, data = current()
+            if data and version != last_version:
+                last_version = version
+                last_sent = time.time()
+                yield f"id: {version}\ndata: {serialization.dumps(data).decode('utf-8')}\n\n"
+            elif time.time() - last_sent >= STREAM_HEARTBEAT_SECONDS:
+                last_sent = time.time()
+                yield ": keepalive\n\n"
+            time.sleep(STREAM_POLL_SECONDS)
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'X-Accel-Buffering': 'no'})
+
+def _subscription_user_id():
+    """Subscriptions are keyed by the logged-in user (shared 'anonymous' when auth is disabled)"""
+    user_info = auth_manager.get_current_user_info()
+    return user_info['id'] if user_info else 'anonymous'
+
+@app.route('/api/subscriptions', methods=['GET'])
+@maybe_protect
+def list_subscriptions():
+    """List the current user's alert subscriptions"""
+    from dashboard_with_status import subscriptions
+    from alert_subscriptions import RULES
+    from notifications import SUBSCRIPTION_CHANNELS
+    return jsonify({
+        "subscriptions": subscriptions.list(_subscription_user_id()),
+        "rules": {name: {"metric": metric, "type": kind} for name, (metric, kind) in RULES.items()},
+        "channels": list(SUBSCRIPTION_CHANNELS),
+        "assets": list(subscriptions.assets)
+    })
+
+@app.route('/api/subscriptions', methods=['POST'])
+@maybe_protect
+def create_subscription():
+    """Create an alert subscription: {"rule", "threshold", "asset", "channel", "target"}
+
+    The asset must be one of the tracked assets (ASSETS), the threshold a
+    finite number, the channel one of notifications.SUBSCRIPTION_CHANNELS and
+    the target must match it (public http(s) URL, email address, chat id,
+    token); anything else is a 400."""
+    from dashboard_with_status import subscriptions
+    payload = request.get_json(silent=True) or {}
+    try:
+        subscription = subscriptions.add(
+            _subscription_user_id(),
+            payload.get('rule', ''),
+            threshold=payload.get('threshold'),
+            asset=payload.get('asset', 'BTC'),
+            channel=payload.get('channel', 'log'),
+            target=payload.get('target')
+        )
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(subscription), 201
+
+@app.route('/api/subscriptions/<int:subscription_id>', methods=['DELETE'])
+@maybe_protect
+def delete_subscription(subscription_id):
+    """Delete one of the current user's subscriptions"""
+    from dashboard_with_status import subscriptions
+    if not subscriptions.delete(_subscription_user_id(), subscription_id):
+        return jsonify({"error": "not found"}), 404
+    return jsonify({"status": "deleted"})
+
+@app.route('/api/subscriptions/<int:subscription_id>', methods=['PATCH'])
+@maybe_protect
+def update_subscription(subscription_id):
+    """Enable or disable a subscription: {"enabled": bool}"""
+    from dashboard_with_status import subscriptions
+    payload = request.get_json(silent=True) or {}
+    if 'enabled' not in payload:
+        return jsonify({"error": "enabled is required"}), 400
+    if not subscriptions.set_enabled(_subscription_user_id(), subscription_id, bool(payload['enabled'])):
+        return jsonify({"error": "not found"}), 404
+    return jsonify(subscriptions.get(_subscription_user_id(), subscription_id))
+
 @app.route('/api/status')
 def get_status():
-    """Get API status"""
-    return jsonify({"status": "ok"})
+    """Get API status (data source freshness + upstream circuit breakers)"""
+    try:
+        from dashboard_with_status import get_status_payload
+        return jsonify({"status": "ok", **get_status_payload()})
+    except Exception:
+        return jsonify({"status": "ok"})
+
+@app.route('/api/metrics')
+def get_metrics():
+    """Collection stage latency histograms in Prometheus text format (per worker)"""
+    return app.response_class(metrics.render(), content_type=metrics.CONTENT_TYPE)
 
 @app.route('/api/refresh')
 @maybe_protect
 def refresh_data():
-    """Refresh dashboard data (requires login)"""
+    """Refresh dashboard data (requires login)
+    Concurrent calls join the in-flight collection and return right away with
+    the snapshot version to poll for; ?wait=N blocks at most MAX_REFRESH_WAIT s."""
     try:
-        from dashboard_with_status import update_single_data
-        threading.Thread(target=update_single_data, daemon=True).start()
-        return jsonify({"status": "refreshing"})
-    except:
+        from dashboard_with_status import refresh_payload
+        return jsonify(refresh_payload(request.args.get('wait', 0, type=float)))
+    except Exception:
         return jsonify({"status": "error"})
 
+def warm_start():
+    """Load cached state once in the gunicorn master before forking.
+
+    Only plain Python state is kept for the workers to inherit copy-on-write:
+    imported modules, the snapshot file, the compiled login template and the
+    pre-rendered/precompressed dashboard page. SQLite connections, HTTP
+    connection pools and the history ring mapping are opened lazily in each
+    worker; the ring is mapped here only to count/migrate it and is closed
+    again before the fork. No collection threads are started.
+    """
+    from dashboard_with_status import store
+    snapshot = store.current()
+    app.jinja_env.get_template('login.html')
+    bundles = static_assets.build(app)
+    print(f"Warm start: snapshot={'yes' if snapshot.data else 'no'}, history={store.ring.count} points, "
+          f"pages={', '.join(bundles)}")
+    store.ring.close()
+
+_background_started = False
+
+def start_background_tasks():
+    """Start data collection (called once per process, after fork in warm-start mode)"""
+    global _background_started
+    if _background_started:
+        return
+    _background_started = True
+    threading.Thread(target=load_dashboard_data, daemon=True).start()
+
 # Load dashboard data on startup
-threading.Thread(target=load_dashboard_data, daemon=True).start()
+# PREFORK_WARM_START is set by gunicorn.conf.py when the app is preloaded in the master
+if os.getenv('PREFORK_WARM_START') == '1':
+    warm_start()
+else:
+    start_background_tasks()
 
 if __name__ == '__main__':
     # Render/Railway의 PORT 처리
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+업스트림 입력 수집 - asyncio 버전 (aiohttp 설치 시)
+- 공유 커넥터(aiohttp.TCPConnector) 하나로 모든 업스트림 호출
+- 수집 사이클마다 추적 자산 전체에서 만료된 입력만 이벤트 루프 하나로 동시에 조회 -> MarketData 캐시에 넣음
+  (현물 USD/KRW는 자산 배치 요청 1회, 일봉은 자산별, 환율/Fear & Greed는 공통, 트렌드는 워커 없는 자산만 스레드에서)
+- cycle_timeout 안에 끝나지 않으면 남은 작업을 TaskGroup째 취소 - 그 입력은 전략 계산 때 동기 경로(캐시)로
+- 서킷 브레이커, 호출 간격, 시간당 예산은 MarketData와 공유
+- SyncIndicatorClient: 전용 이벤트 루프 스레드를 가진 동기 파사드 (수집 스레드/기존 스크립트에서 호출)
+
+ASYNC_COLLECT=0 이면 쓰지 않음 (requests 동기 경로만), ASYNC_CYCLE_TIMEOUT(기본 40초)
+"""
+
+import os
+import json
+import asyncio
+import threading
+import logging
+from typing import Dict, Optional, Sequence
+
+try:
+    import aiohttp
+except ImportError:  # 선택 의존성 - 없으면 동기 수집만
+    aiohttp = None
+
+import metrics
+from circuit_breaker import CircuitOpenError
+from market_data import (
+    ASSETS, BINANCE_PRICE_URL, BITHUMB_TICKER_URL, COINGECKO_CHART_URL, COINGECKO_PRICE_URL, DEFAULT_ASSET,
+    DUNAMU_FX_URL, FEAR_GREED_URL, HISTORY_DAYS, UPBIT_TICKER_URL, MarketData, get_default_market, input_key,
+)
+
+logger = logging.getLogger(__name__)
+
+ASYNC_COLLECT = os.getenv('ASYNC_COLLECT', '1').lower() not in ('0', 'false', 'no')
+CYCLE_TIMEOUT = float(os.getenv('ASYNC_CYCLE_TIMEOUT', 40))
+
+
+class AsyncIndicatorClient:
+    """MarketData 원천 데이터 조회의 asyncio 구현 (결과는 MarketData 캐시로)"""
+
+    def __init__(self, market: Optional[MarketData] = None, request_timeout: Optional[float] = None,
+                 cycle_timeout: float = CYCLE_TIMEOUT, limit_per_host: int = 4):
+        self.market = market or get_default_market()
+        self.request_timeout = request_timeout or self.market.request_timeout
+        self.cycle_timeout = cycle_timeout
+        self.limit_per_host = limit_per_host
+        self._session = None
+
+    async def open(self):
+        """공유 커넥터/세션 (이벤트 루프 안에서 생성)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.limit_per_host, ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def fetch_json(self, source: str, url: str, params: Optional[Dict] = None):
+        """업스트림 JSON 조회 (호출 간격 + 타임아웃 + 서킷 브레이커, MarketData.fetch_json과 같은 기록)"""
+        breaker = self.market.breakers.get(source)
+        if not breaker.allow_request():
+            raise CircuitOpenError(source)
+        self.market.record_call(source)
+        try:
+            with metrics.span('upstream', source=source):
+                if source in self.market.api_limits:
+                    wait_time = self.market.reserve_call_slot(source)
+                    if wait_time > 0:
+                        await asyncio.sleep(wait_time)
+                async with self._session.get(url, params=params) as response:
+                    body = await response.read()
+                    self.market.budget.record_transfer(source, len(body))
+                    response.raise_for_status()
+                    data = json.loads(body)
+        except asyncio.CancelledError:
+            # 사이클 취소는 업스트림 장애가 아니므로 half_open 시험 호출 슬롯만 반환
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+        return data
+
+    # ===== 원천 데이터 (MarketData._fetch_* 와 같은 소스/폴백 순서) =====
+
+    async def prices_usd(self, assets: Sequence[str]) -> Dict[str, float]:
+        """USD 현물 배치 조회 (Binance symbols=[...] → CoinGecko ids=...)"""
+        try:
+            symbols = {ASSETS[asset]['binance']: asset for asset in assets}
+            params = {'symbols': json.dumps(list(symbols), separators=(',', ':'))}
+            data = await self.fetch_json('binance', BINANCE_PRICE_URL, params)
+            return {symbols[item['symbol']]: float(item['price']) for item in data if item['symbol'] in symbols}
+        except Exception:
+            ids = {ASSETS[asset]['coingecko']: asset for asset in assets}
+            params = {'ids': ','.join(ids), 'vs_currencies': 'usd'}
+            data = await self.fetch_json('coingecko', COINGECKO_PRICE_URL, params)
+            return {ids[coin_id]: price['usd'] for coin_id, price in data.items() if coin_id in ids}
+
+    async def prices_krw(self, assets: Sequence[str]) -> Dict[str, float]:
+        """KRW 현물 배치 조회 (Bithumb ALL_KRW → Upbit markets=...)"""
+        try:
+            data = await self.fetch_json('bithumb', BITHUMB_TICKER_URL.format(market='ALL_KRW'))
+            if data['status'] != '0000':
+                raise ValueError(f"Bithumb status {data['status']}")
+            return {asset: float(data['data'][asset]['closing_price']) for asset in assets if asset in data['data']}
+        except Exception:
+            markets = {ASSETS[asset]['upbit']: asset for asset in assets}
+            data = await self.fetch_json('upbit', UPBIT_TICKER_URL, {'markets': ','.join(markets)})
+            return {markets[item['market']]: item['trade_price'] for item in data if item['market'] in markets}
+
+    async def exchange_rate(self) -> float:
+        return (await self.fetch_json('dunamu', DUNAMU_FX_URL))[0]['basePrice']
+
+    async def daily_closes(self, asset: str) -> list:
+        params = {'vs_currency': 'usd', 'days': HISTORY_DAYS, 'interval': 'daily'}
+        url = COINGECKO_CHART_URL.format(coin_id=ASSETS[asset]['coingecko'])
+        data = await self.fetch_json('coingecko', url, params)
+        return [price[1] for price in data['prices']]
+
+    async def fear_greed(self) -> int:
+        data = await self.fetch_json('alternative_me', FEAR_GREED_URL)
+        if 'data' not in data or len(data['data']) == 0:
+            raise ValueError('empty Fear & Greed response')
+        return int(data['data'][0]['value'])
+
+    # ===== 수집 사이클 =====
+
+    def _jobs(self, assets: Sequence[str]) -> Dict:
+        """만료된 입력별 조회 코루틴 함수 (캐시가 살아 있는 입력은 호출하지 않음)"""
+        market = self.market
+        jobs = {}
+
+        def store_batch(key, fetch):
+            async def job():
+                for asset, value in (await fetch(assets)).items():
+                    market.put_input(input_key(key, asset), value)
+            return job
+
+        def store(key, fetch, *args):
+            async def job():
+                market.put_input(key, await fetch(*args))
+            return job
+
+        for key, fetch in (('spot_usd', self.prices_usd), ('spot_krw', self.prices_krw)):
+            if not all(market.is_fresh(input_key(key, asset)) for asset in assets):
+                jobs[key] = store_batch(key, fetch)
+        if not market.is_fresh('fx'):
+            jobs['fx'] = store('fx', self.exchange_rate)
+        if not market.is_fresh('fear_greed'):
+            jobs['fear_greed'] = store('fear_greed', self.fear_greed)
+        for asset in assets:
+            key = input_key('daily_closes', asset)
+            if not market.is_fresh(key):
+                jobs[key] = store(key, self.daily_closes, asset)
+            # pytrends는 동기 라이브러리 - 워커가 없는 자산만 스레드에서 (get_trends가 캐시에 넣음)
+            key = input_key('trends', asset)
+            if asset not in market.trends_workers and not market.is_fresh(key):
+                jobs[key] = lambda asset=asset: asyncio.to_thread(market.get_trends, asset)
+        return jobs
+
+    @staticmethod
+    async def _run(key: str, job) -> bool:
+        """작업 하나 - 실패는 여기서 기록만 하고 삼킴 (TaskGroup의 다른 작업을 취소시키지 않게)"""
+        try:
+            await job()
+            return True
+        except Exception as e:
+            logger.error(f"{key} 비동기 조회 실패: {e}")
+            return False
+
+    async def collect(self, assets: Sequence[str]) -> Dict[str, str]:
+        """추적 자산의 만료된 입력을 동시에 조회 -> {입력 키: ok|error|cancelled}
+
+        cycle_timeout 안에 끝나지 않은 작업은 TaskGroup과 함께 취소되고,
+        해당 입력은 전략 계산 때 MarketData 동기 경로(마지막 정상값)로 채워진다.
+        """
+        await self.open()
+        jobs = self._jobs(list(assets))
+        tasks = {}
+        try:
+            async with asyncio.timeout(self.cycle_timeout):
+                async with asyncio.TaskGroup() as group:
+                    for key, job in jobs.items():
+                        tasks[key] = group.create_task(self._run(key, job))
+        except TimeoutError:
+            logger.warning(f"비동기 수집 타임아웃 ({self.cycle_timeout}s) - 미완료 작업 취소")
+        return {
+            key: 'cancelled' if task.cancelled() else ('ok' if task.result() else 'error')
+            for key, task in tasks.items()
+        }
+
+
+class SyncIndicatorClient:
+    """AsyncIndicatorClient 동기 파사드
+
+    전용 이벤트 루프 스레드를 하나 띄워 두고 코루틴을 넘겨 실행한다 (세션/커넥터는 그 루프에 묶임).
+    수집 스레드와 기존 동기 스크립트에서 그대로 호출 가능.
+    """
+
+    def __init__(self, market: Optional[MarketData] = None, **kwargs):
+        self.client = AsyncIndicatorClient(market, **kwargs)
+        self.market = self.client.market
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-collector', daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self):
+        self.run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def collect(self, assets: Sequence[str]) -> Dict[str, str]:
+        """만료된 입력을 한 번에 채움 (이후 MarketData.get_* 는 캐시에서 바로 반환)"""
+        return self.run(self.client.collect(assets))
+
+    # MarketData와 같은 이름의 조회 (기존 스크립트용) - 비동기로 채운 뒤 캐시에서 읽음
+
+    def get_price_usd(self, asset: str = DEFAULT_ASSET) -> float:
+        self.collect([asset])
+        return self.market.get_price_usd(asset)
+
+    def get_price_krw(self, asset: str = DEFAULT_ASSET) -> float:
+        self.collect([asset])
+        return self.market.get_price_krw(asset)
+
+    def get_exchange_rate(self) -> float:
+        self.collect([DEFAULT_ASSET])
+        return self.market.get_exchange_rate()
+
+    def get_daily_closes(self, days: int = HISTORY_DAYS, asset: str = DEFAULT_ASSET) -> list:
+        self.collect([asset])
+        return self.market.get_daily_closes(days, asset)
+
+    def get_fear_greed(self) -> int:
+        self.collect([DEFAULT_ASSET])
+        return self.market.get_fear_greed()
+
+
+_collector = None
+_collector_pid = None
+_collector_lock = threading.Lock()
+
+
+def get_collector(market: Optional[MarketData] = None) -> Optional[SyncIndicatorClient]:
+    """프로세스 공용 비동기 수집기 (aiohttp가 없거나 ASYNC_COLLECT=0이면 None)
+
+    루프 스레드는 프로세스마다 처음 쓸 때 생성 (웜스타트 마스터에서 띄운 스레드는 포크 후 남지 않음)
+    """
+    global _collector, _collector_pid
+    if aiohttp is None or not ASYNC_COLLECT:
+        return None
+    with _collector_lock:
+        if _collector is None or _collector_pid != os.getpid():
+            _collector = SyncIndicatorClient(market)
+            _collector_pid = os.getpid()
+        return _collector
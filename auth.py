@@ -9,6 +9,8 @@ from functools import wraps
 from flask import redirect, url_for, session, request, jsonify
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user
 from authlib.integrations.flask_client import OAuth
+from session_store import SESSION_DB_PATH, SessionStore, SQLiteSessionInterface
+from oauth_cache import CachedOAuth2App
 from datetime import datetime, timedelta
 import secrets
 
@@ -22,12 +24,29 @@ class User(UserMixin):
         self.picture = picture
         self.created_at = datetime.now()
 
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'email': self.email,
+            'name': self.name,
+            'provider': self.provider,
+            'picture': self.picture,
+            'created_at': self.created_at.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        user = cls(data['id'], data.get('email'), data.get('name'), data.get('provider'), data.get('picture'))
+        if data.get('created_at'):
+            user.created_at = datetime.fromisoformat(data['created_at'])
+        return user
+
 class AuthManager:
-    def __init__(self, app=None):
+    def __init__(self, app=None, store=None):
         self.app = app
         self.oauth = None
         self.login_manager = None
-        self.users = {}  # Simple in-memory user storage (use database in production)
+        self.store = store  # Shared SQLite sessions + users (see session_store.py)
         
         if app:
             self.init_app(app)
@@ -36,6 +55,14 @@ class AuthManager:
         """Initialize authentication with Flask app"""
         self.app = app
         
+        # Server-side sessions and users shared by all workers
+        if self.store is None:
+            self.store = SessionStore(
+                app.config.get('SESSION_DB_PATH', SESSION_DB_PATH),
+                lifetime=app.config['PERMANENT_SESSION_LIFETIME']
+            )
+        app.session_interface = SQLiteSessionInterface(self.store)
+        
         # Setup Flask-Login
         self.login_manager = LoginManager()
         self.login_manager.init_app(app)
@@ -44,7 +71,7 @@ class AuthManager:
         # Setup OAuth
         self.oauth = OAuth(app)
         
-        # Configure Google OAuth
+        # Configure Google OAuth (discovery document + JWKS cached on disk, see oauth_cache.py)
         self.google = self.oauth.register(
             name='google',
             client_id=os.getenv('GOOGLE_CLIENT_ID'),
@@ -52,8 +79,13 @@ class AuthManager:
             server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
             client_kwargs={
                 'scope': 'openid email profile'
-            }
+            },
+            client_cls=CachedOAuth2App
         )
+        # Pre-populate google.server_metadata so the first callback on a
+        # fresh worker does not fetch it (with preload this runs once, pre-fork)
+        if os.getenv('GOOGLE_CLIENT_ID'):
+            self.google.prefetch()
         
         # Configure Kakao OAuth
         self.kakao = self.oauth.register(
@@ -70,7 +102,15 @@ class AuthManager:
         
         @self.login_manager.user_loader
         def load_user(user_id):
-            return self.users.get(user_id)
+            data = self.store.get_user(user_id)
+            return User.from_dict(data) if data else None
+    
+    def save_user(self, user):
+        """Persist user profile, keeping the original sign-up time"""
+        existing = self.store.get_user(user.id)
+        if existing and existing.get('created_at'):
+            user.created_at = datetime.fromisoformat(existing['created_at'])
+        self.store.save_user(user.to_dict())
     
     def login_required(self, f):
         """Decorator to require login for routes"""
@@ -110,8 +150,8 @@ class AuthManager:
                 picture=user_info.get('picture')
             )
             
-            # Store user in memory (use database in production)
-            self.users[user_id] = user
+            # Store user in the shared user table
+            self.save_user(user)
             
             # Log in user
             login_user(user)
@@ -152,8 +192,8 @@ class AuthManager:
                 picture=profile.get('profile_image_url')
             )
             
-            # Store user in memory (use database in production)
-            self.users[user_id] = user
+            # Store user in the shared user table
+            self.save_user(user)
             
             # Log in user
             login_user(user)
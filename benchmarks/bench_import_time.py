@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+워커 부팅(모듈 임포트) 시간 벤치마크
+- 모듈마다 새 인터프리터에서 임포트 시간을 N회 측정 (중앙값/최소/최대)
+- 임포트 직후 무거운 의존성(pandas, pytrends, plyer, schedule) 로드 여부 기록
+- -X importtime 결과에서 누적 시간이 큰 모듈 상위 목록 기록
+
+사용법:
+    python benchmarks/bench_import_time.py [--runs 5] [--output benchmarks/results/import_time.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ['bitcoin_halving_system', 'dashboard_with_status', 'app_with_auth']
+HEAVY_MODULES = ['pandas', 'pytrends', 'plyer', 'schedule']
+
+CHILD_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _child_env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = REPO_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+
+def measure_module(module: str, runs: int, workdir: str) -> dict:
+    """새 프로세스에서 임포트 시간 측정"""
+    samples = []
+    loaded = []
+    for _ in range(runs):
+        code = CHILD_SNIPPET.format(module=module, heavy=HEAVY_MODULES)
+        proc = subprocess.run([sys.executable, '-c', code], cwd=workdir, env=_child_env(),
+                              capture_output=True, text=True, timeout=120)
+        if proc.returncode != 0:
+            return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr else 'failed'}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        samples.append(result['seconds'])
+        loaded = result['loaded']
+
+    return {
+        'runs': runs,
+        'median_ms': statistics.median(samples) * 1000,
+        'min_ms': min(samples) * 1000,
+        'max_ms': max(samples) * 1000,
+        'heavy_modules_loaded': loaded,
+        'top_imports': top_imports(module, workdir),
+    }
+
+
+def top_imports(module: str, workdir: str, limit: int = 10) -> list:
+    """-X importtime 누적 시간 상위 모듈"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=workdir, env=_child_env(), capture_output=True, text=True, timeout=120)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append({'module': name.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us)})
+    rows.sort(key=lambda row: row['cumulative_us'], reverse=True)
+    return rows[:limit]
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모듈 임포트 시간 벤치마크')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--modules', nargs='+', default=DEFAULT_MODULES)
+    parser.add_argument('--output', default=os.path.join(REPO_ROOT, 'benchmarks', 'results', 'import_time.json'))
+    args = parser.parse_args()
+
+    # 로그/데이터 파일이 저장소에 생기지 않도록 임시 디렉터리에서 실행
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {}
+        for module in args.modules:
+            results[module] = measure_module(module, args.runs, workdir)
+            summary = results[module]
+            if 'error' in summary:
+                print(f"❌ {module}: {summary['error']}")
+            else:
+                print(f"⏱  {module}: {summary['median_ms']:.1f} ms (heavy: {summary['heavy_modules_loaded'] or '-'})")
+
+    report = {
+        'benchmark': 'import_time',
+        'timestamp': datetime.now().isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
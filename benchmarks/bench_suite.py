@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+재현 가능한 전체 벤치마크 (기록된 업스트림 응답 재생)
+- fixture_server로 Binance/CoinGecko/Bithumb/Upbit/dunamu/alternative.me/Google Trends 응답 재생
+- cycle: 전체 자산 수집 사이클 시간 (콜드 / 업스트림 재호출 / 캐시 적중), 임포트 시간, 프로세스 메모리
+- indicators: 지표별 CPU 시간 (같은 입력으로 그래프 캐시 없이 재계산)
+- throughput: gunicorn 워커에 동시 클라이언트로 /api/data 요청 (rps, p50/p90/p99), 워커 메모리
+- 결과는 benchmarks/results/suite.json (실행 환경, 커밋, 픽스처 요청 수 포함)
+
+기본으로 MarketData 호출 간격 제한(api_limits)을 끄고 측정 (--keep-rate-limits 로 유지)
+
+사용법:
+    python benchmarks/bench_suite.py [--runs 3] [--clients 8] [--duration 15] [--workers 2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_import_time import REPO_ROOT, git_revision  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+
+CYCLE_SNIPPET = """
+import json, sys, time
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return None
+
+started = time.perf_counter()
+import dashboard_with_status as dashboard
+from strategy_engine import GROUPS
+import_seconds = time.perf_counter() - started
+market = dashboard.system.market
+if not {keep_rate_limits!r}:
+    market.api_limits.clear()
+
+def cycle():
+    started = time.perf_counter()
+    results = dashboard.collect_all_assets()
+    return time.perf_counter() - started, results
+
+cold, results = cycle()
+warm = []
+for _ in range({runs}):
+    market.invalidate()
+    warm.append(cycle()[0])
+cached = [cycle()[0] for _ in range({runs})]
+
+# 지표별 CPU 시간: 마지막 입력 그대로, 그래프 캐시를 비우고 재계산
+indicators = {{}}
+for asset, strategy in dashboard.get_asset_strategies().items():
+    engine = strategy.engine
+    for group in GROUPS:
+        for name in strategy.profile.get(group, {{}}):
+            data = engine.load_inputs(engine.indicator_inputs(name))
+            params = strategy.indicator_params(name)
+            samples = []
+            for _ in range({indicator_runs}):
+                engine.graph.invalidate()
+                cpu_started = time.process_time()
+                engine.graph.resolve(name, params, data)
+                samples.append(time.process_time() - cpu_started)
+            indicators.setdefault(name, []).extend(samples)
+
+# 게이트웨이 워커가 웜 스타트로 읽을 스냅샷
+latest, _ = results[dashboard.DEFAULT_ASSET]
+with open('dashboard_data.json', 'w') as f:
+    json.dump(latest, f, default=str)
+
+print(json.dumps({{
+    'import_seconds': import_seconds,
+    'cold_seconds': cold,
+    'warm_seconds': warm,
+    'cached_seconds': cached,
+    'assets': sorted(results),
+    'indicator_cpu_seconds': indicators,
+    'rss_kb': rss_kb(),
+    'api_budget': market.budget.status()['sources'],
+}}))
+"""
+
+
+def child_env(server: FixtureServer) -> dict:
+    env = dict(os.environ)
+    env.update(server.upstream_env())
+    env['PYTHONPATH'] = REPO_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    env['NOTIFY_CHANNELS'] = 'log'
+    env['PREFORK_WARM_START'] = '1'  # 임포트만으로 백그라운드 수집이 시작되지 않도록
+    return env
+
+
+def _ms(samples: list) -> dict:
+    if not samples:
+        return {}
+    return {
+        'runs': len(samples),
+        'median_ms': statistics.median(samples) * 1000,
+        'min_ms': min(samples) * 1000,
+        'max_ms': max(samples) * 1000,
+    }
+
+
+def percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def bench_cycle(server: FixtureServer, workdir: str, runs: int, indicator_runs: int,
+                keep_rate_limits: bool) -> dict:
+    """수집 사이클/지표 CPU/메모리 (새 인터프리터)"""
+    code = CYCLE_SNIPPET.format(runs=runs, indicator_runs=indicator_runs, keep_rate_limits=keep_rate_limits)
+    proc = subprocess.run([sys.executable, '-c', code], cwd=workdir, env=child_env(server),
+                          capture_output=True, text=True, timeout=1800)
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr else 'failed'}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        'assets': result['assets'],
+        'import_ms': result['import_seconds'] * 1000,
+        'cold_ms': result['cold_seconds'] * 1000,
+        'upstream': _ms(result['warm_seconds']),
+        'cached': _ms(result['cached_seconds']),
+        'rss_mb': result['rss_kb'] / 1024 if result['rss_kb'] else None,
+        'indicators': {
+            name: {
+                'samples': len(samples),
+                'median_us': statistics.median(samples) * 1e6,
+                'max_us': max(samples) * 1e6,
+            }
+            for name, samples in sorted(result['indicator_cpu_seconds'].items())
+        },
+        'api_calls': {source: usage['calls_1h'] for source, usage in result['api_budget'].items()},
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def children(pid: int) -> list:
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def wait_for(url: str, timeout: float, check=lambda response: response.ok) -> bool:
+    import requests
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if check(requests.get(url, timeout=2)):
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+@contextmanager
+def gunicorn_server(server: FixtureServer, workdir: str, workers: int, threads: int = 1, env: dict = None):
+    """gunicorn.conf.py(웜 스타트)로 app_with_auth 실행 -> (base_url, 프로세스)"""
+    port = free_port()
+    cmd = [sys.executable, '-m', 'gunicorn', '-c', os.path.join(REPO_ROOT, 'gunicorn.conf.py'),
+           '--pythonpath', REPO_ROOT, '-w', str(workers), '--threads', str(threads),
+           '-b', f'127.0.0.1:{port}', 'app_with_auth:app']
+    log = open(os.path.join(workdir, 'gunicorn.log'), 'a')
+    env = {**child_env(server), **(env or {})}
+    env.pop('PREFORK_WARM_START')  # gunicorn.conf.py가 preload 여부에 맞춰 설정
+    proc = subprocess.Popen(cmd, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        yield f'http://127.0.0.1:{port}', proc
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        log.close()
+
+
+def bench_throughput(server: FixtureServer, workdir: str, workers: int, clients: int,
+                     duration: float, path: str = '/api/data') -> dict:
+    """gunicorn (웜 스타트) 워커에 동시 요청"""
+    import requests
+
+    with gunicorn_server(server, workdir, workers, env={'DISABLE_AUTH': 'true'}) as (base, proc):
+        if not wait_for(f'{base}/health', 60):
+            return {'error': 'gunicorn did not become healthy'}
+        if not wait_for(f'{base}{path}', 60, lambda response: response.ok and bool(response.json())):
+            return {'error': f'{path} returned no data'}
+
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def client():
+            session = requests.Session()
+            local = []
+            failed = 0
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = session.get(f'{base}{path}', timeout=10)
+                    response.content
+                    if not response.ok:
+                        failed += 1
+                except requests.RequestException:
+                    failed += 1
+                local.append(time.perf_counter() - started)
+            with lock:
+                latencies.extend(local)
+                errors[0] += failed
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        worker_rss = [rss_mb(pid) for pid in children(proc.pid)]
+        return {
+            'path': path,
+            'workers': workers,
+            'clients': clients,
+            'duration_s': elapsed,
+            'requests': len(latencies),
+            'errors': errors[0],
+            'rps': len(latencies) / elapsed if elapsed else 0,
+            'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else None,
+            'p90_ms': percentile(latencies, 0.90) * 1000 if latencies else None,
+            'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+            'master_rss_mb': rss_mb(proc.pid),
+            'worker_rss_mb': [rss for rss in worker_rss if rss is not None],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='픽스처 재생 기반 전체 벤치마크')
+    parser.add_argument('--runs', type=int, default=3, help='사이클 반복 횟수')
+    parser.add_argument('--indicator-runs', type=int, default=20, help='지표별 재계산 횟수')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=15, help='처리량 측정 시간 (초)')
+    parser.add_argument('--keep-rate-limits', action='store_true', help='MarketData 호출 간격 제한 유지')
+    parser.add_argument('--skip-throughput', action='store_true')
+    parser.add_argument('--output', default=os.path.join(REPO_ROOT, 'benchmarks', 'results', 'suite.json'))
+    args = parser.parse_args()
+
+    server = FixtureServer().start()
+    results = {}
+    try:
+        # 로그/데이터/SQLite 파일이 저장소에 생기지 않도록 임시 디렉터리에서 실행
+        with tempfile.TemporaryDirectory() as workdir:
+            print(f"⏱  수집 사이클 ({server.url})")
+            results['cycle'] = bench_cycle(server, workdir, args.runs, args.indicator_runs, args.keep_rate_limits)
+            cycle = results['cycle']
+            if 'error' in cycle:
+                print(f"❌ cycle: {cycle['error']}")
+            else:
+                print(f"   콜드 {cycle['cold_ms']:.0f} ms, 업스트림 {cycle['upstream']['median_ms']:.0f} ms, "
+                      f"캐시 {cycle['cached']['median_ms']:.1f} ms, RSS {cycle['rss_mb']:.0f} MB")
+
+            if not args.skip_throughput:
+                print(f"⏱  /api/data 처리량 ({args.workers} 워커, {args.clients} 클라이언트, {args.duration:.0f}초)")
+                results['throughput'] = bench_throughput(server, workdir, args.workers, args.clients, args.duration)
+                throughput = results['throughput']
+                if 'error' in throughput:
+                    print(f"❌ throughput: {throughput['error']}")
+                else:
+                    print(f"   {throughput['rps']:.0f} req/s, p50 {throughput['p50_ms']:.1f} ms, "
+                          f"p99 {throughput['p99_ms']:.1f} ms, 오류 {throughput['errors']}")
+    finally:
+        server.stop()
+
+    report = {
+        'benchmark': 'suite',
+        'timestamp': datetime.now().isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'parameters': vars(args),
+        'fixture_requests': server.stats(),
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+업스트림 응답 재생 서버 (벤치마크용)
+- benchmarks/fixtures/<source>.json 에 기록된 HTTP 응답을 그대로 돌려줌
+- 경로 프리픽스로 소스 구분: /binance, /coingecko, /bithumb, /upbit, /dunamu, /alternative_me, /google_trends
+- upstream_env(): market_data가 읽는 *_API_URL / GOOGLE_TRENDS_URL 환경변수 (이 서버로 향하게)
+- --record: 기록에 없는 요청은 실제 업스트림으로 전달하고 응답을 픽스처에 추가 저장
+- --synthesize: 업스트림에 접근할 수 없을 때 같은 형식의 결정적(seed 고정) 픽스처 생성
+
+사용법:
+    python benchmarks/fixture_server.py [--port 8900] [--record]
+    python benchmarks/fixture_server.py --synthesize
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'fixtures')
+
+# 소스 -> (market_data 환경변수, 실제 업스트림 베이스 URL)
+SOURCES = {
+    'binance': ('BINANCE_API_URL', 'https://api.binance.com'),
+    'coingecko': ('COINGECKO_API_URL', 'https://api.coingecko.com'),
+    'bithumb': ('BITHUMB_API_URL', 'https://api.bithumb.com'),
+    'upbit': ('UPBIT_API_URL', 'https://api.upbit.com'),
+    'dunamu': ('DUNAMU_API_URL', 'https://quotation-api-cdn.dunamu.com'),
+    'alternative_me': ('FEAR_GREED_API_URL', 'https://api.alternative.me'),
+    'google_trends': ('GOOGLE_TRENDS_URL', 'https://trends.google.com/trends'),
+}
+
+
+def load_fixtures(directory: str = FIXTURE_DIR) -> dict:
+    """소스별 기록 목록 [{method, path, query, status, content_type, body}]"""
+    fixtures = {}
+    for source in SOURCES:
+        path = os.path.join(directory, f'{source}.json')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                fixtures[source] = json.load(f)
+    return fixtures
+
+
+def save_fixtures(fixtures: dict, directory: str = FIXTURE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    for source, exchanges in fixtures.items():
+        with open(os.path.join(directory, f'{source}.json'), 'w', encoding='utf-8') as f:
+            json.dump(exchanges, f, indent=1, ensure_ascii=False)
+
+
+class FixtureServer:
+    """기록된 응답 재생 (요청 경로+쿼리가 같으면 그 응답, 없으면 같은 경로의 첫 응답)"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, record: bool = False,
+                 directory: str = FIXTURE_DIR):
+        self.directory = directory
+        self.record = record
+        self.fixtures = load_fixtures(directory)
+        self.requests = Counter()
+        self.misses = Counter()
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def upstream_env(self) -> dict:
+        return {env: f'{self.url}/{source}' for source, (env, _) in SOURCES.items()}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.record:
+            save_fixtures(self.fixtures, self.directory)
+
+    def stats(self) -> dict:
+        return {'requests': dict(self.requests), 'misses': dict(self.misses)}
+
+    def lookup(self, source: str, method: str, path: str, query: dict):
+        exchanges = self.fixtures.get(source, [])
+        fallback = None
+        for exchange in exchanges:
+            if exchange['method'] != method or exchange['path'] != path:
+                continue
+            if exchange.get('query', {}) == query:
+                return exchange
+            fallback = fallback or exchange
+        return fallback
+
+    def forward(self, source: str, method: str, path: str, query: dict, body: bytes, headers: dict):
+        """기록 모드: 실제 업스트림 호출 후 저장"""
+        import requests
+        upstream = SOURCES[source][1] + path
+        response = requests.request(method, upstream, params=query, data=body or None, timeout=30,
+                                    headers={k: v for k, v in headers.items() if k.lower() in ('user-agent', 'accept')})
+        exchange = {
+            'method': method,
+            'path': path,
+            'query': query,
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type', 'application/json'),
+            'body': response.text,
+        }
+        with self._lock:
+            self.fixtures.setdefault(source, []).append(exchange)
+        return exchange
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _serve(self, method):
+                parts = urlsplit(self.path)
+                source, _, rest = parts.path.lstrip('/').partition('/')
+                path = '/' + rest
+                query = dict(parse_qsl(parts.query, keep_blank_values=True))
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                with server._lock:
+                    server.requests[source] += 1
+
+                exchange = server.lookup(source, method, path, query) if source in SOURCES else None
+                if exchange is None and server.record and source in SOURCES:
+                    try:
+                        exchange = server.forward(source, method, path, query, body, dict(self.headers))
+                    except Exception as e:
+                        exchange = {'status': 502, 'content_type': 'text/plain', 'body': str(e)}
+                if exchange is None:
+                    with server._lock:
+                        server.misses[f'{method} /{source}{path}'] += 1
+                    exchange = {'status': 404, 'content_type': 'text/plain', 'body': 'no fixture'}
+
+                payload = exchange['body'].encode('utf-8')
+                self.send_response(exchange['status'])
+                self.send_header('Content-Type', exchange['content_type'])
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._serve('GET')
+
+            def do_POST(self):
+                self._serve('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# ===== 결정적 픽스처 생성 =====
+
+ASSET_FIXTURES = {
+    # 자산: (coingecko id, binance 심볼, upbit 마켓, 시작가 USD, 일간 변동성)
+    'BTC': ('bitcoin', 'BTCUSDT', 'KRW-BTC', 62000, 0.025),
+    'ETH': ('ethereum', 'ETHUSDT', 'KRW-ETH', 3100, 0.032),
+    'SOL': ('solana', 'SOLUSDT', 'KRW-SOL', 140, 0.045),
+    'XRP': ('ripple', 'XRPUSDT', 'KRW-XRP', 0.55, 0.04),
+}
+SYNTHETIC_FX = 1385.5
+SYNTHETIC_PREMIUM = 1.03
+SYNTHETIC_NOW = 1760000000  # 고정 기준 시각 (재현성)
+
+
+def _json_exchange(method, path, query, body, content_type='application/json'):
+    return {'method': method, 'path': path, 'query': query, 'status': 200,
+            'content_type': content_type, 'body': json.dumps(body, separators=(',', ':'))}
+
+
+def synthesize(seed: int = 42, days: int = 365) -> dict:
+    """실제 응답과 같은 형식의 픽스처 (가격은 seed 고정 랜덤 워크)"""
+    rng = random.Random(seed)
+    closes = {}
+    for asset, (_, _, _, start, vol) in ASSET_FIXTURES.items():
+        price = start
+        series = []
+        for _ in range(days + 1):
+            price *= math.exp(rng.gauss(0.0015, vol))
+            series.append(round(price, 6))
+        closes[asset] = series
+    last = {asset: series[-1] for asset, series in closes.items()}
+    day_ms = 86400 * 1000
+    start_ms = (SYNTHETIC_NOW - days * 86400) * 1000
+
+    symbols = [spec[1] for spec in ASSET_FIXTURES.values()]
+    fixtures = {
+        'binance': [_json_exchange(
+            'GET', '/api/v3/ticker/price', {'symbols': json.dumps(symbols, separators=(',', ':'))},
+            [{'symbol': spec[1], 'price': f'{last[asset]:.8f}'} for asset, spec in ASSET_FIXTURES.items()]
+        )],
+        'coingecko': [_json_exchange(
+            'GET', '/api/v3/simple/price',
+            {'ids': ','.join(spec[0] for spec in ASSET_FIXTURES.values()), 'vs_currencies': 'usd'},
+            {spec[0]: {'usd': last[asset]} for asset, spec in ASSET_FIXTURES.items()}
+        )] + [_json_exchange(
+            'GET', f'/api/v3/coins/{spec[0]}/market_chart',
+            {'vs_currency': 'usd', 'days': str(days), 'interval': 'daily'},
+            {
+                'prices': [[start_ms + i * day_ms, p] for i, p in enumerate(closes[asset])],
+                'market_caps': [[start_ms + i * day_ms, p * 19_000_000] for i, p in enumerate(closes[asset])],
+                'total_volumes': [[start_ms + i * day_ms, p * 400_000] for i, p in enumerate(closes[asset])],
+            }
+        ) for asset, spec in ASSET_FIXTURES.items()],
+        'bithumb': [_json_exchange('GET', '/public/ticker/ALL_KRW', {}, {
+            'status': '0000',
+            'data': {
+                **{asset: {
+                    'opening_price': f'{last[asset] * SYNTHETIC_FX * SYNTHETIC_PREMIUM * 0.99:.0f}',
+                    'closing_price': f'{last[asset] * SYNTHETIC_FX * SYNTHETIC_PREMIUM:.0f}',
+                    'units_traded_24H': '1234.5',
+                } for asset in ASSET_FIXTURES},
+                'date': str(SYNTHETIC_NOW * 1000),
+            }
+        })],
+        'upbit': [_json_exchange(
+            'GET', '/v1/ticker', {'markets': ','.join(spec[2] for spec in ASSET_FIXTURES.values())},
+            [{'market': spec[2], 'trade_price': round(last[asset] * SYNTHETIC_FX * SYNTHETIC_PREMIUM, 2)}
+             for asset, spec in ASSET_FIXTURES.items()]
+        )],
+        'dunamu': [_json_exchange('GET', '/v1/forex/recent', {'codes': 'FRX.KRWUSD'}, [{
+            'code': 'FRX.KRWUSD', 'currencyCode': 'USD', 'basePrice': SYNTHETIC_FX,
+            'timestamp': SYNTHETIC_NOW * 1000,
+        }])],
+        'alternative_me': [_json_exchange('GET', '/fng/', {}, {
+            'name': 'Fear and Greed Index',
+            'data': [{'value': '38', 'value_classification': 'Fear', 'timestamp': str(SYNTHETIC_NOW)}],
+        })],
+    }
+
+    # Google Trends: 쿠키 요청 -> explore 토큰 -> multiline (앞부분 잡문자는 pytrends가 잘라냄)
+    hours = 7 * 24
+    timeline = [{
+        'time': str(SYNTHETIC_NOW - (hours - i) * 3600),
+        'formattedTime': '',
+        'value': [max(1, min(100, int(45 + 20 * math.sin(i / 12) + rng.gauss(0, 6))))],
+    } for i in range(hours)]
+    widgets = {'widgets': [{'id': 'TIMESERIES', 'token': 'fixture-token',
+                            'request': {'time': 'now 7-d', 'resolution': 'HOUR'}}]}
+    fixtures['google_trends'] = [
+        {'method': 'GET', 'path': '/explore/', 'query': {'geo': 'ko'}, 'status': 200,
+         'content_type': 'text/html', 'body': ''},
+        {'method': 'POST', 'path': '/api/explore', 'query': {}, 'status': 200,
+         'content_type': 'application/json', 'body': ")]}'" + json.dumps(widgets)},
+        {'method': 'GET', 'path': '/api/widgetdata/multiline', 'query': {}, 'status': 200,
+         'content_type': 'application/json',
+         'body': ")]}'," + json.dumps({'default': {'timelineData': timeline}})},
+    ]
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='업스트림 응답 재생 서버')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--record', action='store_true', help='없는 응답은 실제 업스트림에서 받아 기록')
+    parser.add_argument('--synthesize', action='store_true', help='결정적 픽스처 생성 후 종료')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.synthesize:
+        save_fixtures(synthesize(args.seed))
+        print(f"픽스처 생성: {FIXTURE_DIR}")
+        return
+
+    server = FixtureServer(port=args.port, record=args.record).start()
+    print(f"픽스처 서버: {server.url} ({'기록' if args.record else '재생'} 모드)")
+    for env, value in server.upstream_env().items():
+        print(f"export {env}={value}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats(), indent=2), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+대시보드 동시 접속 부하 테스트 (app_with_auth, gunicorn 워커 × 스레드)
+- 업스트림은 fixture_server 재생, 세션 DB에 미리 로그인된 뷰어 세션을 만들어 login_required 경로 포함
+- polling: 뷰어마다 interval(기본 30초)마다 /api/data + /api/history, 뷰어 수를 단계적으로 늘려
+  p99 <= SLO 이고 오류율 <= 1% 인 최대 뷰어 수를 찾음 (오픈 루프 - 지연은 예정 시각부터 측정)
+- sse: /api/stream 구독자 동시 연결 (첫 이벤트까지 시간) + 그동안 /api/data 지연
+- history: /api/history?since=&until=&limit= 구간 조회
+- refresh: /api/refresh 동시 요청 폭주 + 그동안 /api/data 지연, 업스트림 요청 수
+- 결과는 benchmarks/results/load_test.json
+
+사용법:
+    python benchmarks/load_test.py [--workers 2] [--threads 4] [--steps 50 100 200 400 800]
+                                   [--interval 30] [--step-duration 60] [--scenarios polling sse history refresh]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from hashlib import sha512
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_import_time import REPO_ROOT, git_revision  # noqa: E402
+from bench_suite import child_env, gunicorn_server, percentile, wait_for  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+
+USER_AGENT = 'btc-alert-load-test/1.0'
+SCENARIOS = ('polling', 'sse', 'history', 'refresh')
+
+# 스냅샷 1회 수집 + 히스토리(최대 100개) 생성 -> 워커가 웜 스타트로 읽음
+PRIME_SNIPPET = """
+import json, random
+from datetime import datetime, timedelta
+import dashboard_with_status as dashboard
+dashboard.system.market.api_limits.clear()
+results = dashboard.collect_all_assets()
+latest, summary = results[dashboard.DEFAULT_ASSET]
+with open('dashboard_data.json', 'w') as f:
+    json.dump(latest, f, default=str)
+rng = random.Random(7)
+now = datetime.now()
+history = [{{
+    'timestamp': (now - timedelta(minutes=5 * ({points} - i))).isoformat(),
+    'heat_score': max(0.0, summary['heat_score'] + rng.gauss(0, 3)),
+    'acc_score': max(0.0, summary['acc_score'] + rng.gauss(0, 3)),
+    'price': summary['price'] * (1 + rng.gauss(0, 0.01)),
+}} for i in range({points})]
+with open('dashboard_history.json', 'w') as f:
+    json.dump(history, f)
+print(len(history))
+"""
+
+
+def prime_snapshot(server: FixtureServer, workdir: str, points: int = 100):
+    code = PRIME_SNIPPET.format(points=points)
+    proc = subprocess.run([sys.executable, '-c', code], cwd=workdir, env=child_env(server),
+                          capture_output=True, text=True, timeout=600)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else 'prime failed')
+
+
+def seed_sessions(workdir: str, count: int) -> list:
+    """로그인 상태의 세션을 세션 DB에 직접 생성 -> 쿠키 값(sid) 목록
+
+    Flask-Login의 세션 식별자(_id)를 부하 생성기의 주소/User-Agent로 맞춰
+    요청마다 세션이 바뀌지(재발급되지) 않게 한다.
+    """
+    sys.path.insert(0, REPO_ROOT)
+    from session_store import SessionStore, SQLiteSessionInterface
+
+    store = SessionStore(os.path.join(workdir, 'sessions.db'))
+    identifier = sha512(f"{b'127.0.0.1'}|{USER_AGENT.encode('utf-8')}".encode('utf8')).hexdigest()
+    serializer = SQLiteSessionInterface.serializer
+    sids = []
+    for i in range(count):
+        user_id = f'loadtest-{i}'
+        store.save_user({'id': user_id, 'email': f'{user_id}@example.com', 'name': user_id,
+                         'provider': 'loadtest', 'picture': None, 'created_at': datetime.now().isoformat()})
+        data = serializer.dumps({'_user_id': user_id, '_fresh': True, '_id': identifier})
+        sid, _ = store.save_session(data, user_id=user_id)
+        sids.append(sid)
+    return sids
+
+
+class Client:
+    """스레드별 HTTP 세션 (응답 쿠키는 저장하지 않고 뷰어 쿠키를 직접 지정)"""
+
+    def __init__(self, base: str, cookie_name: str = 'session'):
+        self.base = base
+        self.cookie_name = cookie_name
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        import requests
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            self._local.session = session
+        return session
+
+    def get(self, path: str, sid: str = None, **kwargs):
+        headers = {'User-Agent': USER_AGENT}
+        if sid:
+            headers['Cookie'] = f'{self.cookie_name}={sid}'
+        return self.session.get(f'{self.base}{path}', headers=headers, allow_redirects=False, **kwargs)
+
+
+class Recorder:
+    """경로별 지연/오류 집계"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.reissued = 0
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float, ok: bool, reissued: bool = False):
+        with self._lock:
+            self.latencies.setdefault(name, []).append(seconds)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            if reissued:
+                self.reissued += 1
+
+    def fetch(self, client: Client, name: str, path: str, sid: str = None, started: float = None,
+              timeout: float = 10):
+        """요청 1회 (started가 있으면 그 시각부터 지연 측정 - 클라이언트 대기 포함)"""
+        import requests
+        started = started or time.perf_counter()
+        ok = False
+        reissued = False
+        try:
+            response = client.get(path, sid, timeout=timeout)
+            response.content
+            ok = response.status_code == 200
+            reissued = 'Set-Cookie' in response.headers
+        except requests.RequestException:
+            pass
+        self.add(name, time.perf_counter() - started, ok, reissued)
+        return ok
+
+    def summary(self, elapsed: float = None) -> dict:
+        with self._lock:
+            result = {}
+            for name, samples in self.latencies.items():
+                errors = self.errors.get(name, 0)
+                result[name] = {
+                    'requests': len(samples),
+                    'errors': errors,
+                    'error_rate': errors / len(samples),
+                    'p50_ms': percentile(samples, 0.50) * 1000,
+                    'p90_ms': percentile(samples, 0.90) * 1000,
+                    'p99_ms': percentile(samples, 0.99) * 1000,
+                    'max_ms': max(samples) * 1000,
+                }
+                if elapsed:
+                    result[name]['rps'] = len(samples) / elapsed
+            return result
+
+    def overall(self) -> dict:
+        with self._lock:
+            samples = [value for values in self.latencies.values() for value in values]
+            errors = sum(self.errors.values())
+        if not samples:
+            return {'requests': 0, 'errors': 0, 'error_rate': 0, 'p50_ms': None, 'p99_ms': None}
+        return {
+            'requests': len(samples),
+            'errors': errors,
+            'error_rate': errors / len(samples),
+            'p50_ms': percentile(samples, 0.50) * 1000,
+            'p99_ms': percentile(samples, 0.99) * 1000,
+        }
+
+
+class Probe(threading.Thread):
+    """다른 시나리오가 도는 동안 /api/data 지연을 주기적으로 측정"""
+
+    def __init__(self, client: Client, recorder: Recorder, sid: str, period: float = 0.2):
+        super().__init__(daemon=True)
+        self.client = client
+        self.recorder = recorder
+        self.sid = sid
+        self.period = period
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.recorder.fetch(self.client, 'probe /api/data', '/api/data', self.sid)
+            self.stopped.wait(self.period)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+# ===== 시나리오 =====
+
+def run_polling_step(client: Client, sids: list, viewers: int, interval: float, duration: float,
+                     pool_size: int) -> dict:
+    """뷰어 viewers명이 interval마다 /api/data + /api/history (시작 시점은 고르게 분산)"""
+    schedule = []
+    for viewer in range(viewers):
+        offset = interval * viewer / viewers
+        while offset < duration:
+            schedule.append((offset, sids[viewer % len(sids)]))
+            offset += interval
+    schedule.sort()
+
+    recorder = Recorder()
+
+    def poll(started, sid):
+        recorder.fetch(client, '/api/data', '/api/data', sid, started)
+        recorder.fetch(client, '/api/history', '/api/history', sid)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        for offset, sid in schedule:
+            delay = started + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(poll, started + offset, sid)
+    elapsed = time.perf_counter() - started
+    return {
+        'viewers': viewers,
+        'offered_rps': 2 * viewers / interval,
+        'paths': recorder.summary(elapsed),
+        **recorder.overall(),
+        'session_reissued': recorder.reissued,
+    }
+
+
+def scenario_polling(client: Client, sids: list, args) -> dict:
+    steps = []
+    max_viewers = 0
+    for viewers in args.steps:
+        step = run_polling_step(client, sids, viewers, args.interval, args.step_duration, args.pool_size)
+        step['sustainable'] = (step['requests'] > 0 and step['error_rate'] <= args.max_error_rate
+                               and step['p99_ms'] <= args.slo_ms)
+        steps.append(step)
+        mark = '✅' if step['sustainable'] else '❌'
+        print(f"   {mark} 뷰어 {viewers}: p50 {step['p50_ms']:.1f} ms, p99 {step['p99_ms']:.1f} ms, "
+              f"오류 {step['errors']}/{step['requests']}")
+        if not step['sustainable']:
+            break
+        max_viewers = viewers
+    return {
+        'interval_s': args.interval,
+        'step_duration_s': args.step_duration,
+        'slo_p99_ms': args.slo_ms,
+        'max_error_rate': args.max_error_rate,
+        'max_sustainable_viewers': max_viewers,
+        'steps': steps,
+    }
+
+
+def scenario_sse(client: Client, sids: list, args) -> dict:
+    """구독자 동시 연결 - 첫 이벤트까지 시간, 연결 유지 중 /api/data 지연"""
+    import requests
+
+    first_event = []
+    failures = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def subscribe(sid):
+        started = time.perf_counter()
+        try:
+            response = client.get('/api/stream', sid, stream=True, timeout=(5, args.duration + 20))
+            received = False
+            for line in response.iter_lines():
+                if line.startswith(b'data:') and not received:
+                    received = True
+                    with lock:
+                        first_event.append(time.perf_counter() - started)
+                if time.perf_counter() >= deadline:
+                    break
+            response.close()
+            if not received:
+                with lock:
+                    failures[0] += 1
+        except requests.RequestException:
+            with lock:
+                failures[0] += 1
+
+    probe_recorder = Recorder()
+    probe = Probe(client, probe_recorder, sids[0])
+    subscribers = [threading.Thread(target=subscribe, args=(sids[i % len(sids)],), daemon=True)
+                   for i in range(args.sse_subscribers)]
+    for thread in subscribers:
+        thread.start()
+    probe.start()
+    for thread in subscribers:
+        thread.join(timeout=args.duration + 30)
+    probe.stop()
+
+    result = {
+        'subscribers': args.sse_subscribers,
+        'received_first_event': len(first_event),
+        'failed': failures[0],
+        'probe': probe_recorder.summary().get('probe /api/data', {}),
+    }
+    if first_event:
+        result['first_event_p50_ms'] = percentile(first_event, 0.50) * 1000
+        result['first_event_p99_ms'] = percentile(first_event, 0.99) * 1000
+    return result
+
+
+def scenario_history(client: Client, sids: list, args) -> dict:
+    """closed loop 동시 클라이언트가 무작위 구간 조회"""
+    history = client.get('/api/history', sids[0], timeout=60).json()
+    timestamps = [point['timestamp'] for point in history if 'timestamp' in point]
+    if not timestamps:
+        return {'error': 'no history'}
+
+    recorder = Recorder()
+    deadline = time.perf_counter() + args.duration
+
+    def worker(index):
+        rng = random.Random(index)
+        sid = sids[index % len(sids)]
+        while time.perf_counter() < deadline:
+            kind = rng.choice(('limit', 'since', 'range'))
+            if kind == 'limit':
+                path = f'/api/history?limit={rng.randint(10, 100)}'
+            else:
+                start = rng.randrange(len(timestamps))
+                path = f'/api/history?since={quote(timestamps[start])}'
+                if kind == 'range':
+                    path += f'&until={quote(timestamps[rng.randrange(start, len(timestamps))])}'
+            recorder.fetch(client, f'history {kind}', path, sid)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {'clients': args.clients, 'history_points': len(timestamps),
+            'queries': recorder.summary(elapsed), **recorder.overall()}
+
+
+def scenario_refresh(client: Client, sids: list, args, server: FixtureServer) -> dict:
+    """storm_size개의 /api/refresh를 동시에 (storm_rounds회) - 업스트림 요청 수와 /api/data 지연"""
+    upstream_before = sum(server.stats()['requests'].values())
+    recorder = Recorder()
+    probe_recorder = Recorder()
+    probe = Probe(client, probe_recorder, sids[0])
+    probe.start()
+    for _ in range(args.storm_rounds):
+        barrier = threading.Barrier(args.storm_size)
+
+        def storm(index):
+            barrier.wait()
+            recorder.fetch(client, '/api/refresh', '/api/refresh', sids[index % len(sids)])
+
+        threads = [threading.Thread(target=storm, args=(i,)) for i in range(args.storm_size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        time.sleep(args.storm_gap)
+    probe.stop()
+    return {
+        'storm_size': args.storm_size,
+        'rounds': args.storm_rounds,
+        'refresh': recorder.summary().get('/api/refresh', {}),
+        'probe': probe_recorder.summary().get('probe /api/data', {}),
+        'upstream_requests': sum(server.stats()['requests'].values()) - upstream_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대시보드 동시 접속 부하 테스트')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help='워커당 스레드 (gthread)')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--no-auth', action='store_true', help='DISABLE_AUTH=true (세션 조회 제외)')
+    parser.add_argument('--steps', type=int, nargs='+', default=[50, 100, 200, 400, 800, 1600],
+                        help='polling 단계별 뷰어 수')
+    parser.add_argument('--interval', type=float, default=30, help='뷰어 폴링 주기 (초)')
+    parser.add_argument('--step-duration', type=float, default=60, help='단계별 측정 시간 (초)')
+    parser.add_argument('--pool-size', type=int, default=128, help='부하 생성기 동시 요청 스레드')
+    parser.add_argument('--slo-ms', type=float, default=1000, help='지속 가능 판단 p99 (ms)')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--duration', type=float, default=20, help='sse/history 측정 시간 (초)')
+    parser.add_argument('--clients', type=int, default=8, help='history 동시 클라이언트')
+    parser.add_argument('--sse-subscribers', type=int, default=8)
+    parser.add_argument('--storm-size', type=int, default=50)
+    parser.add_argument('--storm-rounds', type=int, default=3)
+    parser.add_argument('--storm-gap', type=float, default=2)
+    parser.add_argument('--output', default=os.path.join(REPO_ROOT, 'benchmarks', 'results', 'load_test.json'))
+    args = parser.parse_args()
+
+    server = FixtureServer().start()
+    results = {}
+    try:
+        # 로그/데이터/세션 DB가 저장소에 생기지 않도록 임시 디렉터리에서 실행
+        with tempfile.TemporaryDirectory() as workdir:
+            print("⏱  스냅샷 준비")
+            prime_snapshot(server, workdir)
+            sids = [None] if args.no_auth else seed_sessions(workdir, max(args.steps))
+            env = {'DISABLE_AUTH': 'true' if args.no_auth else 'false'}
+
+            with gunicorn_server(server, workdir, args.workers, args.threads, env) as (base, _):
+                client = Client(base)
+                if not wait_for(f'{base}/health', 60):
+                    raise RuntimeError('gunicorn did not become healthy')
+                if not Recorder().fetch(client, 'check', '/api/data', sids[0]):
+                    raise RuntimeError('/api/data rejected the seeded session')
+
+                for name in args.scenarios:
+                    # 앞 시나리오의 SSE 연결이 서버 스레드를 놓을 때까지 대기
+                    wait_for(f'{base}/health', 60)
+                    print(f"⏱  {name} ({args.workers} 워커 × {args.threads} 스레드)")
+                    if name == 'polling':
+                        results[name] = scenario_polling(client, sids, args)
+                        print(f"   지속 가능 최대 뷰어: {results[name]['max_sustainable_viewers']}")
+                    elif name == 'refresh':
+                        results[name] = scenario_refresh(client, sids, args, server)
+                    else:
+                        results[name] = {'sse': scenario_sse, 'history': scenario_history}[name](client, sids, args)
+                    if name != 'polling':
+                        summary = results[name].get('probe') or results[name]
+                        if summary.get('p50_ms') is not None:
+                            print(f"   p50 {summary['p50_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms")
+    finally:
+        server.stop()
+
+    report = {
+        'benchmark': 'load_test',
+        'timestamp': datetime.now().isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'parameters': vars(args),
+        'fixture_requests': server.stats(),
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
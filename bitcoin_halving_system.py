@@ -4,20 +4,17 @@
 - 반감기 사이클 (30%)
 - 과열도 모니터링 (나머지 70% 중 매도 지표)
 - 축적도 모니터링 (나머지 70% 중 매수 지표)
+- 데이터 수집/지표 계산은 strategy_engine 'halving' 프로필 사용
 """
 
-import requests
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import time
 import json
 from typing import Dict, Tuple, Optional
 import os
-from plyer import notification
 import logging
-from pytrends.request import TrendReq
-import schedule
+import metrics
+from strategy_engine import ProfileStrategy
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,10 +26,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class BitcoinHalvingStrategy:
+class BitcoinHalvingStrategy(ProfileStrategy):
     """반감기 사이클 기반 비트코인 투자 전략"""
     
-    def __init__(self):
+    PROFILE = 'halving'
+    
+    def __init__(self, engine=None):
+        super().__init__(engine)
+        
         # 반감기 정보 (과거 및 미래)
         self.halvings = [
             {'date': datetime(2012, 11, 28), 'number': 1},
@@ -45,33 +46,13 @@ class BitcoinHalvingStrategy:
         # 반감기 사이클 지표 (30% 비중)
         self.halving_weight = 0.30
         
-        # 과열도 지표 가중치 (전체 70% 중 비율 조정)
-        self.heat_indicators_weight = {
-            'pi_cycle_top': 0.21,      # 30% -> 21% (0.3 * 0.7)
-            'nupl': 0.175,              # 25% -> 17.5%
-            'rsi_weekly': 0.14,         # 20% -> 14%
-            'google_trends': 0.105,     # 15% -> 10.5%
-            'kimchi_premium': 0.07      # 10% -> 7%
-        }
-        
-        # 축적도 지표 가중치 (전체 70% 중 비율 조정)
-        self.accumulation_indicators_weight = {
-            'fear_greed': 0.28,         # 40% -> 28% (0.4 * 0.7)
-            'exchange_balance': 0.245,  # 35% -> 24.5%
-            'long_term_holder': 0.175   # 25% -> 17.5%
-        }
-        
-        self.last_heat_level = 0
-        self.last_accumulation_level = 0
-        self.last_halving_phase = ""
+        # 과열도/축적도 지표 가중치 (전체 70% 중 비율 조정, PROFILES['halving'])
+        self.heat_indicators_weight = self.weights('heat')
+        self.accumulation_indicators_weight = self.weights('accumulation')
         
-        # API 제한 관리
-        self.last_api_call = {}
-        self.api_limits = {
-            'coingecko': 10,
-            'google_trends': 60,
-            'alternative_me': 10,
-        }
+        self.last_heat_level = self.alert_state.level('heat_level', 0)
+        self.last_accumulation_level = self.alert_state.level('accumulation_level', 0)
+        self.last_halving_phase = self.alert_state.level('halving_phase', "")
     
     def get_current_halving_cycle(self) -> Dict:
         """현재 반감기 사이클 정보 계산"""
@@ -188,211 +169,6 @@ class BitcoinHalvingStrategy:
             'cycle_info': cycle_info
         }
     
-    def rate_limit(self, api_name: str):
-        """API 호출 제한"""
-        if api_name in self.last_api_call:
-            elapsed = time.time() - self.last_api_call[api_name]
-            wait_time = self.api_limits.get(api_name, 1) - elapsed
-            if wait_time > 0:
-                time.sleep(wait_time)
-        self.last_api_call[api_name] = time.time()
-    
-    # ===== 공통 가격 조회 함수 =====
-    
-    def get_bitcoin_price_usd(self) -> float:
-        """USD 가격 조회"""
-        try:
-            response = requests.get('https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT')
-            return float(response.json()['price'])
-        except:
-            try:
-                self.rate_limit('coingecko')
-                response = requests.get('https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd')
-                return response.json()['bitcoin']['usd']
-            except Exception as e:
-                logger.error(f"USD 가격 조회 실패: {e}")
-                return 0
-    
-    def get_bitcoin_price_krw(self) -> float:
-        """KRW 가격 조회"""
-        try:
-            response = requests.get('https://api.bithumb.com/public/ticker/BTC_KRW')
-            data = response.json()
-            if data['status'] == '0000':
-                return float(data['data']['closing_price'])
-        except:
-            try:
-                response = requests.get('https://api.upbit.com/v1/ticker?markets=KRW-BTC')
-                return response.json()[0]['trade_price']
-            except Exception as e:
-                logger.error(f"KRW 가격 조회 실패: {e}")
-        return 0
-    
-    def get_exchange_rate(self) -> float:
-        """USD/KRW 환율"""
-        try:
-            response = requests.get('https://quotation-api-cdn.dunamu.com/v1/forex/recent?codes=FRX.KRWUSD')
-            return response.json()[0]['basePrice']
-        except:
-            return 1350
-    
-    def get_historical_prices(self, days: int) -> list:
-        """과거 가격 데이터"""
-        try:
-            self.rate_limit('coingecko')
-            url = f"https://api.coingecko.com/api/v3/coins/bitcoin/market_chart"
-            params = {'vs_currency': 'usd', 'days': days, 'interval': 'daily'}
-            response = requests.get(url, params=params)
-            return [price[1] for price in response.json()['prices']]
-        except Exception as e:
-            logger.error(f"과거 가격 조회 실패: {e}")
-            return []
-    
-    # ===== 과열도 지표 (매도) =====
-    
-    def calculate_rsi(self, prices: list, period: int = 14) -> float:
-        """RSI 계산"""
-        if len(prices) < period + 1:
-            return 50
-        
-        prices = np.array(prices)
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
-        
-        if avg_loss == 0:
-            return 100
-        
-        rs = avg_gain / avg_loss
-        return 100 - (100 / (1 + rs))
-    
-    def get_weekly_rsi(self) -> float:
-        """주간 RSI"""
-        try:
-            prices = self.get_historical_prices(100)
-            if prices:
-                weekly_prices = prices[::7]
-                if len(weekly_prices) > 14:
-                    return self.calculate_rsi(weekly_prices, 14)
-        except Exception as e:
-            logger.error(f"RSI 계산 실패: {e}")
-        return 50
-    
-    def check_pi_cycle_top(self) -> bool:
-        """Pi Cycle Top"""
-        try:
-            prices = self.get_historical_prices(365)
-            if len(prices) >= 350:
-                ma_111 = np.mean(prices[-111:])
-                ma_350 = np.mean(prices[-350:])
-                return (ma_111 * 2) > (ma_350 * 1.05)
-        except Exception as e:
-            logger.error(f"Pi Cycle Top 계산 실패: {e}")
-        return False
-    
-    def estimate_nupl(self) -> float:
-        """NUPL 추정"""
-        try:
-            current_price = self.get_bitcoin_price_usd()
-            prices_365 = self.get_historical_prices(365)
-            
-            if prices_365 and current_price > 0:
-                ma_200 = np.mean(prices_365[-200:]) if len(prices_365) >= 200 else np.mean(prices_365)
-                mvrv_approx = current_price / ma_200
-                nupl_estimate = (mvrv_approx - 1) / mvrv_approx if mvrv_approx > 1 else 0
-                
-                ath = max(prices_365) if prices_365 else current_price
-                position_in_cycle = current_price / ath
-                
-                return min((nupl_estimate * 0.7) + (position_in_cycle * 0.3), 0.95)
-        except Exception as e:
-            logger.error(f"NUPL 추정 실패: {e}")
-        return 0.5
-    
-    def get_google_trends_score(self) -> float:
-        """구글 트렌드"""
-        try:
-            self.rate_limit('google_trends')
-            pytrends = TrendReq(hl='ko', tz=540, timeout=(10,25))
-            pytrends.build_payload(['Bitcoin'], timeframe='now 7-d')
-            interest = pytrends.interest_over_time()
-            
-            if not interest.empty:
-                recent = interest['Bitcoin'].iloc[-1]
-                avg = interest['Bitcoin'].mean()
-                surge_ratio = recent / avg if avg > 0 else 1
-                return min((surge_ratio - 1) / 0.5, 1.0) if surge_ratio > 1 else 0
-        except Exception as e:
-            logger.error(f"Google Trends 조회 실패: {e}")
-        return 0.3
-    
-    def calculate_kimchi_premium(self) -> float:
-        """김치 프리미엄"""
-        try:
-            usd_price = self.get_bitcoin_price_usd()
-            krw_price = self.get_bitcoin_price_krw()
-            exchange_rate = self.get_exchange_rate()
-            
-            if all([usd_price > 0, krw_price > 0, exchange_rate > 0]):
-                usd_in_krw = usd_price * exchange_rate
-                return ((krw_price - usd_in_krw) / usd_in_krw) * 100
-        except Exception as e:
-            logger.error(f"김치 프리미엄 계산 실패: {e}")
-        return 0
-    
-    # ===== 축적도 지표 (매수) =====
-    
-    def get_fear_greed_index(self) -> int:
-        """Fear & Greed Index 조회"""
-        try:
-            self.rate_limit('alternative_me')
-            response = requests.get('https://api.alternative.me/fng/')
-            data = response.json()
-            if 'data' in data and len(data['data']) > 0:
-                value = int(data['data'][0]['value'])
-                classification = data['data'][0]['value_classification']
-                logger.info(f"Fear & Greed: {value} ({classification})")
-                return value
-        except Exception as e:
-            logger.error(f"Fear & Greed 조회 실패: {e}")
-        return 50
-    
-    def estimate_exchange_balance_trend(self) -> float:
-        """거래소 BTC 잔고 추세 추정"""
-        try:
-            prices = self.get_historical_prices(30)
-            if len(prices) > 7:
-                recent_volatility = np.std(prices[-7:])
-                prev_volatility = np.std(prices[-14:-7])
-                
-                if prev_volatility > 0:
-                    trend = 1 - (recent_volatility / prev_volatility)
-                    return max(min(trend, 1), -1)
-        except Exception as e:
-            logger.error(f"거래소 잔고 추세 추정 실패: {e}")
-        return 0
-    
-    def estimate_long_term_holder_accumulation(self) -> float:
-        """장기 보유자 축적 추정"""
-        try:
-            prices = self.get_historical_prices(200)
-            if len(prices) > 150:
-                price_150d_ago = prices[-150]
-                current_price = prices[-1]
-                
-                price_change = (current_price - price_150d_ago) / price_150d_ago
-                
-                if price_change < 0:
-                    return min(abs(price_change) * 2, 1)
-                else:
-                    return max(1 - price_change, 0)
-        except Exception as e:
-            logger.error(f"장기 보유자 추정 실패: {e}")
-        return 0.5
-    
     def get_months_until_halving(self) -> Optional[int]:
         """다음 반감기까지 남은 개월 수"""
         cycle_info = self.get_current_halving_cycle()
@@ -509,71 +285,22 @@ class BitcoinHalvingStrategy:
         """반감기 사이클을 포함한 종합 점수 계산"""
         
         # 1. 반감기 사이클 신호 (30% 비중)
-        halving_signal = self.calculate_halving_signal()
-        cycle_info = halving_signal['cycle_info']
-        
-        # 2. 과열도 지표들 (70% 중 일부)
-        heat_indicators = {}
-        heat_score = halving_signal['heat_contribution']  # 반감기가 기여하는 과열도
-        
-        # Pi Cycle Top
-        pi_cycle = self.check_pi_cycle_top()
-        heat_indicators['pi_cycle_top'] = pi_cycle
-        if pi_cycle:
-            heat_score += self.heat_indicators_weight['pi_cycle_top'] * 100
-        
-        # NUPL
-        nupl = self.estimate_nupl()
-        nupl_triggered = nupl > 0.75
-        heat_indicators['nupl'] = {'triggered': nupl_triggered, 'value': nupl}
-        if nupl_triggered:
-            heat_score += self.heat_indicators_weight['nupl'] * 100
-        
-        # RSI
-        rsi = self.get_weekly_rsi()
-        rsi_triggered = rsi > 85
-        heat_indicators['rsi_weekly'] = {'triggered': rsi_triggered, 'value': rsi}
-        if rsi_triggered:
-            heat_score += self.heat_indicators_weight['rsi_weekly'] * 100
-        
-        # Google Trends
-        trends = self.get_google_trends_score()
-        trends_triggered = trends > 0.7
-        heat_indicators['google_trends'] = {'triggered': trends_triggered, 'value': trends}
-        if trends_triggered:
-            heat_score += self.heat_indicators_weight['google_trends'] * 100
-        
-        # 김치 프리미엄
-        kimchi = self.calculate_kimchi_premium()
-        kimchi_triggered = kimchi > 10
-        heat_indicators['kimchi_premium'] = {'triggered': kimchi_triggered, 'value': kimchi}
-        if kimchi_triggered:
-            heat_score += self.heat_indicators_weight['kimchi_premium'] * 100
-        
-        # 3. 축적도 지표들 (70% 중 일부)
-        acc_indicators = {}
-        acc_score = halving_signal['acc_contribution']  # 반감기가 기여하는 축적도
-        
-        # Fear & Greed
-        fear_greed = self.get_fear_greed_index()
-        fear_triggered = fear_greed < 30
-        acc_indicators['fear_greed'] = {'triggered': fear_triggered, 'value': fear_greed}
-        if fear_triggered:
-            acc_score += self.accumulation_indicators_weight['fear_greed'] * 100
-        
-        # 거래소 잔고
-        exchange_trend = self.estimate_exchange_balance_trend()
-        exchange_triggered = exchange_trend > 0.3
-        acc_indicators['exchange_balance'] = {'triggered': exchange_triggered, 'value': exchange_trend}
-        if exchange_triggered:
-            acc_score += self.accumulation_indicators_weight['exchange_balance'] * 100
-        
-        # 장기 보유자
-        lth = self.estimate_long_term_holder_accumulation()
-        lth_triggered = lth > 0.6
-        acc_indicators['long_term_holder'] = {'triggered': lth_triggered, 'value': lth}
-        if lth_triggered:
-            acc_score += self.accumulation_indicators_weight['long_term_holder'] * 100
+        with metrics.span('scoring', step='halving_cycle'):
+            halving_signal = self.calculate_halving_signal()
+            cycle_info = halving_signal['cycle_info']
+        
+        # 2. 과열도/축적도 지표들 (70%) - 엔진이 프로필 가중치로 합산 (입력 조회/지표 계산 포함)
+        with metrics.span('scoring', step='evaluate'):
+            evaluation = self.evaluate()
+        
+        with metrics.span('scoring', step='combine'):
+            heat_indicators = dict(evaluation['heat']['indicators'])
+            heat_indicators['pi_cycle_top'] = heat_indicators['pi_cycle_top']['triggered']
+            heat_score = halving_signal['heat_contribution'] + evaluation['heat']['score']
+            
+            # 3. 축적도 (반감기가 기여하는 축적도 포함)
+            acc_indicators = evaluation['accumulation']['indicators']
+            acc_score = halving_signal['acc_contribution'] + evaluation['accumulation']['score']
         
         return {
             'halving_cycle': cycle_info,
@@ -641,19 +368,6 @@ class BitcoinHalvingStrategy:
             'accumulation_level': int(acc_score / 25)  # 0-4 레벨
         }
     
-    def send_notification(self, title: str, message: str):
-        """데스크톱 알림 발송"""
-        try:
-            notification.notify(
-                title=title,
-                message=message,
-                app_icon=None,
-                timeout=10
-            )
-            logger.info(f"📢 알림: {title} - {message}")
-        except Exception as e:
-            logger.error(f"알림 발송 실패: {e}")
-    
     def check_and_alert(self):
         """지표 확인 및 알람 발송"""
         # 가격 정보
@@ -685,33 +399,49 @@ class BitcoinHalvingStrategy:
         print(f"🎯 종합 권고: {actions['overall_action']}")
         print("="*70)
         
-        # 레벨 변경시 알림
-        if actions['heat_level'] != self.last_heat_level:
+        # 레벨 변경시 알림 (여러 레벨을 건너뛰면 band를 넘긴 레벨까지만 확정 -> 확정 레벨로 알림)
+        if self.alert_state.update('heat_level', actions['heat_level'], scores['heat_score'],
+                                   lambda score: int(score / 20)):
+            heat_level = self.alert_state.level('heat_level')
             self.send_notification(
-                f"🔥 과열도 레벨 {actions['heat_level']}",
-                f"점수: {scores['heat_score']:.0f}%\n{actions['heat_action']}"
+                f"🔥 과열도 레벨 {heat_level}",
+                f"점수: {scores['heat_score']:.0f}%\n{actions['heat_action']}",
+                key='heat_level', state=heat_level
             )
-            self.last_heat_level = actions['heat_level']
+            self.last_heat_level = heat_level
         
-        if actions['accumulation_level'] != self.last_accumulation_level:
+        if self.alert_state.update('accumulation_level', actions['accumulation_level'],
+                                   scores['accumulation_score'], lambda score: int(score / 25)):
+            acc_level = self.alert_state.level('accumulation_level')
             self.send_notification(
-                f"💎 축적도 레벨 {actions['accumulation_level']}",
-                f"점수: {scores['accumulation_score']:.0f}%\n{actions['accumulation_action']}"
+                f"💎 축적도 레벨 {acc_level}",
+                f"점수: {scores['accumulation_score']:.0f}%\n{actions['accumulation_action']}",
+                key='accumulation_level', state=acc_level
             )
-            self.last_accumulation_level = actions['accumulation_level']
+            self.last_accumulation_level = acc_level
         
         # 반감기 국면 변경시 알림
-        if cycle['phase'] != self.last_halving_phase:
+        if self.alert_state.update('halving_phase', cycle['phase']):
             self.send_notification(
                 f"⏰ 반감기 사이클 국면 전환",
-                f"새로운 국면: {cycle['phase']}\n{cycle['recommendation']}"
+                f"새로운 국면: {cycle['phase']}\n{cycle['recommendation']}",
+                key='halving_phase', state=cycle['phase']
             )
             self.last_halving_phase = cycle['phase']
         
         return scores, actions
 
 def main():
-    """메인 실행"""
+    """메인 실행
+
+    --event-driven (또는 EVENT_DRIVEN=1): 입력 소스별 수집 레인 + 트리거 교차 시 즉시 재계산
+    기본: 30분 주기 폴링
+    """
+    import sys
+    import schedule
+    
+    event_driven = '--event-driven' in sys.argv[1:] or os.getenv('EVENT_DRIVEN') == '1'
+    
     print("🚀 비트코인 투자 전략 시스템 (반감기 사이클 포함)")
     print("="*70)
     print("⏰ 반감기 사이클: 30% 비중")
@@ -719,14 +449,31 @@ def main():
     print("="*70)
     
     system = BitcoinHalvingStrategy()
+    system.start_trends_worker()
+    # 대기 중인 레벨 변경은 체류 시간이 끝나는 시각에 다시 확인 (다음 트리거/보조 체크까지 기다리지 않음)
+    system.alert_state.on_due = system.check_and_alert
     
     # 초기 체크
     system.check_and_alert()
     
-    # 정기 체크 스케줄
-    schedule.every(30).minutes.do(system.check_and_alert)
+    if event_driven:
+        from event_triggers import EventTriggerEngine
+        
+        # 임계값 교차 시 즉시 종합 점수 재계산 + 레벨 변경 알림
+        triggers = EventTriggerEngine(
+            system.PROFILE, system.engine,
+            on_trigger=lambda event: system.check_and_alert()
+        )
+        triggers.start()
+        
+        # 반감기 국면은 시간에 따라 바뀌므로 느린 주기로 보조 체크
+        schedule.every(6).hours.do(system.check_and_alert)
+        print("\n⚡ 이벤트 기반 모드: 가격 변동 시 관련 트리거만 즉시 재평가합니다...")
+    else:
+        # 정기 체크 스케줄
+        schedule.every(30).minutes.do(system.check_and_alert)
+        print("\n⏰ 30분마다 자동 체크합니다...")
     
-    print("\n⏰ 30분마다 자동 체크합니다...")
     print("종료: Ctrl+C")
     
     while True:
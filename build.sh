@@ -9,7 +9,4 @@ pip install --upgrade pip
 # Install dependencies
 pip install -r requirements.txt
 
-# Create necessary directories
-mkdir -p flask_session
-
 echo "Build completed successfully!"
\ No newline at end of file
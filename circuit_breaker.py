@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+업스트림 데이터 소스별 서킷 브레이커
+- closed: 정상 호출
+- open: 연속 실패 후 호출 차단 (캐시값 사용)
+- half_open: 복구 대기 시간이 지나면 1회 시험 호출
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출을 건너뛴 경우"""
+
+    def __init__(self, source: str):
+        super().__init__(f"{source} 서킷 브레이커 open - 호출 생략")
+        self.source = source
+
+
+class CircuitBreaker:
+    """단일 업스트림 소스용 서킷 브레이커"""
+
+    def __init__(self, name: str, failure_threshold: int = 3, recovery_timeout: float = 120,
+                 max_recovery_timeout: float = 1800):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+
+        self.state = CLOSED
+        self.failure_count = 0
+        self.consecutive_opens = 0
+        self.opened_at = None
+        self.last_error = None
+        self.last_success = None
+        self.last_failure = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _current_timeout(self) -> float:
+        """연속으로 다시 열릴수록 복구 대기 시간을 늘림"""
+        timeout = self.recovery_timeout * (2 ** max(self.consecutive_opens - 1, 0))
+        return min(timeout, self.max_recovery_timeout)
+
+    def allow_request(self) -> bool:
+        """호출 가능 여부 (open 상태에서 대기 시간이 지나면 half_open 전환)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.time() - self.opened_at < self._current_timeout():
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            # half_open: 시험 호출은 한 번에 하나만 허용
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        """호출 성공 기록 - 브레이커 닫기"""
+        with self._lock:
+            self.state = CLOSED
+            self.failure_count = 0
+            self.consecutive_opens = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+            self.last_success = time.time()
+
+    def record_failure(self, error=None):
+        """호출 실패 기록 - 임계치 도달 또는 시험 호출 실패 시 open"""
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure = time.time()
+            self.last_error = str(error) if error else None
+            if self.state == HALF_OPEN or self.failure_count >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.time()
+                self.consecutive_opens += 1
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """시험 호출이 결과 없이 취소된 경우 half_open 슬롯 반환"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def to_dict(self) -> Dict:
+        """/api/status 노출용 상태"""
+        def _iso(ts: Optional[float]):
+            return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+        with self._lock:
+            retry_at = None
+            if self.state == OPEN and self.opened_at:
+                retry_at = _iso(self.opened_at + self._current_timeout())
+            return {
+                'state': self.state,
+                'failure_count': self.failure_count,
+                'last_error': self.last_error,
+                'last_success': _iso(self.last_success),
+                'last_failure': _iso(self.last_failure),
+                'retry_at': retry_at,
+            }
+
+
+class CircuitBreakerRegistry:
+    """소스 이름별 브레이커 모음"""
+
+    def __init__(self, sources=(), **defaults):
+        self._defaults = defaults
+        self._breakers = {}
+        self._lock = threading.Lock()
+        for source in sources:
+            self.get(source)
+
+    def get(self, source: str) -> CircuitBreaker:
+        with self._lock:
+            if source not in self._breakers:
+                self._breakers[source] = CircuitBreaker(source, **self._defaults)
+            return self._breakers[source]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {name: breaker.to_dict() for name, breaker in breakers}
@@ -9,12 +9,12 @@ from flask_cors import CORS
 import threading
 import time
 from datetime import datetime
-import json
 import os
 from bitcoin_complete_system import BitcoinStrategySystem
-import numpy as np
+import serialization
 
 app = Flask(__name__)
+app.json = serialization.JSONProvider(app)
 CORS(app)
 
 # 전역 시스템 인스턴스
@@ -22,22 +22,6 @@ system = BitcoinStrategySystem()
 latest_data = {}
 historical_data = []
 
-def convert_to_json_serializable(obj):
-    """numpy 타입을 JSON 직렬화 가능한 타입으로 변환"""
-    if isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, (np.int64, np.int32, np.int16, np.int8)):
-        return int(obj)
-    elif isinstance(obj, (np.float64, np.float32, np.float16)):
-        return float(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_to_json_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_to_json_serializable(item) for item in obj]
-    return obj
-
 def update_data():
     """백그라운드에서 데이터 업데이트"""
     global latest_data, historical_data
@@ -57,8 +41,8 @@ def update_data():
             fear_greed = acc_details.get('fear_greed_value', 50)
             acc_level, acc_action = system.get_accumulation_action(acc_score, fear_greed)
             
-            # 최신 데이터 저장 (numpy 타입 변환)
-            latest_data = convert_to_json_serializable({
+            # 최신 데이터 저장 (numpy 값은 serialization이 직렬화할 때 처리)
+            latest_data = {
                 'timestamp': datetime.now().isoformat(),
                 'prices': {
                     'usd': btc_usd,
@@ -110,7 +94,7 @@ def update_data():
                         'months_to_halving': acc_details.get('months_to_halving', None)
                     }
                 }
-            })
+            }
             
             # 히스토리 추가 (최대 100개 유지)
             historical_data.append({
@@ -124,8 +108,7 @@ def update_data():
                 historical_data = historical_data[-100:]
             
             # 파일 저장
-            with open('dashboard_data.json', 'w') as f:
-                json.dump(latest_data, f, indent=2)
+            serialization.write('dashboard_data.json', latest_data)
             
             print(f"데이터 업데이트 완료: BTC ${btc_usd:,.0f}, 과열도 {heat_score:.1f}%, 축적도 {acc_score:.1f}%")
             
@@ -171,7 +154,7 @@ def update_single_data():
         fear_greed = acc_details.get('fear_greed_value', 50)
         acc_level, acc_action = system.get_accumulation_action(acc_score, fear_greed)
         
-        latest_data = convert_to_json_serializable({
+        latest_data = {
             'timestamp': datetime.now().isoformat(),
             'prices': {
                 'usd': btc_usd,
@@ -223,7 +206,7 @@ def update_single_data():
                     'months_to_halving': acc_details.get('months_to_halving', None)
                 }
             }
-        })
+        }
         
         print(f"새로고침 완료: BTC ${btc_usd:,.0f}")
     except Exception as e:
@@ -233,8 +216,7 @@ if __name__ == '__main__':
     # 초기 데이터 로드
     if os.path.exists('dashboard_data.json'):
         try:
-            with open('dashboard_data.json', 'r') as f:
-                latest_data = json.load(f)
+            latest_data = serialization.read('dashboard_data.json')
         except:
             print("기존 데이터 파일 로드 실패, 새로 시작합니다.")
             latest_data = {}
@@ -3,24 +3,39 @@
 비트코인 투자 전략 웹 대시보드 - 데이터 상태 모니터링 포함
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import threading
 import time
 from datetime import datetime, timedelta
-import json
 import os
 from bitcoin_halving_system import BitcoinHalvingStrategy
-import numpy as np
+from adaptive_scheduler import AdaptiveScheduler
+from alert_subscriptions import SubscriptionStore, describe_alert
+from notifications import get_dispatcher, subscription_recipient
+import metrics
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from market_data import DEFAULT_ASSET
+from strategy_engine import get_engine
+from snapshot_store import SnapshotStore
+from history_ring import HistoryRing, to_epoch
+import api_encoding
+import async_client
+import serialization
+import static_assets
 
 app = Flask(__name__)
+app.json = serialization.JSONProvider(app)  # numpy 값이 섞인 스냅샷을 변환 없이 응답
 CORS(app)
+static_assets.register(app, ['dashboard_final.html'])  # 대시보드 셸 + 해시 붙은 CSS/JS (사전 압축)
 
 # 전역 시스템 인스턴스
 system = BitcoinHalvingStrategy()
-latest_data = {}
-historical_data = []
+scheduler = AdaptiveScheduler(system.PROFILE, system.market)
+subscriptions = SubscriptionStore()
+store = SnapshotStore(DEFAULT_ASSET, HistoryRing())  # 최신 스냅샷 + mmap 히스토리 링 (요청 스레드는 store.current())
+asset_strategies = {DEFAULT_ASSET: system}
 data_status = {
     'price_usd': {'status': 'unknown', 'last_update': None, 'error': None},
     'price_krw': {'status': 'unknown', 'last_update': None, 'error': None},
@@ -33,22 +48,6 @@ data_status = {
     'long_term_holder': {'status': 'unknown', 'last_update': None, 'error': None},
 }
 
-def convert_to_json_serializable(obj):
-    """numpy 타입을 JSON 직렬화 가능한 타입으로 변환"""
-    if isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, (np.int64, np.int32, np.int16, np.int8)):
-        return int(obj)
-    elif isinstance(obj, (np.float64, np.float32, np.float16)):
-        return float(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_to_json_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_to_json_serializable(item) for item in obj]
-    return obj
-
 def update_status(key, status, error=None):
     """데이터 소스 상태 업데이트"""
     data_status[key] = {
@@ -75,296 +74,564 @@ def get_data_freshness(last_update):
     except:
         return 'error'
 
-def update_data():
-    """백그라운드에서 데이터 업데이트"""
-    global latest_data, historical_data
+def get_asset_strategies():
+    """추적 중인 자산별 전략 인스턴스 (같은 MarketData 공유)"""
+    for asset in system.market.assets:
+        if asset not in asset_strategies:
+            asset_strategies[asset] = BitcoinHalvingStrategy(get_engine(asset))
+    return asset_strategies
+
+def collect_snapshot(strategy, track_status=False):
+    """자산 하나의 스냅샷 계산 -> (스냅샷, 스케줄러용 요약)
     
-    while True:
+    track_status=True면 data_status 갱신/포함 (BTC)
+    """
+    report = update_status if track_status else (lambda *args, **kwargs: None)
+    
+    # USD 가격
+    try:
+        usd_price = strategy.get_bitcoin_price_usd()
+        report('price_usd', 'success' if usd_price > 0 else 'error')
+    except Exception as e:
+        usd_price = 0
+        report('price_usd', 'error', e)
+    
+    # KRW 가격
+    try:
+        krw_price = strategy.get_bitcoin_price_krw()
+        report('price_krw', 'success' if krw_price > 0 else 'error')
+    except Exception as e:
+        krw_price = 0
+        report('price_krw', 'error', e)
+    
+    # 과열도 지표들
+    heat_indicators = {}
+    heat_details = {}
+    
+    # Pi Cycle
+    try:
+        pi_cycle = strategy.check_pi_cycle_top()
+        heat_indicators['pi_cycle_top'] = pi_cycle
+        report('pi_cycle', 'success')
+    except Exception as e:
+        heat_indicators['pi_cycle_top'] = False
+        report('pi_cycle', 'error', e)
+    
+    # NUPL
+    try:
+        nupl = strategy.estimate_nupl()
+        heat_indicators['nupl'] = nupl > 0.75
+        heat_details['nupl_value'] = nupl
+        report('nupl', 'success')
+    except Exception as e:
+        heat_indicators['nupl'] = False
+        heat_details['nupl_value'] = 0
+        report('nupl', 'error', e)
+    
+    # RSI
+    try:
+        rsi = strategy.get_weekly_rsi()
+        heat_indicators['rsi_weekly'] = rsi > 85
+        heat_details['rsi_value'] = rsi
+        report('rsi', 'success')
+    except Exception as e:
+        heat_indicators['rsi_weekly'] = False
+        heat_details['rsi_value'] = 50
+        report('rsi', 'error', e)
+    
+    # Google Trends
+    try:
+        trends = strategy.get_google_trends_score()
+        heat_indicators['google_trends'] = trends > 0.7
+        heat_details['trends_value'] = trends
+        trends_error = strategy.trends_worker.last_error if strategy.trends_worker else None
+        report('google_trends', 'error' if trends_error else 'success', trends_error)
+    except Exception as e:
+        heat_indicators['google_trends'] = False
+        heat_details['trends_value'] = 0
+        report('google_trends', 'error', e)
+    
+    # 김치 프리미엄
+    try:
+        if usd_price > 0 and krw_price > 0:
+            kimchi = strategy.calculate_kimchi_premium()
+            heat_indicators['kimchi_premium'] = kimchi > 10
+            heat_details['kimchi_value'] = kimchi
+        else:
+            raise Exception("가격 데이터 없음")
+    except Exception as e:
+        heat_indicators['kimchi_premium'] = False
+        heat_details['kimchi_value'] = 0
+    
+    # 반감기 사이클 분석
+    with metrics.span('scoring', step='halving_cycle'):
         try:
-            # USD 가격
-            try:
-                btc_usd = system.get_bitcoin_price_usd()
-                update_status('price_usd', 'success' if btc_usd > 0 else 'error')
-            except Exception as e:
-                btc_usd = 0
-                update_status('price_usd', 'error', e)
-            
-            # KRW 가격
-            try:
-                btc_krw = system.get_bitcoin_price_krw()
-                update_status('price_krw', 'success' if btc_krw > 0 else 'error')
-            except Exception as e:
-                btc_krw = 0
-                update_status('price_krw', 'error', e)
-            
-            # 과열도 지표들
-            heat_indicators = {}
-            heat_details = {}
-            
-            # Pi Cycle
-            try:
-                pi_cycle = system.check_pi_cycle_top()
-                heat_indicators['pi_cycle_top'] = pi_cycle
-                update_status('pi_cycle', 'success')
-            except Exception as e:
-                heat_indicators['pi_cycle_top'] = False
-                update_status('pi_cycle', 'error', e)
-            
-            # NUPL
-            try:
-                nupl = system.estimate_nupl()
-                heat_indicators['nupl'] = nupl > 0.75
-                heat_details['nupl_value'] = nupl
-                update_status('nupl', 'success')
-            except Exception as e:
-                heat_indicators['nupl'] = False
-                heat_details['nupl_value'] = 0
-                update_status('nupl', 'error', e)
-            
-            # RSI
-            try:
-                rsi = system.get_weekly_rsi()
-                heat_indicators['rsi_weekly'] = rsi > 85
-                heat_details['rsi_value'] = rsi
-                update_status('rsi', 'success')
-            except Exception as e:
-                heat_indicators['rsi_weekly'] = False
-                heat_details['rsi_value'] = 50
-                update_status('rsi', 'error', e)
-            
-            # Google Trends
-            try:
-                trends = system.get_google_trends_score()
-                heat_indicators['google_trends'] = trends > 0.7
-                heat_details['trends_value'] = trends
-                update_status('google_trends', 'success')
-            except Exception as e:
-                heat_indicators['google_trends'] = False
-                heat_details['trends_value'] = 0
-                update_status('google_trends', 'error', e)
-            
-            # 김치 프리미엄
-            try:
-                if btc_usd > 0 and btc_krw > 0:
-                    kimchi = system.calculate_kimchi_premium()
-                    heat_indicators['kimchi_premium'] = kimchi > 10
-                    heat_details['kimchi_value'] = kimchi
-                else:
-                    raise Exception("가격 데이터 없음")
-            except Exception as e:
-                heat_indicators['kimchi_premium'] = False
-                heat_details['kimchi_value'] = 0
-            
-            # 반감기 사이클 분석
-            try:
-                halving_data = system.analyze_halving_cycle()
-                halving_score = halving_data['cycle_score'] * 100
-                halving_weight = system.halving_weight
-            except Exception as e:
-                halving_data = {
-                    'phase': 'unknown',
-                    'months_since': 0,
-                    'cycle_score': 0,
-                    'recommendation': 'Unable to determine cycle phase'
+            halving_data = strategy.analyze_halving_cycle()
+            halving_score = halving_data['cycle_score'] * 100
+            halving_weight = strategy.halving_weight
+        except Exception as e:
+            halving_data = {
+                'phase': 'unknown',
+                'months_since': 0,
+                'cycle_score': 0,
+                'recommendation': 'Unable to determine cycle phase'
+            }
+            halving_score = 0
+            halving_weight = 0
+    
+    # 과열도 점수 계산 (반감기 포함)
+    with metrics.span('scoring', step='heat'):
+        heat_score = 0
+        for key, weight in strategy.heat_indicators_weight.items():
+            if heat_indicators.get(key, False):
+                heat_score += weight
+        heat_score += (halving_score / 100) * halving_weight
+        heat_score *= 100
+        heat_level, heat_action = strategy.get_heat_action(heat_score)
+    
+    # 축적도 지표들
+    acc_indicators = {}
+    acc_details = {}
+    
+    # Fear & Greed
+    try:
+        fear_greed = strategy.get_fear_greed_index()
+        acc_indicators['fear_greed'] = fear_greed < 30
+        acc_details['fear_greed_value'] = fear_greed
+        report('fear_greed', 'success')
+    except Exception as e:
+        acc_indicators['fear_greed'] = False
+        acc_details['fear_greed_value'] = 50
+        report('fear_greed', 'error', e)
+    
+    # 거래소 잔고
+    try:
+        exchange_trend = strategy.estimate_exchange_balance_trend()
+        acc_indicators['exchange_balance'] = exchange_trend > 0.3
+        acc_details['exchange_trend'] = exchange_trend
+        report('exchange_balance', 'success')
+    except Exception as e:
+        acc_indicators['exchange_balance'] = False
+        acc_details['exchange_trend'] = 0
+        report('exchange_balance', 'error', e)
+    
+    # 장기 보유자
+    try:
+        lth = strategy.estimate_long_term_holder_accumulation()
+        acc_indicators['long_term_holder'] = lth > 0.6
+        acc_details['lth_value'] = lth
+        report('long_term_holder', 'success')
+    except Exception as e:
+        acc_indicators['long_term_holder'] = False
+        acc_details['lth_value'] = 0
+        report('long_term_holder', 'error', e)
+    
+    # 반감기
+    months_to_halving = strategy.get_months_until_halving()
+    acc_indicators['halving_window'] = months_to_halving and 6 <= months_to_halving <= 18
+    acc_details['months_to_halving'] = months_to_halving
+    
+    # 축적도 점수 계산
+    with metrics.span('scoring', step='accumulation'):
+        acc_score = 0
+        for key, weight in strategy.accumulation_indicators_weight.items():
+            if acc_indicators.get(key, False):
+                acc_score += weight
+        if acc_indicators.get('halving_window', False):
+            acc_score *= 1.2
+        acc_score = min(acc_score * 100, 100)
+        acc_level, acc_action = strategy.get_accumulation_action(acc_score, acc_details.get('fear_greed_value', 50))
+    
+    snapshot = {
+        'asset': strategy.asset,
+        'timestamp': datetime.now().isoformat(),
+        'prices': {
+            'usd': usd_price,
+            'krw': krw_price,
+            'kimchi_premium': heat_details.get('kimchi_value', 0)
+        },
+        'halving_cycle': {
+            'phase': halving_data['phase'],
+            'months_since': halving_data['months_since'],
+            'score': halving_score,
+            'weight': halving_weight * 100,
+            'recommendation': halving_data['recommendation'],
+            'next_halving': strategy.halving_dates.get(5, None)  # 5차 반감기 (다음 반감기)
+        },
+        'heat': {
+            'score': heat_score,
+            'level': heat_level,
+            'action': heat_action,
+            'indicators': {
+                'pi_cycle_top': heat_indicators.get('pi_cycle_top', False),
+                'nupl': {
+                    'triggered': heat_indicators.get('nupl', False),
+                    'value': heat_details.get('nupl_value', 0)
+                },
+                'rsi_weekly': {
+                    'triggered': heat_indicators.get('rsi_weekly', False),
+                    'value': heat_details.get('rsi_value', 50)
+                },
+                'google_trends': {
+                    'triggered': heat_indicators.get('google_trends', False),
+                    'value': heat_details.get('trends_value', 0) * 100
+                },
+                'kimchi_premium': {
+                    'triggered': heat_indicators.get('kimchi_premium', False),
+                    'value': heat_details.get('kimchi_value', 0)
                 }
-                halving_score = 0
-                halving_weight = 0
-            
-            # 과열도 점수 계산 (반감기 포함)
-            heat_score = 0
-            for key, weight in system.heat_indicators_weight.items():
-                if heat_indicators.get(key, False):
-                    heat_score += weight
-            heat_score += (halving_score / 100) * halving_weight
-            heat_score *= 100
-            heat_level, heat_action = system.get_heat_action(heat_score)
-            
-            # 축적도 지표들
-            acc_indicators = {}
-            acc_details = {}
-            
-            # Fear & Greed
-            try:
-                fear_greed = system.get_fear_greed_index()
-                acc_indicators['fear_greed'] = fear_greed < 30
-                acc_details['fear_greed_value'] = fear_greed
-                update_status('fear_greed', 'success')
-            except Exception as e:
-                acc_indicators['fear_greed'] = False
-                acc_details['fear_greed_value'] = 50
-                update_status('fear_greed', 'error', e)
-            
-            # 거래소 잔고
-            try:
-                exchange_trend = system.estimate_exchange_balance_trend()
-                acc_indicators['exchange_balance'] = exchange_trend > 0.3
-                acc_details['exchange_trend'] = exchange_trend
-                update_status('exchange_balance', 'success')
-            except Exception as e:
-                acc_indicators['exchange_balance'] = False
-                acc_details['exchange_trend'] = 0
-                update_status('exchange_balance', 'error', e)
-            
-            # 장기 보유자
-            try:
-                lth = system.estimate_long_term_holder_accumulation()
-                acc_indicators['long_term_holder'] = lth > 0.6
-                acc_details['lth_value'] = lth
-                update_status('long_term_holder', 'success')
-            except Exception as e:
-                acc_indicators['long_term_holder'] = False
-                acc_details['lth_value'] = 0
-                update_status('long_term_holder', 'error', e)
-            
-            # 반감기
-            months_to_halving = system.get_months_until_halving()
-            acc_indicators['halving_window'] = months_to_halving and 6 <= months_to_halving <= 18
-            acc_details['months_to_halving'] = months_to_halving
-            
-            # 축적도 점수 계산
-            acc_score = 0
-            for key, weight in system.accumulation_indicators_weight.items():
-                if acc_indicators.get(key, False):
-                    acc_score += weight
-            if acc_indicators.get('halving_window', False):
-                acc_score *= 1.2
-            acc_score = min(acc_score * 100, 100)
-            acc_level, acc_action = system.get_accumulation_action(acc_score, acc_details.get('fear_greed_value', 50))
-            
-            # 최신 데이터 저장
-            latest_data = convert_to_json_serializable({
-                'timestamp': datetime.now().isoformat(),
-                'prices': {
-                    'usd': btc_usd,
-                    'krw': btc_krw,
-                    'kimchi_premium': heat_details.get('kimchi_value', 0)
+            }
+        },
+        'accumulation': {
+            'score': acc_score,
+            'level': acc_level,
+            'action': acc_action,
+            'indicators': {
+                'fear_greed': {
+                    'triggered': acc_indicators.get('fear_greed', False),
+                    'value': acc_details.get('fear_greed_value', 50)
                 },
-                'halving_cycle': {
-                    'phase': halving_data['phase'],
-                    'months_since': halving_data['months_since'],
-                    'score': halving_score,
-                    'weight': halving_weight * 100,
-                    'recommendation': halving_data['recommendation'],
-                    'next_halving': system.halving_dates.get(5, None)  # 5차 반감기 (다음 반감기)
+                'exchange_balance': {
+                    'triggered': acc_indicators.get('exchange_balance', False),
+                    'value': acc_details.get('exchange_trend', 0) * 100
                 },
-                'heat': {
-                    'score': heat_score,
-                    'level': heat_level,
-                    'action': heat_action,
-                    'indicators': {
-                        'pi_cycle_top': heat_indicators.get('pi_cycle_top', False),
-                        'nupl': {
-                            'triggered': heat_indicators.get('nupl', False),
-                            'value': heat_details.get('nupl_value', 0)
-                        },
-                        'rsi_weekly': {
-                            'triggered': heat_indicators.get('rsi_weekly', False),
-                            'value': heat_details.get('rsi_value', 50)
-                        },
-                        'google_trends': {
-                            'triggered': heat_indicators.get('google_trends', False),
-                            'value': heat_details.get('trends_value', 0) * 100
-                        },
-                        'kimchi_premium': {
-                            'triggered': heat_indicators.get('kimchi_premium', False),
-                            'value': heat_details.get('kimchi_value', 0)
-                        }
-                    }
+                'long_term_holder': {
+                    'triggered': acc_indicators.get('long_term_holder', False),
+                    'value': acc_details.get('lth_value', 0) * 100
                 },
-                'accumulation': {
-                    'score': acc_score,
-                    'level': acc_level,
-                    'action': acc_action,
-                    'indicators': {
-                        'fear_greed': {
-                            'triggered': acc_indicators.get('fear_greed', False),
-                            'value': acc_details.get('fear_greed_value', 50)
-                        },
-                        'exchange_balance': {
-                            'triggered': acc_indicators.get('exchange_balance', False),
-                            'value': acc_details.get('exchange_trend', 0) * 100
-                        },
-                        'long_term_holder': {
-                            'triggered': acc_indicators.get('long_term_holder', False),
-                            'value': acc_details.get('lth_value', 0) * 100
-                        },
-                        'halving_window': acc_indicators.get('halving_window', False),
-                        'months_to_halving': acc_details.get('months_to_halving', None)
-                    }
+                'halving_window': acc_indicators.get('halving_window', False),
+                'months_to_halving': acc_details.get('months_to_halving', None)
+            }
+        }
+    }
+    if track_status:
+        snapshot['data_status'] = {
+            key: {
+                **value,
+                'freshness': get_data_freshness(value.get('last_update'))
+            } for key, value in data_status.items()
+        }
+    
+    return snapshot, {
+        'heat_score': heat_score,
+        'acc_score': acc_score,
+        'price': usd_price,
+        'values': {
+            'nupl': heat_details.get('nupl_value'),
+            'rsi_weekly': heat_details.get('rsi_value'),
+            'google_trends': heat_details.get('trends_value'),
+            'kimchi_premium': heat_details.get('kimchi_value'),
+            'fear_greed': acc_details.get('fear_greed_value'),
+            'exchange_balance': acc_details.get('exchange_trend'),
+            'long_term_holder': acc_details.get('lth_value'),
+        }
+    }
+    
+
+def timed_snapshot(strategy, track_status=False):
+    with metrics.span('snapshot', asset=strategy.asset):
+        return collect_snapshot(strategy, track_status)
+
+def prefetch_inputs(assets):
+    """만료된 업스트림 입력을 이벤트 루프 하나에서 동시에 받아 캐시에 채움 (async_client)
+
+    aiohttp가 없거나 ASYNC_COLLECT=0이면 건너뜀 - 전략 계산 중 MarketData가 동기로 조회
+    """
+    collector = async_client.get_collector(system.market)
+    if collector is None:
+        return None
+    with metrics.span('prefetch'):
+        return collector.collect(assets)
+
+def collect_all_assets():
+    """추적 중인 모든 자산을 동시에 계산 (입력은 먼저 비동기로 한 번에 받고, 현물 가격은 배치 조회로 공유)"""
+    strategies = get_asset_strategies()
+    try:
+        prefetch_inputs(list(strategies))
+    except Exception as e:
+        print(f"⚠️ 비동기 수집 실패 - 동기 조회로 계속: {e}")
+    with ThreadPoolExecutor(max_workers=len(strategies)) as executor:
+        futures = {
+            asset: executor.submit(timed_snapshot, strategy, asset == DEFAULT_ASSET)
+            for asset, strategy in strategies.items()
+        }
+        results = {}
+        for asset, future in futures.items():
+            try:
+                results[asset] = future.result()
+            except Exception as e:
+                print(f"❌ {asset} 업데이트 오류: {e}")
+        return results
+
+# 강제 새로고침 최소 간격 (초) - 이 안에 끝난 사이클이 있으면 그 결과를 그대로 씀
+MIN_REFRESH_INTERVAL = float(os.getenv('MIN_REFRESH_INTERVAL', 30))
+MAX_REFRESH_WAIT = 2  # 요청 스레드를 오래 잡지 않음 - 완료는 클라이언트가 X-Snapshot-Version으로 확인
+
+
+class CycleFlight:
+    """수집 사이클 1회 (single-flight) - 동시에 요청한 쪽은 모두 같은 실행의 결과를 받음"""
+
+    def __init__(self, version, claimed=True):
+        self.version = version  # 성공하면 발행될 스냅샷 버전
+        self.claimed = claimed  # False: 강제 새로고침이 만들고 수집 루프가 실행하기를 기다리는 중
+        self.done = threading.Event()
+        self.started_at = time.time()
+        self.finished_at = None
+        self.error = None
+
+
+_flight_lock = threading.Lock()
+_flight = None  # 진행 중이거나 마지막으로 끝난 사이클
+
+def _begin_cycle():
+    """진행 중인 사이클이 있으면 (그 사이클, False), 없으면 새 사이클 (CycleFlight, True)
+
+    강제 새로고침이 수집 루프에 넘긴 사이클은 처음 가져가는 쪽이 실행 (그 사이클, True)
+    """
+    global _flight
+    with _flight_lock:
+        if _flight is not None and not _flight.done.is_set():
+            if not _flight.claimed:
+                _flight.claimed = True
+                return _flight, True
+            return _flight, False
+        _flight = CycleFlight(store.current().version + 1)
+        return _flight, True
+
+def run_cycle(flight):
+    """수집 -> 스냅샷 발행 -> 저장 -> 스케줄러/구독 알림 (성공 시 flight.version 발행)"""
+    cycle_started = time.perf_counter()
+    try:
+        with metrics.span('collect'):
+            results = collect_all_assets()
+        summary = results[DEFAULT_ASSET][1]
+        heat_score = summary['heat_score']
+        acc_score = summary['acc_score']
+        btc_usd = summary['price']
+        btc_data = results[DEFAULT_ASSET][0]
+        
+        # 스냅샷 + 히스토리 한 점을 새 스냅샷으로 발행 (참조 교체 한 번)
+        with metrics.span('history'):
+            snapshot = store.publish(
+                flight.version,
+                {asset: data for asset, (data, _) in results.items()},
+                history_point={
+                    'timestamp': datetime.now().isoformat(),
+                    'heat_score': heat_score,
+                    'acc_score': acc_score,
+                    'price': btc_usd,
+                    'heat_level': btc_data['heat']['level'],
+                    'acc_level': btc_data['accumulation']['level']
                 },
-                'data_status': {
-                    key: {
-                        **value,
-                        'freshness': get_data_freshness(value.get('last_update'))
-                    } for key, value in data_status.items()
-                }
-            })
-            
-            # 히스토리 추가
-            historical_data.append({
-                'timestamp': datetime.now().isoformat(),
-                'heat_score': heat_score,
-                'acc_score': acc_score,
-                'price': btc_usd
-            })
-            
-            if len(historical_data) > 100:
-                historical_data = historical_data[-100:]
-            
-            # 파일 저장 - datetime 객체 처리를 위한 커스텀 encoder 사용
-            with open('dashboard_data.json', 'w') as f:
-                json.dump(latest_data, f, indent=2, default=str)
-            
-            print(f"✅ 업데이트 완료: BTC ${btc_usd:,.0f}, 과열도 {heat_score:.1f}%, 축적도 {acc_score:.1f}%")
-            
+                published_at=time.time()
+            )
+        
+        # 파일 저장 - numpy/datetime 값은 serialization이 직접 처리 (히스토리는 링 파일에 이미 기록됨)
+        with metrics.span('persist', file='dashboard_data.json'):
+            serialization.write('dashboard_data.json', snapshot.data)
+        
+        scheduler.observe(heat_score, acc_score, btc_usd, summary['values'])
+        
+        # 사용자 구독 알림 (전체 구독을 한 번에 평가)
+        try:
+            with metrics.span('subscriptions'):
+                alerts = subscriptions.evaluate(snapshot.assets)
+            for alert in alerts:
+                message = describe_alert(alert)
+                print(f"🔔 {alert['user_id']}: {message}")
+                # 사용자 대상은 허용 채널의 전용 싱크로만 (예전 행이나 허용 목록 밖 채널은 건너뜀)
+                try:
+                    recipient = subscription_recipient(alert['channel'], alert['target'])
+                except ValueError as e:
+                    print(f"⚠️ 구독 {alert['subscription_id']} 발송 생략: {e}")
+                    continue
+                get_dispatcher().notify(
+                    f"🔔 {alert['asset']} 알림", message,
+                    recipients=[recipient],
+                    key=f"subscription:{alert['subscription_id']}", state=alert['state'],
+                    user_id=alert['user_id']
+                )
         except Exception as e:
-            print(f"❌ 전체 업데이트 오류: {e}")
-            traceback.print_exc()
+            print(f"❌ 구독 알림 평가 오류: {e}")
+        
+        print(f"✅ 업데이트 완료: BTC ${btc_usd:,.0f}, 과열도 {heat_score:.1f}%, 축적도 {acc_score:.1f}% "
+              f"({len(results)}개 자산, 버전 {snapshot.version})")
+        
+    except Exception as e:
+        flight.error = str(e)
+        print(f"❌ 전체 업데이트 오류: {e}")
+        traceback.print_exc()
+    finally:
+        metrics.observe('cycle', time.perf_counter() - cycle_started)
+        flight.finished_at = time.time()
+        flight.done.set()
+
+def collect_once():
+    """수집 사이클 1회 - 이미 진행 중이면 새로 돌리지 않고 그 사이클이 끝나길 기다림"""
+    flight, owner = _begin_cycle()
+    if owner:
+        run_cycle(flight)
+    else:
+        flight.done.wait()
+    return flight
+
+def update_data():
+    """백그라운드에서 데이터 업데이트"""
+    while True:
+        collect_once()
         
-        # 5분마다 업데이트
-        time.sleep(300)
+        # 임계값 근접도/변동성/호출 예산에 따라 다음 업데이트 시점 결정
+        scheduler.wait()
+
+def request_refresh():
+    """강제 새로고침 -> (상태, CycleFlight)
+
+    - joined: 진행 중인 사이클에 합류
+    - throttled: MIN_REFRESH_INTERVAL 안에 끝난 사이클이 있음 (그 결과 유지)
+    - started: 새 사이클 - 수집 루프가 돌고 있으면 적응형 대기를 깨워 루프가 실행
+      (다음 대기는 이 사이클 뒤부터 다시 계산), 아니면 별도 스레드에서 실행
+    """
+    global _flight
+    loop_running = update_thread is not None and update_thread.is_alive()
+    with _flight_lock:
+        flight = _flight
+        if flight is not None and not flight.done.is_set():
+            return 'joined', flight
+        if flight is not None and time.time() - flight.finished_at < MIN_REFRESH_INTERVAL:
+            return 'throttled', flight
+        flight = _flight = CycleFlight(store.current().version + 1, claimed=not loop_running)
+    if loop_running:
+        scheduler.wake()
+    else:
+        threading.Thread(target=run_cycle, args=(flight,), daemon=True).start()
+    return 'started', flight
+
+def refresh_payload(wait=0):
+    """/api/refresh 응답 - version은 이 요청으로 받게 될 스냅샷 버전 (wait초까지 완료 대기)"""
+    status, flight = request_refresh()
+    if wait and wait > 0:
+        flight.done.wait(min(wait, MAX_REFRESH_WAIT))
+    current_version = store.current().version
+    payload = {
+        'status': status,
+        'version': current_version if status == 'throttled' else flight.version,
+        'current_version': current_version,
+        'completed': flight.done.is_set(),
+    }
+    if flight.error:
+        payload['error'] = flight.error
+    if status == 'throttled':
+        payload['retry_after'] = round(MIN_REFRESH_INTERVAL - (time.time() - flight.finished_at), 1)
+    return payload
 
 @app.route('/')
 def index():
-    """메인 대시보드 페이지"""
-    return render_template('dashboard_final.html')
+    """메인 대시보드 페이지 (사전 렌더링된 셸, ETag 재검증)"""
+    return static_assets.page('dashboard_final.html')
 
 @app.route('/health')
 def health():
     """헬스체크 엔드포인트"""
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
+def get_asset_data(asset=None):
+    """자산별 최신 스냅샷 (asset 미지정 시 BTC, 모르는 자산이면 None)"""
+    return store.current().asset(asset)
+
 @app.route('/api/data')
 def get_data():
-    """현재 데이터 API"""
-    return jsonify(latest_data)
+    """현재 데이터 API (?asset=ETH 로 자산 선택, Accept/?format= 으로 msgpack)"""
+    try:
+        fmt = api_encoding.negotiate(request, api_encoding.DATA_FORMATS)
+    except api_encoding.NotAcceptable as e:
+        return api_encoding.not_acceptable(e, api_encoding.DATA_FORMATS)
+    snapshot = store.current()
+    data = snapshot.asset(request.args.get('asset'))
+    if data is None:
+        return jsonify({'error': 'unknown asset', 'assets': system.market.assets}), 404
+    response = api_encoding.data_response(data, fmt)
+    response.headers['X-Snapshot-Version'] = str(snapshot.version)
+    return response
+
+HISTORY_RANGES = {'hour': 3600, 'day': 86400, 'week': 7 * 86400, 'month': 30 * 86400}
+DEFAULT_HISTORY_LIMIT = 100
+MAX_HISTORY_LIMIT = 100000  # 링 기본 용량(65536)보다 큼 - 이 이상은 의미 없음
+
+def history_query(args):
+    """요청 인자 -> (since, until, limit) - ?range=hour|day|week|month 는 지금부터 거슬러 올라간 구간
+
+    아무 조건도 없으면 최근 DEFAULT_HISTORY_LIMIT개
+    잘못된 시각, 정수가 아니거나 1..MAX_HISTORY_LIMIT 밖의 limit은 ValueError
+    """
+    since, until = to_epoch(args.get('since')), to_epoch(args.get('until'))
+    limit = args.get('limit')
+    if limit is not None:
+        limit = int(limit)
+        if not 1 <= limit <= MAX_HISTORY_LIMIT:
+            raise ValueError(f"limit must be 1..{MAX_HISTORY_LIMIT}")
+    window = HISTORY_RANGES.get(args.get('range', ''))
+    if window and since is None:
+        since = int(time.time()) - window
+    if since is None and until is None and limit is None:
+        limit = DEFAULT_HISTORY_LIMIT
+    return since, until, limit
+
+def get_history_range(since=None, until=None, limit=None):
+    """히스토리 구간 조회 (since/until은 ISO 시각 또는 epoch, limit은 최근 N개)"""
+    return store.current().history(since, until, limit)
 
 @app.route('/api/history')
 def get_history():
-    """히스토리 데이터 API"""
-    return jsonify(historical_data)
+    """히스토리 데이터 API (?range= 또는 ?since=&until=&limit= 구간 조회)
 
-@app.route('/api/status')
-def get_status():
-    """데이터 소스 상태 API"""
+    json은 링에서 바로 스트리밍, Accept/?format= 으로 columns/msgpack/arrow (api_encoding)
+    """
+    try:
+        fmt = api_encoding.negotiate(request, api_encoding.HISTORY_FORMATS)
+    except api_encoding.NotAcceptable as e:
+        return api_encoding.not_acceptable(e, api_encoding.HISTORY_FORMATS)
+    try:
+        since, until, limit = history_query(request.args)
+    except ValueError:
+        return jsonify({'error': 'invalid since/until/limit'}), 400
+    return api_encoding.history_response(store.current(), fmt, since, until, limit)
+
+def get_status_payload():
+    """데이터 소스 상태 + 업스트림 호출 예산 + 서킷 브레이커 + 지표 노드별 계산 시간 + 수집 주기 결정 + 알림 큐"""
     status_with_freshness = {}
     for key, value in data_status.items():
         status_with_freshness[key] = {
             **value,
             'freshness': get_data_freshness(value.get('last_update'))
         }
-    return jsonify(status_with_freshness)
+    return {
+        'snapshot_version': store.current().version,
+        'data_status': status_with_freshness,
+        'api_budget': system.market.budget.status(),
+        'circuit_breakers': system.breakers.snapshot(),
+        'indicator_timings': system.engine.node_timings(),
+        'scheduler': scheduler.status(),
+        'history_ring': store.ring.status(),
+        'notifications': get_dispatcher().status()
+    }
+
+@app.route('/api/status')
+def get_status():
+    """데이터 소스 상태 API"""
+    return jsonify(get_status_payload())
+
+@app.route('/api/metrics')
+def get_metrics():
+    """수집 사이클 단계별 지연 히스토그램 (Prometheus 텍스트 포맷)"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
 
 @app.route('/api/refresh')
 def refresh_data():
-    """강제 새로고침"""
-    threading.Thread(target=update_single_data).start()
-    return jsonify({'status': 'refreshing'})
+    """강제 새로고침 (동시 요청은 한 사이클로 합침, 바로 반환 - ?wait=초 는 최대 MAX_REFRESH_WAIT초만 대기)"""
+    return jsonify(refresh_payload(request.args.get('wait', 0, type=float)))
 
 def update_single_data():
     """단일 데이터 업데이트 (초기화 및 강제 새로고침용)"""
-    global latest_data
-    
     # update_data의 로직과 동일하게 실행
     try:
         # 모든 데이터 수집 로직 실행
@@ -390,21 +657,54 @@ def update_single_data():
     except Exception as e:
         print(f"❌ 데이터 수집 실패: {e}")
 
+def restore_snapshot():
+    """마지막 저장 스냅샷으로 시작 (히스토리는 링 파일 - 링이 비어 있으면 예전 dashboard_history.json을 옮김)"""
+    data = {}
+    if os.path.exists('dashboard_data.json'):
+        try:
+            data = serialization.read('dashboard_data.json')
+            print("기존 데이터 파일 로드 성공")
+        except:
+            print("기존 데이터 파일 로드 실패, 새로 시작합니다.")
+    
+    history = []
+    if not store.ring.count and os.path.exists('dashboard_history.json'):
+        try:
+            history = serialization.read('dashboard_history.json')
+        except Exception:
+            history = []
+    
+    return store.restore(data, history)
+
 # 초기 데이터 로드 (모듈 로드 시 실행)
-if os.path.exists('dashboard_data.json'):
-    try:
-        with open('dashboard_data.json', 'r') as f:
-            latest_data = json.load(f)
-        print("기존 데이터 파일 로드 성공")
-    except:
-        print("기존 데이터 파일 로드 실패, 새로 시작합니다.")
-        latest_data = {}
-else:
-    latest_data = {}
-
-# 백그라운드 업데이트 스레드 시작
-update_thread = threading.Thread(target=update_data, daemon=True)
-update_thread.start()
+restore_snapshot()
+
+update_thread = None
+trigger_engine = None
+
+def start_background_updates():
+    """백그라운드 수집 시작 (구글 트렌드는 별도 저속 레인) - 중복 호출 무시
+
+    EVENT_DRIVEN=1 이면 트리거 엔진도 띄워 임계값 교차 시 적응형 대기를 깨워 바로 수집
+    """
+    global update_thread, trigger_engine
+    if update_thread is not None:
+        return update_thread
+    for strategy in get_asset_strategies().values():
+        strategy.start_trends_worker()
+    if os.getenv('EVENT_DRIVEN') == '1':
+        from event_triggers import EventTriggerEngine
+        trigger_engine = EventTriggerEngine(system.PROFILE, system.engine,
+                                            on_trigger=lambda event: scheduler.wake())
+        trigger_engine.start()
+    update_thread = threading.Thread(target=update_data, daemon=True)
+    update_thread.start()
+    return update_thread
+
+# gunicorn 프리포크 웜스타트 모드에서는 마스터에서 스레드를 띄우지 않고
+# 포크 이후 각 워커에서 start_background_updates()를 호출한다 (gunicorn.conf.py)
+if os.getenv('PREFORK_WARM_START') != '1':
+    start_background_updates()
 
 if __name__ == '__main__':
     # 초기 데이터 업데이트
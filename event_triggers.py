@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+이벤트 기반 트리거 평가
+- 고정 주기 폴링 대신 입력 소스별 수집 레인이 자체 주기로 갱신
+  (현물 가격은 빠르게, 환율/F&G/일봉/트렌드는 느리게)
+- 값이 바뀐 입력에 의존하는 트리거만 즉시 재평가
+- 트리거 상태가 바뀌면(임계값 교차) 콜백 호출 - 예: 전체 점수 재계산 + 알림
+"""
+
+import queue
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from strategy_engine import PROFILES, GROUPS, StrategyEngine, get_default_engine, is_triggered
+
+logger = logging.getLogger(__name__)
+
+# 입력 소스별 수집 주기 (초) - 현물 가격만 빠른 레인
+SOURCE_INTERVALS = {
+    'spot_usd': 15,
+    'spot_krw': 15,
+    'fx': 600,
+    'fear_greed': 600,
+    'daily_closes': 3600,
+    'trends': 60,  # TrendsWorker 캐시 또는 MarketData TTL 캐시만 읽음
+}
+
+
+class Trigger:
+    """프로필 지표 하나의 임계값 트리거 (예: rsi_weekly > 85)"""
+
+    def __init__(self, group: str, name: str, spec: Dict, inputs: Iterable[str]):
+        self.group = group
+        self.name = name
+        self.spec = spec
+        self.params = spec.get('params', {})
+        self.inputs = set(inputs)
+        self.triggered = None
+        self.value = None
+
+    @property
+    def condition(self) -> str:
+        if 'above' in self.spec:
+            return f"> {self.spec['above']}"
+        if 'below' in self.spec:
+            return f"< {self.spec['below']}"
+        return 'true'
+
+    def to_dict(self) -> Dict:
+        return {
+            'group': self.group,
+            'indicator': self.name,
+            'condition': self.condition,
+            'triggered': self.triggered,
+            'value': self.value,
+        }
+
+
+class EventTriggerEngine:
+    """입력 변경 이벤트로 트리거를 평가하는 엔진
+
+    on_trigger(event)는 트리거 상태가 바뀔 때마다 평가 스레드에서 호출된다.
+    """
+
+    def __init__(self, profile: str = 'halving', engine: Optional[StrategyEngine] = None,
+                 on_trigger: Optional[Callable[[Dict], None]] = None,
+                 intervals: Optional[Dict[str, float]] = None):
+        self.engine = engine or get_default_engine()
+        self.profile = profile
+        self.on_trigger = on_trigger
+        self.intervals = {**SOURCE_INTERVALS, **(intervals or {})}
+
+        self.triggers = []
+        for group in GROUPS:
+            for name, spec in PROFILES[profile].get(group, {}).items():
+                self.triggers.append(Trigger(group, name, spec, self.engine.indicator_inputs(name)))
+
+        # 입력 -> 그 입력에 의존하는 트리거
+        self.subscribers = {}
+        for trigger in self.triggers:
+            for key in trigger.inputs:
+                self.subscribers.setdefault(key, []).append(trigger)
+
+        self.events = []
+        self.stats = {'ingested': 0, 'changed': 0, 'evaluations': 0, 'fired': 0}
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+
+    # ===== 수집 =====
+
+    def ingest(self, key: str) -> List[str]:
+        """입력 하나를 새로 조회하고 값이 바뀌었으면 평가 큐에 넣음"""
+        if key != 'trends':
+            self.engine.market.invalidate(key, self.engine.asset)
+        value = self.engine.input_loaders[key]()
+        changed = self.engine.graph.update_inputs({key: value})
+        self.stats['ingested'] += 1
+        if changed:
+            self.stats['changed'] += 1
+            self._queue.put((key, time.time()))
+        return changed
+
+    def _lane(self, key: str, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.ingest(key)
+            except Exception as e:
+                logger.error(f"{key} 수집 레인 오류: {e}")
+            self._stop.wait(interval)
+
+    # ===== 평가 =====
+
+    def evaluate(self, keys: Iterable[str], ingested_at: Optional[float] = None) -> List[Dict]:
+        """바뀐 입력에 의존하는 트리거만 재평가, 상태가 바뀐 트리거 이벤트 반환"""
+        affected = []
+        for key in keys:
+            for trigger in self.subscribers.get(key, ()):
+                if trigger not in affected:
+                    affected.append(trigger)
+
+        fired = []
+        for trigger in affected:
+            # 업스트림 조회 없이 수집 레인이 반영한 최신 입력으로 계산
+            value = self.engine.graph.resolve(trigger.name, trigger.params)
+            triggered = is_triggered(value, trigger.spec)
+            self.stats['evaluations'] += 1
+            previous = trigger.triggered
+            trigger.value = value
+            trigger.triggered = triggered
+            if previous is None or previous == triggered:
+                continue
+
+            event = {
+                **trigger.to_dict(),
+                'sources': sorted(set(keys) & trigger.inputs),
+                'timestamp': datetime.now().isoformat(),
+            }
+            if ingested_at is not None:
+                event['latency_ms'] = round((time.time() - ingested_at) * 1000, 1)
+            fired.append(event)
+        return fired
+
+    def _dispatch(self, events: List[Dict]):
+        for event in events:
+            self.stats['fired'] += 1
+            self.events = (self.events + [event])[-100:]
+            logger.info(f"트리거 {'발동' if event['triggered'] else '해제'}: "
+                        f"{event['indicator']} {event['condition']} (값 {event['value']})")
+            if self.on_trigger is not None:
+                try:
+                    self.on_trigger(event)
+                except Exception as e:
+                    logger.error(f"트리거 콜백 오류: {e}")
+
+    def _evaluator(self):
+        while not self._stop.is_set():
+            try:
+                key, ingested_at = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            # 밀린 이벤트는 한 번에 모아서 평가
+            keys = {key}
+            while True:
+                try:
+                    more, _ = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                keys.add(more)
+            try:
+                self._dispatch(self.evaluate(keys, ingested_at))
+            except Exception as e:
+                logger.error(f"트리거 평가 오류: {e}")
+
+    # ===== 실행 =====
+
+    def prime(self):
+        """시작 시 모든 트리거의 현재 상태 기록 (이 시점에는 콜백 없음)"""
+        self.engine.load_inputs(self.subscribers)
+        self.evaluate(self.subscribers)
+
+    def start(self):
+        """평가 스레드 + 입력 소스별 수집 레인 시작"""
+        if self._threads:
+            return
+        self._stop.clear()
+        self.prime()
+        self._threads.append(threading.Thread(target=self._evaluator, name='trigger-evaluator', daemon=True))
+        for key in self.subscribers:
+            interval = self.intervals.get(key, 60)
+            self._threads.append(threading.Thread(target=self._lane, args=(key, interval),
+                                                  name=f'ingest-{key}', daemon=True))
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"이벤트 기반 트리거 평가 시작 ({len(self.triggers)}개 트리거, "
+                    f"레인: {', '.join(f'{k}={self.intervals.get(k, 60)}s' for k in self.subscribers)})")
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def status(self) -> Dict:
+        return {
+            'profile': self.profile,
+            'triggers': [trigger.to_dict() for trigger in self.triggers],
+            'intervals': {key: self.intervals.get(key, 60) for key in self.subscribers},
+            'stats': dict(self.stats),
+            'recent_events': list(self.events[-10:]),
+        }
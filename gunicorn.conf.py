@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration (loaded automatically from the working directory)
+
+Warm start: the app is imported once in the master process, which loads
+dashboard_data.json, dashboard_history.json and compiles the templates
+before forking. Workers inherit that state copy-on-write and start their
+own collection threads in post_fork, so /api/data is served from the
+cached snapshot immediately.
+
+The master holds no file, socket or database handles across the fork:
+SQLite connections, requests sessions and the history ring mmap are
+opened on first use in each worker (see app_with_auth.warm_start).
+
+Set WARM_START=0 to fall back to importing the app in every worker.
+"""
+
+import os
+
+preload_app = os.getenv('WARM_START', '1').lower() not in ('0', 'false', 'no')
+
+if preload_app:
+    # Read by app_with_auth / dashboard_with_status at import time:
+    # no background threads before the fork (they would not survive it)
+    os.environ['PREFORK_WARM_START'] = '1'
+
+
+def post_fork(server, worker):
+    """Start per-worker data collection after the fork"""
+    if not preload_app:
+        return
+    import app_with_auth
+    app_with_auth.start_background_tasks()
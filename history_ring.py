@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+스냅샷 히스토리 링 버퍼 (열 단위, mmap 파일)
+- 열: 시각 int64(epoch 초), 과열도/축적도/가격 float32, 과열/축적 액션 레벨 uint8 - 한 점 22바이트
+- 기본 65536점 (5분 간격 약 7개월) ≈ 1.4 MB, 재시작 후에도 그대로
+- 쓰기는 파일 잠금(flock)을 잡은 프로세스 하나, 나머지 gunicorn 워커는 읽기 전용 매핑으로 공유
+- 추가는 슬롯 하나 덮어쓰기 + count 증가 (복사 없음), 읽기는 구간만 꺼내 JSON으로 바로 스트리밍
+
+HISTORY_RING_PATH, HISTORY_RING_CAPACITY, HISTORY_RING_SPACING(초, 이보다 촘촘한 점은 건너뜀) 환경변수
+"""
+
+import os
+import math
+import time
+import fcntl
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HISTORY_RING_PATH = os.getenv('HISTORY_RING_PATH', 'history.ring')
+HISTORY_RING_CAPACITY = int(os.getenv('HISTORY_RING_CAPACITY', 65536))
+HISTORY_RING_SPACING = float(os.getenv('HISTORY_RING_SPACING', 300))
+
+MAGIC = b'BTCHIST1'
+HEADER_SIZE = 64  # magic(8) + capacity(8) + count(8) + 예약
+COLUMNS = (
+    ('timestamp', '<i8'),
+    ('heat_score', '<f4'),
+    ('acc_score', '<f4'),
+    ('price', '<f4'),
+    ('heat_level', 'u1'),
+    ('acc_level', 'u1'),
+)
+FLOAT_COLUMNS = ('heat_score', 'acc_score', 'price')
+LEVEL_COLUMNS = ('heat_level', 'acc_level')
+MAX_EPOCH = 253402300799  # 9999-12-31T23:59:59Z - 구간 조회 시각은 [0, MAX_EPOCH]로 제한
+
+
+def to_epoch(value) -> Optional[int]:
+    """ISO 시각 문자열(시간대 없으면 로컬) 또는 epoch 숫자 -> epoch 초
+
+    inf/nan 등 잘못된 값은 ValueError, 범위 밖의 값은 [0, MAX_EPOCH]로 자름
+    """
+    if value is None or value == '':
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        try:
+            seconds = datetime.fromisoformat(value).timestamp()
+        except (OverflowError, OSError) as e:
+            raise ValueError(f"invalid time: {value!r}") from e
+    if not math.isfinite(seconds):
+        raise ValueError(f"invalid time: {value!r}")
+    return min(max(int(seconds), 0), MAX_EPOCH)
+
+
+class HistoryRing:
+    """고정 용량 열 단위 링 버퍼 (mmap)
+
+    쓰는 쪽은 슬롯을 먼저 채우고 count를 올리므로, 읽는 쪽은 count를 읽은 뒤
+    [count - capacity + 1, count) 구간을 잠금 없이 읽을 수 있다. 읽는 사이 한 바퀴를
+    넘게 쓰였으면 덮어써진 앞부분만 잘라낸다.
+    """
+
+    def __init__(self, path: str = HISTORY_RING_PATH, capacity: int = HISTORY_RING_CAPACITY,
+                 spacing: float = HISTORY_RING_SPACING):
+        self.path = path
+        self.spacing = spacing
+        self._writer_pid = None
+        self._lock_file = None
+        self._mapped_pid = None
+        self.capacity = self._create(capacity)
+
+    # ===== 파일 =====
+
+    @staticmethod
+    def _file_size(capacity: int) -> int:
+        return HEADER_SIZE + capacity * sum(np.dtype(dtype).itemsize for _, dtype in COLUMNS)
+
+    def _create(self, capacity: int) -> int:
+        """파일이 없거나 형식이 다르면 새로 만듦 (잠금 아래에서) -> 파일의 용량"""
+        with open(f'{self.path}.lock', 'a+') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.path, 'rb') as f:
+                    header = f.read(HEADER_SIZE)
+                if len(header) == HEADER_SIZE and header[:8] == MAGIC:
+                    existing = int(np.frombuffer(header, '<u8', 1, 8)[0])
+                    if os.path.getsize(self.path) == self._file_size(existing):
+                        if existing != capacity:
+                            logger.warning(f"히스토리 링 용량 {existing} 사용 (설정값 {capacity} 무시, 파일 삭제 시 적용)")
+                        return existing
+                logger.warning(f"히스토리 링 파일 형식이 달라 새로 만듦: {self.path}")
+            except FileNotFoundError:
+                pass
+            tmp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC + np.array([capacity, 0], '<u8').tobytes())
+                f.truncate(self._file_size(capacity))
+            os.replace(tmp_path, self.path)
+        return capacity
+
+    def _map(self, mode: str):
+        self._buf = np.memmap(self.path, dtype='u1', mode=mode)
+        self.capacity = int(self._buf[8:16].view('<u8')[0])
+        self._count = self._buf[16:24].view('<u8')
+        self._columns = {}
+        offset = HEADER_SIZE
+        for name, dtype in COLUMNS:
+            size = self.capacity * np.dtype(dtype).itemsize
+            self._columns[name] = self._buf[offset:offset + size].view(dtype)
+            offset += size
+        self._mapped_pid = os.getpid()
+
+    def _ensure_mapped(self):
+        """프로세스에서 처음 읽을 때 매핑 (포크 전 마스터의 매핑은 워커에서 쓰지 않음)"""
+        if self._mapped_pid != os.getpid():
+            self._map('r')
+
+    def close(self):
+        """매핑/쓰기 잠금 해제 - 다음에 읽을 때 다시 매핑 (웜스타트 마스터가 포크 전에 호출)"""
+        self._buf = self._count = self._columns = None
+        self._mapped_pid = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+            self._writer_pid = None
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        self._ensure_mapped()
+        return self._columns
+
+    @property
+    def count(self) -> int:
+        """지금까지 추가된 점 수 (단조 증가)"""
+        self._ensure_mapped()
+        return int(self._count[0])
+
+    # ===== 쓰기 =====
+
+    def is_writer(self) -> bool:
+        """이 프로세스가 쓰기 잠금을 가졌는지 (없으면 잡아봄 - 포크 후 워커마다 따로 시도)"""
+        if self._writer_pid == os.getpid():
+            return True
+        lock = open(self.path, 'rb')  # 쓰기 잠금은 링 파일 자체 (.lock은 파일 생성용)
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._lock_file = lock
+        self._writer_pid = os.getpid()
+        self._map('r+')
+        return True
+
+    def _write(self, point: Dict, timestamp: int) -> int:
+        count = self.count
+        slot = count % self.capacity
+        self.columns['timestamp'][slot] = timestamp
+        for name in FLOAT_COLUMNS:
+            self.columns[name][slot] = point.get(name) or 0.0
+        for name in LEVEL_COLUMNS:
+            self.columns[name][slot] = point.get(name) or 0
+        self._count[0] = count + 1  # 슬롯을 다 쓴 뒤에 공개
+        return count + 1
+
+    def append(self, point: Dict) -> int:
+        """한 점 추가 (쓰기 프로세스만, spacing 안의 점은 건너뜀) -> 현재 count"""
+        if not self.is_writer():
+            return self.count
+        timestamp = to_epoch(point.get('timestamp')) or int(time.time())
+        count = self.count
+        if count and timestamp - int(self.columns['timestamp'][(count - 1) % self.capacity]) < self.spacing:
+            return count
+        return self._write(point, timestamp)
+
+    def import_records(self, records: List[Dict]) -> int:
+        """비어 있는 링에 예전 JSON 히스토리 옮기기 (쓰기 프로세스가 아니면 잠금을 잠깐 잡았다 놓음)"""
+        if self.count or not records:
+            return 0
+        if self._writer_pid == os.getpid():
+            return self._import(self, records)
+        with open(self.path, 'rb') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return 0  # 이미 쓰는 프로세스가 있음
+            writable = HistoryRing.__new__(HistoryRing)
+            writable.path = self.path
+            writable._map('r+')
+            return self._import(writable, records)
+
+    @staticmethod
+    def _import(ring: 'HistoryRing', records: List[Dict]) -> int:
+        imported = 0
+        for record in records[-ring.capacity:]:
+            try:
+                ring._write(record, to_epoch(record.get('timestamp')) or int(time.time()))
+                imported += 1
+            except (ValueError, TypeError):
+                continue
+        ring._buf.flush()
+        return imported
+
+    # ===== 읽기 =====
+
+    def window(self, end: Optional[int] = None, since=None, until=None,
+               limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """end(count 기준) 직전까지의 구간을 열별 배열로 (since/until: ISO 또는 epoch, limit: 최근 N개)"""
+        end = self.count if end is None else min(end, self.count)
+        start = max(0, self.count - self.capacity + 1)
+        if end <= start:
+            return {name: np.empty(0, dtype) for name, dtype in COLUMNS}
+
+        since, until = to_epoch(since), to_epoch(until)
+        if since is not None or until is not None:
+            timestamps = self.columns['timestamp'][np.arange(start, end) % self.capacity]
+            lo = int(np.searchsorted(timestamps, since, 'left')) if since is not None else 0
+            hi = int(np.searchsorted(timestamps, until, 'right')) if until is not None else len(timestamps)
+            start, end = start + lo, start + max(lo, hi)
+        if limit and limit > 0:
+            start = max(start, end - limit)
+
+        indices = np.arange(start, end) % self.capacity
+        window = {name: column[indices] for name, column in self.columns.items()}
+        overwritten = max(0, self.count - self.capacity + 1) - start
+        if overwritten > 0:
+            window = {name: values[overwritten:] for name, values in window.items()}
+        return window
+
+    @staticmethod
+    def _iso(timestamps: np.ndarray) -> np.ndarray:
+        """epoch 초 -> 로컬 시각 ISO 문자열 (기존 히스토리와 같은 시간대 없는 형식)"""
+        offset = time.localtime().tm_gmtoff
+        return np.datetime_as_string((timestamps + offset).astype('datetime64[s]'), unit='s')
+
+    @classmethod
+    def _rows(cls, window: Dict[str, np.ndarray]) -> Iterator[tuple]:
+        return zip(
+            cls._iso(window['timestamp']).tolist(),
+            *(np.round(np.nan_to_num(window[name].astype(np.float64)), 2).tolist() for name in FLOAT_COLUMNS),
+            *(window[name].tolist() for name in LEVEL_COLUMNS),
+        )
+
+    def records(self, end: Optional[int] = None, since=None, until=None,
+                limit: Optional[int] = None) -> List[Dict]:
+        """구간을 dict 목록으로 (파일 저장/내부용)"""
+        names = ('timestamp',) + FLOAT_COLUMNS + LEVEL_COLUMNS
+        return [dict(zip(names, row)) for row in self._rows(self.window(end, since, until, limit))]
+
+    def column_lists(self, end: Optional[int] = None, since=None, until=None,
+                     limit: Optional[int] = None) -> Dict[str, list]:
+        """구간을 필드별 리스트로 (열 단위 JSON/msgpack용 - 시각은 epoch 초)"""
+        window = self.window(end, since, until, limit)
+        return {
+            'timestamp': window['timestamp'].tolist(),
+            **{name: np.round(np.nan_to_num(window[name].astype(np.float64)), 2).tolist() for name in FLOAT_COLUMNS},
+            **{name: window[name].tolist() for name in LEVEL_COLUMNS},
+        }
+
+    def iter_json(self, end: Optional[int] = None, since=None, until=None,
+                  limit: Optional[int] = None, chunk_size: int = 1024) -> Iterator[str]:
+        """구간을 JSON 배열 텍스트 조각으로 (열에서 바로 - 중간 dict 목록 없음)"""
+        window = self.window(end, since, until, limit)
+        total = len(window['timestamp'])
+        yield '['
+        for offset in range(0, total, chunk_size):
+            chunk = {name: values[offset:offset + chunk_size] for name, values in window.items()}
+            rows = [
+                f'{{"timestamp":"{ts}","heat_score":{heat!r},"acc_score":{acc!r},"price":{price!r},'
+                f'"heat_level":{heat_level},"acc_level":{acc_level}}}'
+                for ts, heat, acc, price, heat_level, acc_level in self._rows(chunk)
+            ]
+            yield (',' if offset else '') + ','.join(rows)
+        yield ']'
+
+    def status(self) -> Dict:
+        count = self.count
+        return {
+            'path': self.path,
+            'capacity': self.capacity,
+            'count': count,
+            'stored': min(count, self.capacity),
+            'bytes': self._file_size(self.capacity),
+            'writer': self._writer_pid == os.getpid(),
+        }
+
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+비트코인 지표 모듈
+- 각 지표는 필요한 입력(inputs)과 의존 지표(depends)를 선언하고 그 값들로만 계산 (업스트림 호출 없음)
+- strategy_engine.IndicatorGraph가 이 선언으로 DAG를 구성해 입력이 바뀐 노드만 재계산
+- 변형(버퍼, 계산 방식 등)은 파라미터로 받고 프로필(strategy_engine.PROFILES)에서 지정
+- @register 로 INDICATORS 레지스트리에 추가
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from trends_worker import surge_ratio_to_score
+
+INDICATORS = {}
+
+
+def register(indicator_cls):
+    """지표 모듈 등록 데코레이터"""
+    INDICATORS[indicator_cls.name] = indicator_cls()
+    return indicator_cls
+
+
+def calculate_rsi(prices: list, period: int = 14) -> float:
+    """RSI 계산"""
+    if len(prices) < period + 1:
+        return 50
+
+    prices = np.array(prices)
+    deltas = np.diff(prices)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+
+    avg_gain = np.mean(gains[-period:])
+    avg_loss = np.mean(losses[-period:])
+
+    if avg_loss == 0:
+        return 100
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+class Indicator:
+    """지표 모듈 기본 클래스"""
+
+    name = None
+    inputs = ()
+    depends = ()
+    defaults = {}
+
+    def __call__(self, data: Dict, **params):
+        return self.compute(data, **{**self.defaults, **params})
+
+    def compute(self, data: Dict, **params):
+        raise NotImplementedError
+
+
+# ===== 과열도 지표 (매도) =====
+
+@register
+class WeeklyRSI(Indicator):
+    """주간 RSI (일봉 days일을 7일 간격으로 샘플링)"""
+
+    name = 'rsi_weekly'
+    inputs = ('daily_closes',)
+    defaults = {'days': 100, 'period': 14}
+
+    def compute(self, data, days, period):
+        prices = data['daily_closes'][-(days + 1):]
+        weekly_prices = prices[::7]
+        if len(weekly_prices) > period:
+            return calculate_rsi(weekly_prices, period)
+        return 50
+
+
+@register
+class PiCycleTop(Indicator):
+    """Pi Cycle Top: 111일 MA * 2 > 350일 MA * buffer"""
+
+    name = 'pi_cycle_top'
+    inputs = ('daily_closes',)
+    defaults = {'buffer': 1.05}
+
+    def compute(self, data, buffer):
+        prices = data['daily_closes']
+        if len(prices) >= 350:
+            ma_111 = np.mean(prices[-111:])
+            ma_350 = np.mean(prices[-350:])
+            return bool((ma_111 * 2) > (ma_350 * buffer))
+        return False
+
+
+@register
+class NUPL(Indicator):
+    """NUPL 추정
+    - mvrv: 200일 MA를 실현가격 프록시로 쓴 MVRV 근사 + 연중 고점 대비 위치
+    - price_tiers: 가격 구간 기반 단순 추정
+    """
+
+    name = 'nupl'
+    inputs = ('spot_usd', 'daily_closes')
+    defaults = {'method': 'mvrv'}
+
+    def compute(self, data, method):
+        current_price = data['spot_usd']
+        if method == 'price_tiers':
+            if current_price > 100000:
+                return 0.8
+            elif current_price > 80000:
+                return 0.7
+            elif current_price > 60000:
+                return 0.6
+            return 0.5
+
+        prices_365 = data['daily_closes']
+        if prices_365 and current_price > 0:
+            ma_200 = np.mean(prices_365[-200:]) if len(prices_365) >= 200 else np.mean(prices_365)
+            mvrv_approx = current_price / ma_200
+            nupl_estimate = (mvrv_approx - 1) / mvrv_approx if mvrv_approx > 1 else 0
+
+            ath = max(prices_365)
+            position_in_cycle = current_price / ath
+
+            return min((nupl_estimate * 0.7) + (position_in_cycle * 0.3), 0.95)
+        return 0.5
+
+
+@register
+class GoogleTrends(Indicator):
+    """구글 트렌드
+    - surge: 최근값/평균 급증 비율 정규화 (1.5배 이상이면 1.0)
+    - raw: 최근 관심도 / 100
+    """
+
+    name = 'google_trends'
+    inputs = ('trends',)
+    defaults = {'method': 'surge'}
+
+    def compute(self, data, method):
+        trends = data['trends']
+        if method == 'raw':
+            return trends['recent'] / 100 if trends else 0.5
+        return surge_ratio_to_score(trends['surge_ratio']) if trends else 0.3
+
+
+@register
+class KimchiPremium(Indicator):
+    """김치 프리미엄 (%) - fixed_fx 지정 시 고정 환율 사용"""
+
+    name = 'kimchi_premium'
+    inputs = ('spot_usd', 'spot_krw', 'fx')
+    defaults = {'fixed_fx': None}
+
+    def compute(self, data, fixed_fx):
+        usd_price = data['spot_usd']
+        krw_price = data['spot_krw']
+        exchange_rate = fixed_fx or data['fx']
+
+        if all([usd_price > 0, krw_price > 0, exchange_rate > 0]):
+            usd_in_krw = usd_price * exchange_rate
+            return ((krw_price - usd_in_krw) / usd_in_krw) * 100
+        return 0
+
+
+# ===== 축적도 지표 (매수) =====
+
+@register
+class FearGreed(Indicator):
+    """Fear & Greed Index"""
+
+    name = 'fear_greed'
+    inputs = ('fear_greed',)
+
+    def compute(self, data):
+        return data['fear_greed']
+
+
+@register
+class ExchangeBalanceTrend(Indicator):
+    """거래소 BTC 잔고 추세 추정 (최근 7일 vs 이전 7일 변동성, -1 증가 ~ 1 감소)"""
+
+    name = 'exchange_balance'
+    inputs = ('daily_closes',)
+    defaults = {'days': 30}
+
+    def compute(self, data, days):
+        prices = data['daily_closes'][-(days + 1):]
+        if len(prices) > 7:
+            recent_volatility = np.std(prices[-7:])
+            prev_volatility = np.std(prices[-14:-7])
+
+            if prev_volatility > 0:
+                trend = 1 - (recent_volatility / prev_volatility)
+                return max(min(trend, 1), -1)
+        return 0
+
+
+@register
+class LongTermHolder(Indicator):
+    """장기 보유자 축적 추정 (150일 전 가격 대비 변화율)"""
+
+    name = 'long_term_holder'
+    inputs = ('daily_closes',)
+    defaults = {'days': 200}
+
+    def compute(self, data, days):
+        prices = data['daily_closes'][-(days + 1):]
+        if len(prices) > 150:
+            price_150d_ago = prices[-150]
+            current_price = prices[-1]
+
+            price_change = (current_price - price_150d_ago) / price_150d_ago
+
+            if price_change < 0:
+                return min(abs(price_change) * 2, 1)
+            return max(1 - price_change, 0)
+        return 0.5
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+공유 시장 데이터 수집/캐시 계층
+- 모든 전략 프로필이 하나의 인스턴스를 공유 (프로세스당 한 번의 데이터 수집)
+- 입력별 TTL 캐시 + 키별 잠금으로 동시 호출 병합
+- 레이트 리밋, 타임아웃, 소스별 서킷 브레이커, 마지막 정상값 폴백
+- 자산별 입력(현물/일봉/트렌드) - 현물 가격은 추적 중인 전체 자산을 한 요청으로 배치 조회
+"""
+
+import os
+import json
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+import requests
+
+import metrics
+from api_budget import ApiBudget
+from circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# 서킷 브레이커를 적용하는 업스트림 소스
+UPSTREAM_SOURCES = ('binance', 'coingecko', 'bithumb', 'upbit', 'dunamu', 'alternative_me', 'google_trends')
+
+# 업스트림 베이스 URL (환경변수로 교체 가능 - 벤치마크 픽스처 서버 등)
+BINANCE_API_URL = os.getenv('BINANCE_API_URL', 'https://api.binance.com')
+COINGECKO_API_URL = os.getenv('COINGECKO_API_URL', 'https://api.coingecko.com')
+BITHUMB_API_URL = os.getenv('BITHUMB_API_URL', 'https://api.bithumb.com')
+UPBIT_API_URL = os.getenv('UPBIT_API_URL', 'https://api.upbit.com')
+DUNAMU_API_URL = os.getenv('DUNAMU_API_URL', 'https://quotation-api-cdn.dunamu.com')
+FEAR_GREED_API_URL = os.getenv('FEAR_GREED_API_URL', 'https://api.alternative.me')
+GOOGLE_TRENDS_URL = os.getenv('GOOGLE_TRENDS_URL')  # 기본값은 pytrends 내장 URL
+
+BINANCE_PRICE_URL = f'{BINANCE_API_URL}/api/v3/ticker/price'
+COINGECKO_PRICE_URL = f'{COINGECKO_API_URL}/api/v3/simple/price'
+COINGECKO_CHART_URL = COINGECKO_API_URL + '/api/v3/coins/{coin_id}/market_chart'
+BITHUMB_TICKER_URL = BITHUMB_API_URL + '/public/ticker/{market}'
+UPBIT_TICKER_URL = f'{UPBIT_API_URL}/v1/ticker'
+DUNAMU_FX_URL = f'{DUNAMU_API_URL}/v1/forex/recent?codes=FRX.KRWUSD'
+FEAR_GREED_URL = f'{FEAR_GREED_API_URL}/fng/'
+
+# 자산별 업스트림 심볼
+ASSETS = {
+    'BTC': {'coingecko': 'bitcoin', 'binance': 'BTCUSDT', 'upbit': 'KRW-BTC', 'keyword': 'Bitcoin'},
+    'ETH': {'coingecko': 'ethereum', 'binance': 'ETHUSDT', 'upbit': 'KRW-ETH', 'keyword': 'Ethereum'},
+    'SOL': {'coingecko': 'solana', 'binance': 'SOLUSDT', 'upbit': 'KRW-SOL', 'keyword': 'Solana'},
+    'XRP': {'coingecko': 'ripple', 'binance': 'XRPUSDT', 'upbit': 'KRW-XRP', 'keyword': 'XRP'},
+}
+DEFAULT_ASSET = 'BTC'
+
+# 기본 추적 자산 (ASSETS 환경변수로 변경, 예: ASSETS=BTC,ETH)
+# 기본은 BTC만 - 자산마다 구글 트렌드/일봉 호출이 따로 나가므로 필요한 자산만 추가
+TRACKED_ASSETS = tuple(
+    asset for asset in os.getenv('ASSETS', DEFAULT_ASSET).upper().split(',') if asset in ASSETS
+) or (DEFAULT_ASSET,)
+
+# 자산별로 따로 캐시하는 입력 (환율, Fear & Greed는 시장 공통)
+ASSET_INPUTS = ('spot_usd', 'spot_krw', 'daily_closes', 'trends')
+
+# 지표 계산에 필요한 최대 일봉 길이 (Pi Cycle 350일 포함) - 한 번 받아서 잘라 씀
+HISTORY_DAYS = 365
+
+# 소스별 시간당 호출 예산 (무료 티어 한도보다 보수적으로 설정)
+HOURLY_BUDGET = {
+    'binance': 1200,
+    'coingecko': 300,
+    'bithumb': 1200,
+    'upbit': 1200,
+    'dunamu': 120,
+    'alternative_me': 60,
+    'google_trends': 30,
+}
+
+# 입력별 캐시 유효 시간 (초)
+INPUT_TTL = {
+    'spot_usd': 30,
+    'spot_krw': 30,
+    'fx': 600,
+    'daily_closes': 3600,
+    'fear_greed': 600,
+    'trends': 600,
+}
+
+# 입력별 기본값 (최초 조회부터 실패한 경우)
+INPUT_DEFAULTS = {
+    'spot_usd': 0,
+    'spot_krw': 0,
+    'fx': 1350,
+    'daily_closes': [],
+    'fear_greed': 50,
+    'trends': None,
+}
+
+
+def input_key(key: str, asset: str = DEFAULT_ASSET) -> str:
+    """캐시 키 (BTC와 시장 공통 입력은 기존 키 그대로, 그 외 자산은 'key:ASSET')"""
+    if asset == DEFAULT_ASSET or key not in ASSET_INPUTS:
+        return key
+    return f'{key}:{asset}'
+
+
+def _base_key(key: str) -> str:
+    return key.split(':', 1)[0]
+
+
+def trends_client():
+    """pytrends TrendReq (pandas 포함 무거운 의존성 - 첫 사용 시 로드, GOOGLE_TRENDS_URL이면 그 주소로)"""
+    from pytrends import request as trends_request
+    if GOOGLE_TRENDS_URL and trends_request.BASE_TRENDS_URL != GOOGLE_TRENDS_URL:
+        default = trends_request.BASE_TRENDS_URL
+        trends_request.BASE_TRENDS_URL = GOOGLE_TRENDS_URL
+        TrendReq = trends_request.TrendReq
+        for name, value in list(vars(TrendReq).items()):
+            if name.endswith('_URL') and isinstance(value, str):
+                setattr(TrendReq, name, value.replace(default, GOOGLE_TRENDS_URL, 1))
+    return trends_request.TrendReq(hl='ko', tz=540, timeout=(10, 25))
+
+
+class MarketData:
+    """업스트림 시장 데이터 공유 수집기"""
+
+    def __init__(self, request_timeout: float = 10, assets=TRACKED_ASSETS):
+        self.request_timeout = request_timeout
+        self._session = None
+        self._session_pid = None
+        self.assets = list(assets)
+
+        # API 제한 관리
+        self.last_api_call = {}
+        self.api_limits = {
+            'coingecko': 10,
+            'google_trends': 60,
+            'alternative_me': 10,
+            'bithumb': 1,
+        }
+
+        # 업스트림 장애 관리 (소스별 서킷 브레이커 + 마지막 정상값 캐시)
+        self.breakers = CircuitBreakerRegistry(UPSTREAM_SOURCES)
+        self.cached_values = {}
+
+        # 소스별 호출/전송량/캐시 적중 집계 (호출 수는 모든 프로세스 합산)
+        self.budget = ApiBudget(HOURLY_BUDGET)
+
+        # 구글 트렌드 저속 레인 워커 (연결되면 캐시만 읽음) - 자산별, trends_worker는 BTC
+        self.trends_workers = {}
+
+        self._fresh = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    # ===== 업스트림 호출 =====
+
+    @property
+    def session(self) -> requests.Session:
+        """프로세스별 HTTP 연결 풀 - 처음 쓸 때 생성 (웜스타트 마스터의 풀을 워커가 물려받아 쓰지 않음)"""
+        if self._session_pid != os.getpid():
+            self._session = requests.Session()
+            self._session_pid = os.getpid()
+        return self._session
+
+    def reserve_call_slot(self, api_name: str) -> float:
+        """다음 호출 슬롯 예약 -> 기다려야 할 시간(초) (동기 호출과 async_client가 같은 간격을 공유)"""
+        with self._lock:
+            now = time.time()
+            wait_time = 0
+            if api_name in self.last_api_call:
+                elapsed = now - self.last_api_call[api_name]
+                wait_time = max(self.api_limits.get(api_name, 1) - elapsed, 0)
+            # 대기 전에 슬롯을 예약해 다음 호출자가 그 뒤로 줄을 서게 함
+            self.last_api_call[api_name] = now + wait_time
+        metrics.observe('rate_limit_wait', wait_time, source=api_name)
+        return wait_time
+
+    def rate_limit(self, api_name: str):
+        """API 호출 제한 (여러 스레드가 동시에 불러도 호출 간격 유지)"""
+        wait_time = self.reserve_call_slot(api_name)
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def record_call(self, source: str):
+        """업스트림 호출 기록 (시간당 예산 계산)"""
+        self.budget.record_call(source)
+
+    def remaining_budget(self, sources=None) -> Dict[str, float]:
+        """소스별 남은 시간당 호출 예산 비율 (0~1, 현재 호출 속도로 예상한 잔여가 더 적으면 그 값)"""
+        return self.budget.remaining(sources)
+
+    def cycle_sources(self) -> tuple:
+        """수집 사이클이 직접 호출하는 소스 - 추적 자산 모두 트렌드 워커가 있으면 google_trends는 워커 몫"""
+        if all(asset in self.trends_workers for asset in self.assets):
+            return tuple(source for source in UPSTREAM_SOURCES if source != 'google_trends')
+        return UPSTREAM_SOURCES
+
+    def call_upstream(self, source: str, func, *args, **kwargs):
+        """서킷 브레이커를 거쳐 업스트림 호출 (open 상태면 CircuitOpenError)"""
+        breaker = self.breakers.get(source)
+        if not breaker.allow_request():
+            raise CircuitOpenError(source)
+        self.record_call(source)
+        try:
+            # 레이트 리밋 대기 포함 (대기만 따로 보려면 rate_limit_wait)
+            with metrics.span('upstream', source=source):
+                result = func(*args, **kwargs)
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+        return result
+
+    def fetch_json(self, source: str, url: str, params: Optional[Dict] = None):
+        """업스트림 JSON 조회 (레이트 리밋 + 타임아웃 + 서킷 브레이커)"""
+        def _get():
+            if source in self.api_limits:
+                self.rate_limit(source)
+            response = self.session.get(url, params=params, timeout=self.request_timeout)
+            self.budget.record_transfer(source, len(response.content))
+            response.raise_for_status()
+            return response.json()
+        return self.call_upstream(source, _get)
+
+    def get_cached_value(self, key: str, default):
+        """모든 소스 실패/차단 시 마지막 정상값 반환"""
+        return self.cached_values.get(key, default)
+
+    # ===== TTL 캐시 =====
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _store(self, key: str, value, fetched_at: Optional[float] = None):
+        self.cached_values[key] = value
+        self._fresh[key] = (fetched_at or time.time(), value)
+
+    def _fresh_value(self, key: str, ttl: float):
+        entry = self._fresh.get(key)
+        if entry is not None and time.time() - entry[0] < ttl:
+            return entry
+        return None
+
+    def get_input(self, key: str, fetch, ttl: Optional[float] = None):
+        """TTL 안이면 캐시값, 아니면 조회 (같은 키 동시 조회는 한 번만 실행)"""
+        ttl = INPUT_TTL.get(_base_key(key), 60) if ttl is None else ttl
+        with self._key_lock(key):
+            entry = self._fresh_value(key, ttl)
+            self.budget.record_cache(_base_key(key), entry is not None)
+            if entry is not None:
+                return entry[1]
+            try:
+                value = fetch()
+            except Exception as e:
+                logger.error(f"{key} 조회 실패: {e}")
+                return self.get_cached_value(key, INPUT_DEFAULTS.get(_base_key(key)))
+            self._store(key, value)
+            return value
+
+    def get_batched_input(self, key: str, asset: str, fetch_batch, ttl: Optional[float] = None):
+        """추적 중인 전체 자산을 한 요청으로 조회하는 입력
+
+        한 자산의 값이 만료되면 fetch_batch(assets) -> {asset: value}로 전체를 갱신하므로
+        자산 수가 늘어도 업스트림 호출 수는 그대로다.
+        """
+        cache_key = input_key(key, asset)
+        ttl = INPUT_TTL.get(key, 60) if ttl is None else ttl
+        if asset not in self.assets:
+            with self._lock:
+                if asset not in self.assets:
+                    self.assets = self.assets + [asset]  # 새 목록으로 교체 - 읽는 쪽은 잠금 없이 한 목록만 봄
+        with self._key_lock(f'{key}:batch'):
+            entry = self._fresh_value(cache_key, ttl)
+            self.budget.record_cache(key, entry is not None)
+            if entry is not None:
+                return entry[1]
+            try:
+                values = fetch_batch(self.assets)
+            except Exception as e:
+                logger.error(f"{key} 배치 조회 실패: {e}")
+                values = {}
+            fetched_at = time.time()
+            for name, value in values.items():
+                self._store(input_key(key, name), value, fetched_at)
+            if asset not in values:
+                return self.get_cached_value(cache_key, INPUT_DEFAULTS.get(key))
+            return values[asset]
+
+    def is_fresh(self, key: str, ttl: Optional[float] = None) -> bool:
+        """캐시값이 TTL 안인지 (async_client가 만료된 입력만 미리 받을 때)"""
+        ttl = INPUT_TTL.get(_base_key(key), 60) if ttl is None else ttl
+        return self._fresh_value(key, ttl) is not None
+
+    def put_input(self, key: str, value):
+        """외부에서 받은 값으로 캐시 갱신 (비동기 수집기 등)"""
+        with self._key_lock(key):
+            self._store(key, value)
+
+    def invalidate(self, key: Optional[str] = None, asset: str = DEFAULT_ASSET):
+        """캐시 무효화 (강제 새로고침용)"""
+        with self._lock:
+            if key is None:
+                self._fresh.clear()
+            else:
+                self._fresh.pop(input_key(key, asset), None)
+
+    # ===== 원천 데이터 =====
+
+    def _fetch_prices_usd(self, assets: list) -> Dict[str, float]:
+        """USD 현물 배치 조회 (Binance symbols=[...] → CoinGecko ids=...)"""
+        try:
+            symbols = {ASSETS[asset]['binance']: asset for asset in assets}
+            params = {'symbols': json.dumps(list(symbols), separators=(',', ':'))}
+            data = self.fetch_json('binance', BINANCE_PRICE_URL, params)
+            return {symbols[item['symbol']]: float(item['price']) for item in data if item['symbol'] in symbols}
+        except Exception:
+            ids = {ASSETS[asset]['coingecko']: asset for asset in assets}
+            params = {'ids': ','.join(ids), 'vs_currencies': 'usd'}
+            data = self.fetch_json('coingecko', COINGECKO_PRICE_URL, params)
+            return {ids[coin_id]: price['usd'] for coin_id, price in data.items() if coin_id in ids}
+
+    def _fetch_prices_krw(self, assets: list) -> Dict[str, float]:
+        """KRW 현물 배치 조회 (Bithumb ALL_KRW → Upbit markets=...)"""
+        try:
+            data = self.fetch_json('bithumb', BITHUMB_TICKER_URL.format(market='ALL_KRW'))
+            if data['status'] != '0000':
+                raise ValueError(f"Bithumb status {data['status']}")
+            return {asset: float(data['data'][asset]['closing_price']) for asset in assets if asset in data['data']}
+        except Exception:
+            markets = {ASSETS[asset]['upbit']: asset for asset in assets}
+            data = self.fetch_json('upbit', UPBIT_TICKER_URL, {'markets': ','.join(markets)})
+            return {markets[item['market']]: item['trade_price'] for item in data if item['market'] in markets}
+
+    def _fetch_exchange_rate(self) -> float:
+        return self.fetch_json('dunamu', DUNAMU_FX_URL)[0]['basePrice']
+
+    def _fetch_daily_closes(self, asset: str) -> list:
+        params = {'vs_currency': 'usd', 'days': HISTORY_DAYS, 'interval': 'daily'}
+        url = COINGECKO_CHART_URL.format(coin_id=ASSETS[asset]['coingecko'])
+        data = self.fetch_json('coingecko', url, params)
+        return [price[1] for price in data['prices']]
+
+    def _fetch_fear_greed(self) -> int:
+        data = self.fetch_json('alternative_me', FEAR_GREED_URL)
+        if 'data' not in data or len(data['data']) == 0:
+            raise ValueError('empty Fear & Greed response')
+        value = int(data['data'][0]['value'])
+        logger.info(f"Fear & Greed: {value} ({data['data'][0]['value_classification']})")
+        return value
+
+    def _fetch_trends(self, asset: str) -> Dict:
+        keyword = ASSETS[asset]['keyword']
+
+        def _fetch_interest():
+            self.rate_limit('google_trends')
+            pytrends = trends_client()
+            pytrends.build_payload([keyword], timeframe='now 7-d')
+            return pytrends.interest_over_time()
+
+        interest = self.call_upstream('google_trends', _fetch_interest)
+        if interest.empty:
+            raise ValueError('empty interest_over_time frame')
+        recent = float(interest[keyword].iloc[-1])
+        avg = float(interest[keyword].mean())
+        return {'recent': recent, 'surge_ratio': recent / avg if avg > 0 else 1.0}
+
+    def get_price_usd(self, asset: str = DEFAULT_ASSET) -> float:
+        """USD 현물 (추적 자산 배치 조회)"""
+        return self.get_batched_input('spot_usd', asset, self._fetch_prices_usd)
+
+    def get_price_krw(self, asset: str = DEFAULT_ASSET) -> float:
+        """KRW 현물 (추적 자산 배치 조회)"""
+        return self.get_batched_input('spot_krw', asset, self._fetch_prices_krw)
+
+    def get_exchange_rate(self) -> float:
+        """USD/KRW 환율 (dunamu)"""
+        return self.get_input('fx', self._fetch_exchange_rate)
+
+    def get_daily_closes(self, days: int = HISTORY_DAYS, asset: str = DEFAULT_ASSET) -> list:
+        """일봉 종가 - 최대 길이로 한 번 받아 최근 days일만 잘라 반환"""
+        closes = self.get_input(input_key('daily_closes', asset), lambda: self._fetch_daily_closes(asset))
+        return closes[-(days + 1):] if days < HISTORY_DAYS else closes
+
+    def get_fear_greed(self) -> int:
+        """Fear & Greed Index (alternative.me, 시장 공통)"""
+        return self.get_input('fear_greed', self._fetch_fear_greed)
+
+    def get_trends(self, asset: str = DEFAULT_ASSET) -> Optional[Dict]:
+        """구글 트렌드 {'recent', 'surge_ratio'} (워커가 있으면 캐시만 읽음)"""
+        worker = self.trends_workers.get(asset)
+        if worker is not None:
+            return worker.get_trends()
+        return self.get_input(input_key('trends', asset), lambda: self._fetch_trends(asset))
+
+    @property
+    def trends_worker(self):
+        return self.trends_workers.get(DEFAULT_ASSET)
+
+    def start_trends_worker(self, interval: float = 900, asset: str = DEFAULT_ASSET):
+        """구글 트렌드 백그라운드 갱신 시작"""
+        from trends_worker import TrendsWorker
+        if asset not in self.trends_workers:
+            self.trends_workers[asset] = TrendsWorker(self, keyword=ASSETS[asset]['keyword'], interval=interval)
+        self.trends_workers[asset].start()
+        return self.trends_workers[asset]
+
+
+_default_market = None
+_default_lock = threading.Lock()
+
+
+def get_default_market() -> MarketData:
+    """프로세스 공용 MarketData (모든 전략 프로필이 공유)"""
+    global _default_market
+    with _default_lock:
+        if _default_market is None:
+            _default_market = MarketData()
+        return _default_market
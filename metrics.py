@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+수집 사이클 단계별 지연 측정
+- span(stage, **labels): 업스트림 호출, 레이트 리밋 대기, 지표 계산, 점수 계산, 저장 등을 감싸 시간 측정
+- 측정값은 라벨 조합별 히스토그램으로 누적 (프로세스 단위)
+- render(): Prometheus 텍스트 포맷 (/api/metrics)
+
+stage 예: upstream(source), rate_limit_wait(source), input(input, asset), indicator(indicator),
+scoring(step), snapshot(asset), history, persist(file), subscriptions, cycle
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    labels = list(labels)
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class Histogram:
+    """라벨 조합별 누적 히스토그램 (Prometheus histogram 의미)"""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted((name, str(v)) for name, v in labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: {**value, 'counts': list(value['counts'])} for key, value in self._series.items()}
+        for key, value in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, value['counts']):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', f'{bound:g}'),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {value['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {value['sum']:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {value['count']}")
+        return '\n'.join(lines)
+
+    def summary(self) -> Dict[str, Dict]:
+        """라벨 조합별 호출 수/평균 (JSON용)"""
+        with self._lock:
+            return {
+                _format_labels(key) or '{}': {
+                    'count': value['count'],
+                    'avg_ms': round(value['sum'] / value['count'] * 1000, 3) if value['count'] else 0,
+                }
+                for key, value in self._series.items()
+            }
+
+
+STAGE_SECONDS = Histogram('btc_alert_stage_duration_seconds',
+                          'Duration of collection cycle stages in seconds')
+
+
+def observe(stage: str, seconds: float, **labels):
+    STAGE_SECONDS.observe(seconds, stage=stage, **labels)
+
+
+@contextmanager
+def span(stage: str, **labels):
+    """with span('upstream', source='coingecko'): ... -> 단계 히스토그램에 기록 (예외가 나도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - started, **labels)
+
+
+def render() -> str:
+    """Prometheus 텍스트 포맷 (text/plain; version=0.0.4)"""
+    return STAGE_SECONDS.render() + '\n'
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+알림 발송 파이프라인
+- notify()는 큐에 넣고 바로 반환 (점수 계산 경로에 지연 없음)
+- 백그라운드 디스패처가 batch_window 동안 모아 수신자별로 한 번에 발송
+- 같은 key(예: heat_level)의 알림은 마지막 상태로 합치고, 마지막 발송 상태로
+  되돌아온 경우(레벨 깜빡임)는 발송하지 않음
+- 실패한 배치는 지수 백오프로 재시도, max_retries 초과 시 폐기
+- 싱크: log, desktop(plyer), webhook, email(SMTP), telegram, kakao
+
+NOTIFY_CHANNELS 환경변수로 기본 수신자 지정 (예: "log,webhook:https://example.com/hook,telegram:12345")
+사용자 구독은 SUBSCRIPTION_CHANNELS(기본 log,webhook,telegram)에 있는 채널만, 대상 형식 검사 후 사용
+"""
+
+import os
+import re
+import atexit
+import heapq
+import ipaddress
+import json
+import queue
+import random
+import smtplib
+import socket
+import threading
+import time
+import logging
+from email.message import EmailMessage
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+Recipient = Tuple[str, Optional[str]]  # (채널, 대상: URL/이메일/chat id 등)
+
+DEFAULT_CHANNELS = os.getenv('NOTIFY_CHANNELS', 'log')  # desktop(plyer)은 로컬 실행 때만 켬 - 헤드리스 서버에서는 실패/재시도만 쌓임
+
+
+def parse_recipients(spec: str) -> List[Recipient]:
+    """'log,webhook:https://...' -> [('log', None), ('webhook', 'https://...')]"""
+    recipients = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        channel, _, target = item.partition(':')
+        recipients.append((channel, target or None))
+    return recipients
+
+
+# ===== 사용자 구독 채널 =====
+
+# 사용자가 고를 수 있는 채널 (desktop은 서버 로컬 팝업이라 제외) - email/kakao는 운영자가 켤 때만
+USER_SINK_CHANNELS = ('log', 'webhook', 'email', 'telegram', 'kakao')
+SUBSCRIPTION_CHANNELS = tuple(
+    channel for channel in (c.strip() for c in os.getenv('SUBSCRIPTION_CHANNELS', 'log,webhook,telegram').split(','))
+    if channel in USER_SINK_CHANNELS
+)
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,}$')
+TELEGRAM_CHAT_PATTERN = re.compile(r'^(-?\d{1,20}|@[A-Za-z][A-Za-z0-9_]{4,31})$')
+KAKAO_TOKEN_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{20,512}$')
+
+
+def check_public_url(url: str) -> str:
+    """http(s) URL이고 호스트가 공인 주소로만 해석되는지 (내부/루프백/링크로컬/메타데이터 주소면 ValueError)"""
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise ValueError('webhook target must be an http(s) URL')
+    if parsed.username or parsed.password:
+        raise ValueError('webhook URL must not contain credentials')
+    try:
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(parsed.hostname, port, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError, ValueError) as e:
+        raise ValueError(f'webhook host does not resolve: {parsed.hostname}') from e
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f'webhook host resolves to a non-public address: {parsed.hostname}')
+    return url
+
+
+def validate_subscription_target(channel: str, target: Optional[str]) -> Optional[str]:
+    """구독 채널/대상 검사 -> 정리된 대상 (허용되지 않은 채널이나 잘못된 대상이면 ValueError)"""
+    if channel not in SUBSCRIPTION_CHANNELS:
+        raise ValueError(f"unsupported channel: {channel} (allowed: {', '.join(SUBSCRIPTION_CHANNELS)})")
+    if target is not None and not isinstance(target, str):
+        raise ValueError('target must be a string')
+    target = (target or '').strip() or None
+    if channel == 'log':
+        return None
+    if target is None:
+        raise ValueError(f'channel {channel} requires a target')
+    if channel == 'webhook':
+        return check_public_url(target)
+    if channel == 'email' and not EMAIL_PATTERN.match(target):
+        raise ValueError('target must be an email address')
+    if channel == 'telegram' and not TELEGRAM_CHAT_PATTERN.match(target):
+        raise ValueError('target must be a Telegram chat id or @channel')
+    if channel == 'kakao' and not KAKAO_TOKEN_PATTERN.match(target):
+        raise ValueError('target must be a Kakao access token')
+    return target
+
+
+# ===== 싱크 =====
+
+class Sink:
+    """발송 채널 기본 클래스 - send()는 실패 시 예외 (디스패처가 재시도)"""
+
+    def send(self, target: Optional[str], notifications: List[Dict]):
+        raise NotImplementedError
+
+    @staticmethod
+    def render(notifications: List[Dict]) -> Tuple[str, str]:
+        """배치 -> (제목, 본문)"""
+        if len(notifications) == 1:
+            return notifications[0]['title'], notifications[0]['message']
+        title = f"알림 {len(notifications)}건: {notifications[-1]['title']}"
+        body = '\n\n'.join(f"{n['title']}\n{n['message']}" for n in notifications)
+        return title, body
+
+
+class LogSink(Sink):
+    def send(self, target, notifications):
+        for n in notifications:
+            logger.info(f"📢 알림{f' [{target}]' if target else ''}: {n['title']} - {n['message']}")
+
+
+class DesktopSink(Sink):
+    """데스크톱 팝업 (plyer) - 서버에서는 실패하므로 재시도하지 않음"""
+
+    retry = False
+
+    def send(self, target, notifications):
+        from plyer import notification  # 서버에서는 불필요 - 첫 알림 시 로드
+        title, body = self.render(notifications)
+        notification.notify(title=title, message=body, app_icon=None, timeout=10)
+
+
+class WebhookSink(Sink):
+    """JSON POST {'notifications': [...]}
+
+    public_only: 사용자 구독용 - 보낼 때마다 호스트를 다시 해석해 공인 주소인지 확인, 리다이렉트 따라가지 않음
+    """
+
+    def __init__(self, timeout: float = 10, public_only: bool = False):
+        self.timeout = timeout
+        self.public_only = public_only
+        self._session = None
+        self._session_pid = None
+
+    @property
+    def session(self) -> requests.Session:
+        """프로세스별 연결 풀 (포크 후 워커에서 처음 보낼 때 생성)"""
+        if self._session_pid != os.getpid():
+            self._session = requests.Session()
+            self._session_pid = os.getpid()
+        return self._session
+
+    def send(self, target, notifications):
+        if not target:
+            raise ValueError('webhook target URL missing')
+        if self.public_only:
+            check_public_url(target)
+        response = self.session.post(target, json={'notifications': notifications}, timeout=self.timeout,
+                                     allow_redirects=not self.public_only)
+        response.raise_for_status()
+
+
+class EmailSink(Sink):
+    """SMTP 발송 (기본 localhost:1025 - 로컬 테스트 SMTP 서버)"""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, sender: Optional[str] = None):
+        self.host = host or os.getenv('SMTP_HOST', 'localhost')
+        self.port = port or int(os.getenv('SMTP_PORT', 1025))
+        self.sender = sender or os.getenv('SMTP_FROM', 'alerts@localhost')
+
+    def send(self, target, notifications):
+        if not target:
+            raise ValueError('email target address missing')
+        title, body = self.render(notifications)
+        message = EmailMessage()
+        message['Subject'] = title
+        message['From'] = self.sender
+        message['To'] = target
+        message.set_content(body)
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(message)
+
+
+class TelegramSink(Sink):
+    """Telegram Bot API sendMessage (대상 = chat id)"""
+
+    def __init__(self, token: Optional[str] = None, timeout: float = 10):
+        self.token = token or os.getenv('TELEGRAM_BOT_TOKEN')
+        self.timeout = timeout
+
+    def send(self, target, notifications):
+        if not self.token or not target:
+            raise ValueError('TELEGRAM_BOT_TOKEN or chat id missing')
+        title, body = self.render(notifications)
+        response = requests.post(
+            f'https://api.telegram.org/bot{self.token}/sendMessage',
+            json={'chat_id': target, 'text': f"{title}\n\n{body}"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class KakaoSink(Sink):
+    """카카오톡 나에게 보내기 (대상 = 액세스 토큰, 없으면 KAKAO_ACCESS_TOKEN - 사용자 구독은 대상 토큰만)"""
+
+    def __init__(self, timeout: float = 10, default_token: bool = True):
+        self.timeout = timeout
+        self.default_token = default_token
+
+    def send(self, target, notifications):
+        token = target or (os.getenv('KAKAO_ACCESS_TOKEN') if self.default_token else None)
+        if not token:
+            raise ValueError('Kakao access token missing')
+        title, body = self.render(notifications)
+        template = {'object_type': 'text', 'text': f"{title}\n\n{body}"[:200], 'link': {}}
+        response = requests.post(
+            'https://kapi.kakao.com/v2/api/talk/memo/default/send',
+            headers={'Authorization': f'Bearer {token}'},
+            data={'template_object': json.dumps(template, ensure_ascii=False)},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+USER_CHANNEL_PREFIX = 'user:'
+
+
+def user_sinks() -> Dict[str, Sink]:
+    """사용자 구독 전용 싱크 (SUBSCRIPTION_CHANNELS만, 'user:<채널>' 이름)"""
+    sinks = {
+        'log': LogSink,
+        'webhook': lambda: WebhookSink(public_only=True),
+        'email': EmailSink,
+        'telegram': TelegramSink,
+        'kakao': lambda: KakaoSink(default_token=False),
+    }
+    return {USER_CHANNEL_PREFIX + channel: sinks[channel]() for channel in SUBSCRIPTION_CHANNELS}
+
+
+def subscription_recipient(channel: str, target: Optional[str]) -> Recipient:
+    """저장된 구독 -> 사용자 전용 싱크로 가는 수신자 (다시 검사, 허용되지 않으면 ValueError)"""
+    return USER_CHANNEL_PREFIX + channel, validate_subscription_target(channel, target)
+
+
+def default_sinks() -> Dict[str, Sink]:
+    """운영자 채널 (NOTIFY_CHANNELS) + 사용자 구독 채널"""
+    return {
+        'log': LogSink(),
+        'desktop': DesktopSink(),
+        'webhook': WebhookSink(),
+        'email': EmailSink(),
+        'telegram': TelegramSink(),
+        'kakao': KakaoSink(),
+        **user_sinks(),
+    }
+
+
+# ===== 디스패처 =====
+
+class NotificationDispatcher:
+    """알림 큐 + 백그라운드 발송 스레드"""
+
+    def __init__(self, sinks: Optional[Dict[str, Sink]] = None,
+                 recipients: Optional[Iterable[Recipient]] = None,
+                 batch_window: float = 5.0, max_retries: int = 4,
+                 backoff: float = 2.0, max_backoff: float = 300, max_queue: int = 10000):
+        self.sinks = sinks or default_sinks()
+        self.recipients = list(recipients) if recipients is not None else parse_recipients(DEFAULT_CHANNELS)
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.stats = {'queued': 0, 'sent': 0, 'batches': 0, 'coalesced': 0, 'suppressed': 0,
+                      'retried': 0, 'failed': 0, 'dropped': 0}
+        self.last_error = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._retries = []  # (다음 시도 시각, 순번, 시도 횟수, 수신자, 알림 목록)
+        self._retry_seq = 0
+        self._delivered = {}  # (수신자, key) -> 마지막 발송 상태
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def notify(self, title: str, message: str, recipients: Optional[Iterable[Recipient]] = None,
+               key: Optional[str] = None, state=None, **extra) -> bool:
+        """알림 큐에 추가 (대기 없음). key/state를 주면 깜빡임 억제 대상"""
+        self.start()
+        notification = {
+            'title': title,
+            'message': message,
+            'key': key,
+            'state': state,
+            'created_at': datetime.now().isoformat(),
+            **extra,
+        }
+        for recipient in (list(recipients) if recipients is not None else self.recipients):
+            try:
+                self._queue.put_nowait((tuple(recipient), notification))
+                self.stats['queued'] += 1
+            except queue.Full:
+                self.stats['dropped'] += 1
+                logger.error(f"알림 큐 가득 참 - 폐기: {title}")
+                return False
+        return True
+
+    # ===== 배치/중복 제거 =====
+
+    def _collect(self) -> Dict[Recipient, List[Dict]]:
+        """첫 알림부터 batch_window 동안 모아 수신자별로 묶음"""
+        timeout = self._next_retry_delay()
+        try:
+            first = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return {}
+        batches = {first[0]: [first[1]]}
+        deadline = time.time() + self.batch_window
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                recipient, notification = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batches.setdefault(recipient, []).append(notification)
+        return batches
+
+    def _coalesce(self, recipient: Recipient, notifications: List[Dict]) -> List[Dict]:
+        """같은 key는 마지막 알림만, 마지막 발송 상태와 같으면 제외"""
+        latest = {}
+        result = []
+        for notification in notifications:
+            key = notification.get('key')
+            if key is None:
+                result.append(notification)
+                continue
+            if key in latest:
+                self.stats['coalesced'] += 1
+            latest[key] = notification
+        for key, notification in latest.items():
+            delivered = self._delivered.get((recipient, key), _MISSING)
+            if delivered is not _MISSING and delivered == notification.get('state'):
+                self.stats['suppressed'] += 1
+                continue
+            result.append(notification)
+        return result
+
+    # ===== 발송/재시도 =====
+
+    def _send(self, recipient: Recipient, notifications: List[Dict], attempt: int = 0):
+        channel, target = recipient
+        sink = self.sinks.get(channel)
+        if sink is None:
+            self.stats['dropped'] += len(notifications)
+            logger.error(f"알 수 없는 알림 채널: {channel}")
+            return
+        try:
+            sink.send(target, notifications)
+        except Exception as e:
+            self.last_error = f"{channel}: {e}"
+            if not getattr(sink, 'retry', True) or attempt >= self.max_retries:
+                self.stats['failed'] += len(notifications)
+                logger.error(f"알림 발송 실패 ({channel}, {attempt + 1}회 시도): {e}")
+                return
+            delay = min(self.backoff ** (attempt + 1), self.max_backoff) * random.uniform(0.8, 1.2)
+            with self._lock:
+                self._retry_seq += 1
+                heapq.heappush(self._retries, (time.time() + delay, self._retry_seq, attempt + 1,
+                                               recipient, notifications))
+            self.stats['retried'] += 1
+            logger.warning(f"알림 발송 실패 ({channel}) - {delay:.0f}초 후 재시도: {e}")
+            return
+
+        self.stats['sent'] += len(notifications)
+        self.stats['batches'] += 1
+        for notification in notifications:
+            if notification.get('key') is not None:
+                self._delivered[(recipient, notification['key'])] = notification.get('state')
+
+    def _next_retry_delay(self) -> float:
+        with self._lock:
+            if not self._retries:
+                return 1.0
+            return min(max(self._retries[0][0] - time.time(), 0.05), 1.0)
+
+    def _run_due_retries(self):
+        while True:
+            with self._lock:
+                if not self._retries or self._retries[0][0] > time.time():
+                    return
+                _, _, attempt, recipient, notifications = heapq.heappop(self._retries)
+            self._send(recipient, notifications, attempt)
+
+    def _run(self):
+        while not self._stop.is_set():
+            batches = {}
+            try:
+                batches = self._collect()
+                for recipient, notifications in batches.items():
+                    notifications = self._coalesce(recipient, notifications)
+                    if notifications:
+                        self._send(recipient, notifications)
+                self._run_due_retries()
+            except Exception as e:
+                logger.error(f"알림 디스패처 오류: {e}")
+            finally:
+                for _ in range(sum(len(notifications) for notifications in batches.values())):
+                    self._queue.task_done()
+
+    def flush(self, timeout: float = 10) -> bool:
+        """큐와 재시도 대기열이 빌 때까지 대기 (종료 직전 등)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._lock:
+                pending_retries = bool(self._retries)
+            if self._queue.unfinished_tasks == 0 and not pending_retries:
+                return True
+            time.sleep(0.1)
+        return False
+
+    def start(self):
+        """디스패처 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self) -> Dict:
+        with self._lock:
+            pending_retries = len(self._retries)
+        return {
+            'recipients': [f"{channel}:{target}" if target else channel for channel, target in self.recipients],
+            'queue_size': self._queue.qsize(),
+            'pending_retries': pending_retries,
+            'stats': dict(self.stats),
+            'last_error': self.last_error,
+        }
+
+
+_MISSING = object()
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    """프로세스 공용 디스패처"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+            # 단발 실행 스크립트가 끝나기 전에 대기 중인 알림 발송
+            atexit.register(_dispatcher.flush)
+        return _dispatcher
@@ -0,0 +1,118 @@
+"""
+OAuth provider metadata cache
+
+authlib loads the OpenID discovery document and the JWKS lazily, once per
+process, so every freshly forked or restarted worker paid two extra round
+trips on its first login callback. This keeps both in a small JSON file
+(shared by all workers, written atomically) with a TTL, and registers
+clients whose metadata loads from that file first.
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+
+from authlib.integrations.flask_client import FlaskOAuth2App
+
+logger = logging.getLogger(__name__)
+
+OAUTH_CACHE_PATH = os.getenv('OAUTH_CACHE_PATH', 'oauth_metadata.json')
+OAUTH_METADATA_TTL = float(os.getenv('OAUTH_METADATA_TTL', 24 * 3600))
+
+
+class ProviderMetadataCache:
+    """Discovery documents and key sets per provider, persisted to disk"""
+
+    def __init__(self, path=OAUTH_CACHE_PATH, ttl=OAUTH_METADATA_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"OAuth metadata cache unreadable ({self.path}): {e}")
+            return {}
+
+    def get(self, name):
+        """Cached metadata for provider, or None if missing or older than ttl"""
+        metadata = self._read().get(name)
+        if not metadata or time.time() - metadata.get('_loaded_at', 0) > self.ttl:
+            return None
+        return metadata
+
+    def put(self, name, metadata):
+        with self._lock:
+            data = self._read()
+            data[name] = metadata
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"OAuth metadata cache write failed ({self.path}): {e}")
+
+
+_default_cache = ProviderMetadataCache()
+
+
+class CachedOAuth2App(FlaskOAuth2App):
+    """OAuth2 client whose server metadata and JWKS go through ProviderMetadataCache
+
+    Pass as ``client_cls`` to ``OAuth.register``.
+    """
+
+    metadata_cache = _default_cache
+
+    def _metadata_expired(self):
+        loaded_at = self.server_metadata.get('_loaded_at')
+        return loaded_at is not None and time.time() - loaded_at > self.metadata_cache.ttl
+
+    def load_server_metadata(self):
+        if not self._server_metadata_url:
+            return self.server_metadata
+        if '_loaded_at' not in self.server_metadata or self._metadata_expired():
+            cached = self.metadata_cache.get(self.name)
+            if cached is not None:
+                self.server_metadata.update(cached)
+            else:
+                # Refetch; the previous copy stays usable if the provider is unreachable
+                previous = dict(self.server_metadata)
+                self.server_metadata.pop('_loaded_at', None)
+                self.server_metadata.pop('jwks', None)
+                try:
+                    super().load_server_metadata()
+                except Exception:
+                    if '_loaded_at' not in previous:
+                        raise
+                    self.server_metadata.update(previous)
+                    logger.warning(f"{self.name} metadata refresh failed, keeping cached copy")
+                    return self.server_metadata
+                self.metadata_cache.put(self.name, dict(self.server_metadata))
+        return self.server_metadata
+
+    def fetch_jwk_set(self, force=False):
+        had_keys = 'jwks' in self.load_server_metadata()
+        jwk_set = super().fetch_jwk_set(force)
+        if force or not had_keys:
+            # New or rotated keys: share them with the other workers
+            self.metadata_cache.put(self.name, dict(self.server_metadata))
+        return jwk_set
+
+    def prefetch(self):
+        """Load metadata and keys now (from the cache file when fresh)"""
+        if not self._server_metadata_url:
+            return
+        try:
+            self.load_server_metadata()
+            if self.server_metadata.get('jwks_uri'):
+                self.fetch_jwk_set()
+        except Exception as e:
+            logger.warning(f"{self.name} metadata prefetch failed: {e}")
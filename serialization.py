@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+JSON 직렬화 (스냅샷 파일 저장 + HTTP 응답 공용)
+- orjson 설치 시: NumPy 스칼라/배열, datetime을 인코더가 직접 처리 (OPT_SERIALIZE_NUMPY) - 한 번에 bytes로
+- 없으면 표준 json + default 훅 - numpy 값만 그때그때 바꾸고 dict/list는 다시 만들지 않음
+
+수집 결과(np.bool_, np.float64 섞인 dict)를 변환하지 않고 그대로 저장/응답에 넘기면 됨
+"""
+
+import json
+from datetime import date, datetime
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 - 없으면 표준 json
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def default(obj):
+    """인코더가 모르는 값 변환 (numpy 스칼라/배열, datetime, 그 외 str)"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """obj -> JSON bytes (UTF-8, 한글 그대로)"""
+    if orjson:
+        return orjson.dumps(obj, default=default,
+                            option=ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+    return json.dumps(obj, default=default, ensure_ascii=False,
+                      indent=2 if indent else None,
+                      separators=None if indent else (',', ':')).encode('utf-8')
+
+
+def loads(data):
+    """JSON 문자열/bytes -> 객체"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def write(path: str, obj, indent: bool = True):
+    """JSON 파일 저장 (dashboard_data.json 등)"""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent=indent))
+
+
+def read(path: str):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask jsonify()/app.json 을 같은 인코더로 (app.json = JSONProvider(app))"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
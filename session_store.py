@@ -0,0 +1,251 @@
+"""
+Shared session and user store
+
+SQLite-backed (one local file, no external services) so every gunicorn
+worker sees the same logins, with an in-process LRU in front of it.
+
+Session records are immutable: any change to a session is written under a
+new session id (and the cookie is reissued), so a cached record can never
+be stale and cache hits need no coherence check. A cache miss costs one
+SELECT that also joins the logged-in user's row, which primes the user
+cache for Flask-Login's user_loader.
+"""
+
+import os
+import json
+import time
+import secrets
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import timedelta
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+SESSION_DB_PATH = os.getenv('SESSION_DB_PATH', 'sessions.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    sid TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    user_id TEXT,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires);
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class LRUCache:
+    """Thread-safe LRU with an optional per-entry TTL"""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] < time.time()):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, expires=None):
+        if expires is None and self.ttl is not None:
+            expires = time.time() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def stats(self):
+        return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+class SessionStore:
+    """Sessions and user profiles in one SQLite file"""
+
+    def __init__(self, path=SESSION_DB_PATH, lifetime=timedelta(days=7),
+                 cache_size=4096, user_ttl=300, purge_interval=3600, rotate_grace=60):
+        self.path = path
+        self.lifetime = lifetime.total_seconds() if isinstance(lifetime, timedelta) else lifetime
+        self.purge_interval = purge_interval
+        self.rotate_grace = rotate_grace
+        self.sessions = LRUCache(cache_size)
+        self.users = LRUCache(cache_size, ttl=user_ttl)
+        self._local = threading.local()
+        self._last_purge = 0
+
+    @contextmanager
+    def _connect(self):
+        # One connection per thread, reused across requests. Opened on first use
+        # (never in the preloading gunicorn master) and per process after a fork.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    # ----- sessions -----
+
+    def load_session(self, sid):
+        """Return the serialized session data for sid, or None"""
+        cached = self.sessions.get(sid)
+        if cached is not None:
+            return cached
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT s.data, s.expires, s.user_id, u.data FROM sessions s "
+                "LEFT JOIN users u ON u.id = s.user_id WHERE s.sid = ? AND s.expires > ?",
+                (sid, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        data, expires, user_id, user_data = row
+        self.sessions.put(sid, data, expires)
+        if user_data is not None:
+            self.users.put(user_id, json.loads(user_data))
+        return data
+
+    def save_session(self, data, user_id=None, replaces=None):
+        """Store data under a fresh session id; the replaced id expires after a short grace"""
+        now = time.time()
+        sid = secrets.token_urlsafe(32)
+        expires = now + self.lifetime
+        with self._connect() as conn:
+            conn.execute("INSERT INTO sessions (sid, data, user_id, expires) VALUES (?, ?, ?, ?)",
+                         (sid, data, user_id, expires))
+            if replaces:
+                # Requests already in flight with the old cookie still resolve
+                conn.execute("UPDATE sessions SET expires = MIN(expires, ?) WHERE sid = ?",
+                             (now + self.rotate_grace, replaces))
+            if now - self._last_purge > self.purge_interval:
+                conn.execute("DELETE FROM sessions WHERE expires <= ?", (now,))
+                self._last_purge = now
+        self.sessions.put(sid, data, expires)
+        if replaces:
+            self.sessions.pop(replaces)
+        return sid, expires
+
+    def delete_session(self, sid):
+        self.sessions.pop(sid)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    # ----- users -----
+
+    def get_user(self, user_id):
+        """User profile dict, or None"""
+        cached = self.users.get(user_id)
+        if cached is not None:
+            return cached
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM users WHERE id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+        user = json.loads(row[0])
+        self.users.put(user_id, user)
+        return user
+
+    def save_user(self, user):
+        """Insert or update a user profile dict (must contain 'id')"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO users (id, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (user['id'], json.dumps(user, ensure_ascii=False), time.time())
+            )
+        self.users.put(user['id'], user)
+
+    def stats(self):
+        return {'sessions_cache': self.sessions.stats(), 'users_cache': self.users.stats()}
+
+
+class StoredSession(CallbackDict, SessionMixin):
+    """Server-side session; sid is None until first saved"""
+
+    def __init__(self, initial=None, sid=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.modified = False
+
+
+class SQLiteSessionInterface(SessionInterface):
+    """Flask session interface backed by SessionStore
+
+    Visitors whose session stays empty never get a row or a cookie.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.store.load_session(sid)
+            if data is not None:
+                try:
+                    return StoredSession(self.serializer.loads(data), sid=sid)
+                except ValueError:
+                    pass
+        return StoredSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and session.sid:
+                self.store.delete_session(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+        if not session.modified:
+            return
+
+        sid, _ = self.store.save_session(self.serializer.dumps(dict(session)),
+                                         user_id=session.get('_user_id'), replaces=session.sid)
+        response.set_cookie(
+            name, sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add('Cookie')
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+수집 스레드 -> 요청 스레드 스냅샷 전달 (copy-on-write)
+- Snapshot: 한 사이클의 결과 (버전, 자산별 데이터, 히스토리 끝 위치) - 발행 후에는 바꾸지 않음
+- SnapshotStore.publish(): 새 Snapshot을 만들어 참조 하나만 교체 -> 읽는 쪽은 잠금 없이 current()
+- 히스토리는 history_ring.HistoryRing (열 단위 mmap 링) - 스냅샷은 끝 위치만 들고 있다가 읽을 때 구간을 꺼냄
+
+쓰기는 수집 사이클 하나만 (dashboard_with_status.CycleFlight가 보장), 읽기는 여러 요청 스레드
+"""
+
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from history_ring import HistoryRing
+
+
+class Snapshot:
+    """발행된 스냅샷 (불변) - 자산별 데이터 dict도 발행 후 수정하지 않는다"""
+
+    __slots__ = ('version', 'assets', 'default_asset', 'history_end', 'published_at', '_ring')
+
+    def __init__(self, version: int, assets: Dict, default_asset: str, ring: HistoryRing,
+                 history_end: int, published_at: Optional[float] = None):
+        self.version = version
+        self.assets = MappingProxyType(assets)
+        self.default_asset = default_asset
+        self.history_end = history_end
+        self.published_at = published_at
+        self._ring = ring
+
+    @property
+    def data(self) -> Dict:
+        """기본 자산(BTC) 스냅샷 (없으면 빈 dict)"""
+        return self.assets.get(self.default_asset, {})
+
+    def asset(self, asset: Optional[str] = None) -> Optional[Dict]:
+        """자산별 스냅샷 (asset 미지정 시 기본 자산, 모르는 자산이면 None)"""
+        asset = (asset or self.default_asset).upper()
+        if asset == self.default_asset:
+            return self.data
+        return self.assets.get(asset)
+
+    def history(self, since=None, until=None, limit: Optional[int] = None) -> List[Dict]:
+        """이 스냅샷 시점까지의 히스토리 (since/until은 ISO 시각 또는 epoch, limit은 최근 N개)"""
+        return self._ring.records(self.history_end, since, until, limit)
+
+    def history_json(self, since=None, until=None, limit: Optional[int] = None) -> Iterator[str]:
+        """history()와 같은 구간을 JSON 텍스트 조각으로 (응답 스트리밍용)"""
+        return self._ring.iter_json(self.history_end, since, until, limit)
+
+    def history_columns(self, since=None, until=None, limit: Optional[int] = None) -> Dict[str, list]:
+        """history()와 같은 구간을 필드별 배열로 (시각은 epoch 초)"""
+        return self._ring.column_lists(self.history_end, since, until, limit)
+
+    def history_window(self, since=None, until=None, limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """history()와 같은 구간의 원본 열 배열 (Arrow 등 바이너리 인코딩용)"""
+        return self._ring.window(self.history_end, since, until, limit)
+
+
+class SnapshotStore:
+    """최신 스냅샷 참조 하나 + 히스토리 링"""
+
+    def __init__(self, default_asset: str, ring: Optional[HistoryRing] = None):
+        self.default_asset = default_asset
+        self.ring = ring or HistoryRing()
+        self._current = Snapshot(0, {}, default_asset, self.ring, self.ring.count)
+
+    def current(self) -> Snapshot:
+        """잠금 없이 읽기 - 돌려받은 스냅샷은 이후 발행과 무관하게 일관됨"""
+        return self._current
+
+    def publish(self, version: int, assets: Dict, history_point: Optional[Dict] = None,
+                published_at: Optional[float] = None) -> Snapshot:
+        """새 스냅샷 발행 (수집 스레드 전용) - 이번에 빠진 자산은 이전 값 유지"""
+        previous = self._current
+        end = self.ring.append(history_point) if history_point is not None else self.ring.count
+        snapshot = Snapshot(version, {**previous.assets, **assets}, self.default_asset,
+                            self.ring, end, published_at)
+        self._current = snapshot
+        return snapshot
+
+    def restore(self, data: Optional[Dict], history: List[Dict] = ()) -> Snapshot:
+        """마지막 저장 스냅샷으로 시작 (버전 0) - 링이 비어 있으면 예전 JSON 히스토리를 옮김"""
+        self.ring.import_records(list(history))
+        assets = {self.default_asset: data} if data else {}
+        self._current = Snapshot(0, assets, self.default_asset, self.ring, self.ring.count)
+        return self._current
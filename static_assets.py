@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+정적 페이지 파이프라인 (템플릿 셸 사전 렌더링 + 사전 압축)
+- 템플릿을 프로세스당 한 번 렌더링 (gunicorn 웜스타트면 마스터에서 한 번 -> 워커가 공유)
+- 인라인 <style>/<script> 블록은 내용 해시가 붙은 /assets/<이름>.<해시>.css|js 로 분리
+  -> Cache-Control: immutable 1년 (내용이 바뀌면 이름이 바뀜)
+- 남은 HTML 셸은 ETag로 재검증 (no-cache) - 바뀌지 않았으면 304
+- 모두 gzip/brotli로 미리 압축해 두고 Accept-Encoding에 맞춰 그대로 보냄 (brotli는 설치 시)
+
+데이터 API(/api/*)만 캐시 금지 헤더 유지
+"""
+
+import gzip
+import hashlib
+import re
+import threading
+from typing import Dict
+
+from flask import Response, abort, current_app, request
+
+ASSET_PREFIX = '/assets/'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'private, no-cache'  # 로그인 뒤 페이지일 수 있어 공유 캐시에는 두지 않음
+MIN_COMPRESS_SIZE = 256  # 이보다 작으면 압축 이득이 없음
+ENCODINGS = ('br', 'gzip')  # 선호 순서
+
+INLINE_BLOCK = re.compile(r'<(style|script)>(.*?)</\1>', re.S)  # 속성 없는 인라인 블록만 (src 있는 script 제외)
+ASSET_TYPES = {
+    'style': ('css', 'text/css; charset=utf-8'),
+    'script': ('js', 'application/javascript; charset=utf-8'),
+}
+
+_lock = threading.Lock()
+
+
+def _brotli():
+    try:
+        import brotli  # 선택 의존성 - 없으면 gzip만
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress(body: bytes) -> Dict[str, bytes]:
+    """인코딩별 본문 (identity + gzip + br)"""
+    bodies = {'identity': body}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        bodies['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        brotli = _brotli()
+        if brotli:
+            bodies['br'] = brotli.compress(body, quality=11)
+    return bodies
+
+
+class Asset:
+    """미리 압축해 둔 응답 본문 하나"""
+
+    __slots__ = ('name', 'mimetype', 'digest', 'bodies')
+
+    def __init__(self, name: str, mimetype: str, body: bytes):
+        self.name = name
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(body).hexdigest()[:12]
+        self.bodies = compress(body)
+
+    def sizes(self) -> Dict[str, int]:
+        return {encoding: len(body) for encoding, body in self.bodies.items()}
+
+
+class PageBundle:
+    """템플릿 하나 -> HTML 셸 + 해시 붙은 CSS/JS"""
+
+    def __init__(self, app, template: str):
+        stem = template.rsplit('.', 1)[0]
+        html = app.jinja_env.get_template(template).render()
+        self.assets: Dict[str, Asset] = {}
+
+        def extract(match):
+            ext, mimetype = ASSET_TYPES[match.group(1)]
+            body = match.group(2).strip().encode('utf-8') + b'\n'
+            name = f'{stem}.{hashlib.sha256(body).hexdigest()[:12]}.{ext}'
+            self.assets[name] = Asset(name, mimetype, body)
+            url = ASSET_PREFIX + name
+            if ext == 'css':
+                return f'<link rel="stylesheet" href="{url}">'
+            return f'<script src="{url}"></script>'
+
+        shell = INLINE_BLOCK.sub(extract, html)
+        self.shell = Asset(template, 'text/html; charset=utf-8', shell.encode('utf-8'))
+
+    def status(self) -> Dict:
+        return {'shell': self.shell.sizes(),
+                'assets': {name: asset.sizes() for name, asset in self.assets.items()}}
+
+
+def bundle(app, template: str) -> PageBundle:
+    """템플릿 번들 (앱당 한 번 생성 후 재사용)"""
+    bundles = app.extensions['static_assets']
+    if template not in bundles:
+        with _lock:
+            if template not in bundles:
+                bundles[template] = PageBundle(app, template)
+    return bundles[template]
+
+
+def send(asset: Asset, cache_control: str) -> Response:
+    """Accept-Encoding에 맞는 압축본 + ETag (If-None-Match 일치 시 304)"""
+    encoding = next((e for e in ENCODINGS if e in asset.bodies and request.accept_encodings[e]), 'identity')
+    etag = asset.digest if encoding == 'identity' else f'{asset.digest}-{encoding}'
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(asset.bodies[encoding], mimetype=asset.mimetype)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def page(template: str) -> Response:
+    """사전 렌더링된 HTML 셸 (render_template 대신)"""
+    return send(bundle(current_app, template).shell, REVALIDATE)
+
+
+def serve_asset(name: str) -> Response:
+    """해시 붙은 CSS/JS - 셸을 다른 워커가 줬어도 여기서 같은 번들을 만들어 찾음"""
+    for page_bundle in build(current_app).values():
+        if name in page_bundle.assets:
+            return send(page_bundle.assets[name], IMMUTABLE)
+    abort(404)
+
+
+def build(app) -> Dict[str, PageBundle]:
+    """등록된 템플릿 전부 렌더링/압축 (웜스타트에서 미리 호출)"""
+    for template in app.config['STATIC_ASSET_TEMPLATES']:
+        bundle(app, template)
+    return app.extensions['static_assets']
+
+
+def register(app, templates):
+    """/assets/<name> 라우트 등록 - templates는 page()로 내보낼 템플릿 (첫 요청 때 렌더링)"""
+    app.config['STATIC_ASSET_TEMPLATES'] = tuple(templates)
+    app.extensions['static_assets'] = {}
+    app.add_url_rule(ASSET_PREFIX + '<name>', 'static_asset', serve_asset)
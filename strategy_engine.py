@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+통합 전략 엔진
+- 지표 모듈(indicators.INDICATORS) + 공유 데이터 계층(market_data.MarketData)
+- 기존 네 개 시스템은 PROFILES의 설정(가중치/임계값/지표 변형)으로 표현
+- 여러 프로필을 한 프로세스에서 한 번의 데이터 수집으로 함께 평가
+- 지표는 입력/다른 지표를 의존성으로 갖는 DAG 노드 - 입력이 바뀐 노드만 재계산
+- 엔진은 자산별 (BTC, ETH, ...) - 같은 MarketData를 공유해 현물 가격은 배치 조회
+
+사용법:
+    python strategy_engine.py [halving free complete alert] [--asset ETH]
+"""
+
+import sys
+import time
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+import metrics
+from indicators import INDICATORS, calculate_rsi
+from market_data import DEFAULT_ASSET, MarketData, get_default_market
+
+logger = logging.getLogger(__name__)
+
+_FREE_HEAT = {
+    'pi_cycle_top': {'weight': 0.30},
+    'nupl': {'weight': 0.25, 'above': 0.75},
+    'rsi_weekly': {'weight': 0.20, 'above': 85},
+    'google_trends': {'weight': 0.15, 'above': 0.7},
+    'kimchi_premium': {'weight': 0.10, 'above': 10},
+}
+
+# 프로필: 그룹(heat/accumulation)별 지표 -> weight, 임계값(above/below), 지표 파라미터
+PROFILES = {
+    # bitcoin_alert_system.BitcoinIndicators - 가격 구간 NUPL, 원시 트렌드, 고정 환율
+    'alert': {
+        'heat': {
+            'pi_cycle_top': {'weight': 0.30, 'params': {'buffer': 1.0}},
+            'nupl': {'weight': 0.25, 'above': 0.75, 'params': {'method': 'price_tiers'}},
+            'rsi_weekly': {'weight': 0.20, 'above': 85},
+            'google_trends': {'weight': 0.15, 'above': 0.8, 'params': {'method': 'raw'}},
+            'kimchi_premium': {'weight': 0.10, 'above': 10, 'params': {'fixed_fx': 1350}},
+        },
+    },
+    # bitcoin_alert_free.FreebitcoinIndicators
+    'free': {
+        'heat': _FREE_HEAT,
+    },
+    # bitcoin_complete_system.BitcoinStrategySystem
+    'complete': {
+        'heat': _FREE_HEAT,
+        'accumulation': {
+            'fear_greed': {'weight': 0.40, 'below': 30},
+            'exchange_balance': {'weight': 0.35, 'above': 0.3},
+            'long_term_holder': {'weight': 0.25, 'above': 0.6},
+        },
+    },
+    # bitcoin_halving_system.BitcoinHalvingStrategy - 반감기 30% 제외한 70%를 지표에 배분
+    'halving': {
+        'heat': {
+            'pi_cycle_top': {'weight': 0.21},
+            'nupl': {'weight': 0.175, 'above': 0.75},
+            'rsi_weekly': {'weight': 0.14, 'above': 85},
+            'google_trends': {'weight': 0.105, 'above': 0.7},
+            'kimchi_premium': {'weight': 0.07, 'above': 10},
+        },
+        'accumulation': {
+            'fear_greed': {'weight': 0.28, 'below': 30},
+            'exchange_balance': {'weight': 0.245, 'above': 0.3},
+            'long_term_holder': {'weight': 0.175, 'above': 0.6},
+        },
+    },
+}
+
+GROUPS = ('heat', 'accumulation')
+
+
+def is_triggered(value, spec: Dict) -> bool:
+    """프로필 임계값 기준 발동 여부"""
+    if 'above' in spec:
+        return bool(value > spec['above'])
+    if 'below' in spec:
+        return bool(value < spec['below'])
+    return bool(value)
+
+
+def _memo_key(name: str, params: Dict):
+    return name, tuple(sorted(params.items()))
+
+
+def _changed(old, new) -> bool:
+    if old is new:
+        return False
+    try:
+        return bool(old != new)
+    except (TypeError, ValueError):
+        return True
+
+
+class IndicatorGraph:
+    """지표 의존성 그래프 (증분 재계산)
+
+    - 원천 입력(daily_closes, spot_usd, fx, fear_greed, trends 등)은 값이 바뀔 때마다 버전 증가
+    - 노드 = (지표, 파라미터). 의존 입력/지표 버전이 마지막 계산 때와 같으면 저장된 값 재사용
+    - 지표 depends에 다른 지표 이름을 넣으면 그 노드 값을 입력으로 받음
+    - 노드별 계산 시간/재계산/재사용 횟수 기록
+    """
+
+    def __init__(self):
+        self.input_versions = {}
+        self._input_values = {}
+        self._nodes = {}
+        self._timings = {}
+        self._lock = threading.RLock()
+
+    def update_inputs(self, data: Dict) -> list:
+        """원천 입력 반영 - 값이 바뀐 입력만 버전 증가, 바뀐 키 목록 반환"""
+        changed = []
+        with self._lock:
+            for key, value in data.items():
+                if key not in self._input_values or _changed(self._input_values[key], value):
+                    self.input_versions[key] = self.input_versions.get(key, 0) + 1
+                    changed.append(key)
+                self._input_values[key] = value
+        return changed
+
+    def resolve(self, name: str, params: Optional[Dict] = None, data: Optional[Dict] = None):
+        """노드 값 조회 (의존성이 그대로면 캐시값, 아니면 재계산)"""
+        params = params or {}
+        with self._lock:
+            return self._resolve(name, params, data if data is not None else self._input_values)[0]
+
+    def _resolve(self, name: str, params: Dict, data: Dict):
+        indicator = INDICATORS[name]
+        inputs = {}
+        deps = {}
+        for dep in indicator.inputs:
+            inputs[dep] = data[dep]
+            deps[dep] = self.input_versions.get(dep, 0)
+        for dep in indicator.depends:
+            inputs[dep], deps[('node', dep)] = self._resolve(dep, {}, data)
+
+        key = _memo_key(name, params)
+        label = self._label(key)
+        timing = self._timings.setdefault(label, {'runs': 0, 'hits': 0, 'last_ms': 0.0, 'total_ms': 0.0})
+        node = self._nodes.get(key)
+        if node is not None and node['deps'] == deps:
+            timing['hits'] += 1
+            return node['value'], node['version']
+
+        started = time.perf_counter()
+        value = indicator(inputs, **params)
+        elapsed = time.perf_counter() - started
+        metrics.observe('indicator', elapsed, indicator=label)
+        elapsed_ms = elapsed * 1000
+        timing['runs'] += 1
+        timing['last_ms'] = elapsed_ms
+        timing['total_ms'] += elapsed_ms
+
+        version = 1
+        if node is not None:
+            version = node['version'] + 1 if _changed(node['value'], value) else node['version']
+        self._nodes[key] = {'value': value, 'deps': deps, 'version': version}
+        return value, version
+
+    @staticmethod
+    def _label(key) -> str:
+        name, params = key
+        if not params:
+            return name
+        return f"{name}({', '.join(f'{k}={v}' for k, v in params)})"
+
+    def timings(self) -> Dict[str, Dict]:
+        """노드별 계산 시간 스냅샷"""
+        with self._lock:
+            return {
+                label: {**timing, 'last_ms': round(timing['last_ms'], 3), 'total_ms': round(timing['total_ms'], 3)}
+                for label, timing in self._timings.items()
+            }
+
+    def invalidate(self):
+        """저장된 노드 값 전체 폐기 (강제 재계산)"""
+        with self._lock:
+            self._nodes.clear()
+
+
+class StrategyEngine:
+    """프로필 기반 지표 평가 엔진"""
+
+    def __init__(self, market: Optional[MarketData] = None, asset: str = DEFAULT_ASSET):
+        self.market = market or get_default_market()
+        self.asset = asset
+        self.graph = IndicatorGraph()
+        self.input_loaders = {
+            'spot_usd': lambda: self.market.get_price_usd(asset),
+            'spot_krw': lambda: self.market.get_price_krw(asset),
+            'fx': self.market.get_exchange_rate,
+            'daily_closes': lambda: self.market.get_daily_closes(asset=asset),
+            'fear_greed': self.market.get_fear_greed,
+            'trends': lambda: self.market.get_trends(asset),
+        }
+
+    def indicator_inputs(self, name: str) -> set:
+        """지표가 (다른 지표를 거쳐) 의존하는 원천 입력"""
+        indicator = INDICATORS[name]
+        inputs = set(indicator.inputs)
+        for dep in indicator.depends:
+            inputs |= self.indicator_inputs(dep)
+        return inputs
+
+    def required_inputs(self, profile: Dict) -> set:
+        """프로필이 사용하는 지표들의 입력 합집합"""
+        inputs = set()
+        for group in GROUPS:
+            for name in profile.get(group, {}):
+                inputs |= self.indicator_inputs(name)
+        return inputs
+
+    def load_inputs(self, names: Iterable[str]) -> Dict:
+        """입력 조회 (MarketData TTL 캐시 경유) 후 그래프 입력 버전 갱신"""
+        data = {}
+        for name in names:
+            with metrics.span('input', input=name, asset=self.asset):
+                data[name] = self.input_loaders[name]()
+        self.graph.update_inputs(data)
+        return data
+
+    def compute(self, name: str, params: Optional[Dict] = None, data: Optional[Dict] = None):
+        """단일 지표 계산 (입력이 그대로면 그래프에 저장된 값)"""
+        if data is None:
+            data = self.load_inputs(self.indicator_inputs(name))
+        return self.graph.resolve(name, params, data)
+
+    def node_timings(self) -> Dict[str, Dict]:
+        return self.graph.timings()
+
+    def evaluate(self, profile, data: Optional[Dict] = None) -> Dict:
+        """프로필 평가 -> {'heat'|'accumulation': {'score', 'indicators'}}
+
+        score는 발동 지표 가중치 합 * 100 (프로필별 보정 전 값)
+        """
+        if isinstance(profile, str):
+            profile = PROFILES[profile]
+        if data is None:
+            data = self.load_inputs(self.required_inputs(profile))
+        else:
+            self.graph.update_inputs(data)
+
+        result = {}
+        for group in GROUPS:
+            score = 0
+            indicators = {}
+            for name, spec in profile.get(group, {}).items():
+                value = self.compute(name, spec.get('params', {}), data)
+                triggered = is_triggered(value, spec)
+                if triggered:
+                    score += spec['weight']
+                indicators[name] = {'triggered': triggered, 'value': value}
+            result[group] = {'score': score * 100, 'indicators': indicators}
+        return result
+
+    def evaluate_all(self, profile_names: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """여러 프로필을 한 번의 데이터 수집으로 평가 (같은 지표/파라미터는 한 번만 계산)"""
+        profile_names = list(profile_names or PROFILES)
+        needed = set()
+        for name in profile_names:
+            needed |= self.required_inputs(PROFILES[name])
+        data = self.load_inputs(needed)
+        return {name: self.evaluate(PROFILES[name], data) for name in profile_names}
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(asset: str = DEFAULT_ASSET) -> StrategyEngine:
+    """자산별 프로세스 공용 엔진 (모두 공용 MarketData 사용)"""
+    with _engines_lock:
+        if asset not in _engines:
+            _engines[asset] = StrategyEngine(get_default_market(), asset)
+        return _engines[asset]
+
+
+def get_default_engine() -> StrategyEngine:
+    """프로세스 공용 BTC 엔진"""
+    return get_engine(DEFAULT_ASSET)
+
+
+class ProfileStrategy:
+    """프로필 위에 얹는 얇은 전략 클래스 - 기존 시스템 클래스들의 공통 API"""
+
+    PROFILE = None
+
+    def __init__(self, engine: Optional[StrategyEngine] = None):
+        self.engine = engine or get_default_engine()
+        self.market = self.engine.market
+        self.profile = PROFILES[self.PROFILE]
+
+    def weights(self, group: str) -> Dict[str, float]:
+        """그룹별 지표 가중치"""
+        return {name: spec['weight'] for name, spec in self.profile.get(group, {}).items()}
+
+    def indicator_params(self, name: str) -> Dict:
+        for group in GROUPS:
+            if name in self.profile.get(group, {}):
+                return self.profile[group][name].get('params', {})
+        return {}
+
+    def indicator(self, name: str):
+        """프로필 파라미터로 단일 지표 계산"""
+        return self.engine.compute(name, self.indicator_params(name))
+
+    def evaluate(self) -> Dict:
+        return self.engine.evaluate(self.profile)
+
+    # ===== 공유 업스트림 상태 =====
+
+    @property
+    def breakers(self):
+        return self.market.breakers
+
+    @property
+    def cached_values(self):
+        return self.market.cached_values
+
+    @property
+    def asset(self) -> str:
+        return self.engine.asset
+
+    @property
+    def trends_worker(self):
+        return self.market.trends_workers.get(self.engine.asset)
+
+    def start_trends_worker(self, interval: float = 900):
+        return self.market.start_trends_worker(interval, self.engine.asset)
+
+    def rate_limit(self, api_name: str):
+        self.market.rate_limit(api_name)
+
+    # ===== 알림 =====
+
+    @property
+    def alert_state(self):
+        """레벨 변경 알림 상태 (히스테리시스/체류 시간, 재시작 후에도 유지)"""
+        if getattr(self, '_alert_state', None) is None:
+            from alert_state import AlertState
+            self._alert_state = AlertState(f"{self.PROFILE}:{self.engine.asset}")
+        return self._alert_state
+
+    def send_notification(self, title: str, message: str, key: Optional[str] = None, state=None):
+        """알림 큐에 넣고 바로 반환 (발송/재시도는 notifications 디스패처 스레드)
+
+        key/state를 주면 같은 key의 연속 알림은 마지막 상태로 합쳐지고,
+        마지막 발송 상태로 되돌아온 경우(레벨 깜빡임)는 발송되지 않는다.
+        """
+        from notifications import get_dispatcher
+        key = f"{self.PROFILE}:{self.engine.asset}:{key}" if key else None
+        get_dispatcher().notify(title, message, key=key, state=state)
+        logger.info(f"알림 예약: {title}")
+
+    # ===== 공통 가격 조회 함수 =====
+
+    def get_bitcoin_price_usd(self) -> float:
+        """USD 가격 조회 (엔진 자산 기준)"""
+        return self.market.get_price_usd(self.engine.asset)
+
+    def get_bitcoin_price_krw(self) -> float:
+        """KRW 가격 조회 (엔진 자산 기준)"""
+        return self.market.get_price_krw(self.engine.asset)
+
+    def get_exchange_rate(self) -> float:
+        """USD/KRW 환율"""
+        return self.market.get_exchange_rate()
+
+    def get_historical_prices(self, days: int) -> list:
+        """과거 가격 데이터"""
+        return self.market.get_daily_closes(days, self.engine.asset)
+
+    # ===== 지표 =====
+
+    def calculate_rsi(self, prices: list, period: int = 14) -> float:
+        """RSI 계산"""
+        return calculate_rsi(prices, period)
+
+    def get_weekly_rsi(self) -> float:
+        """주간 RSI"""
+        return self.indicator('rsi_weekly')
+
+    def check_pi_cycle_top(self) -> bool:
+        """Pi Cycle Top"""
+        return self.indicator('pi_cycle_top')
+
+    def estimate_nupl(self) -> float:
+        """NUPL 추정"""
+        return self.indicator('nupl')
+
+    def get_google_trends_score(self) -> float:
+        """구글 트렌드"""
+        return self.indicator('google_trends')
+
+    def calculate_kimchi_premium(self) -> float:
+        """김치 프리미엄"""
+        return self.indicator('kimchi_premium')
+
+    def get_fear_greed_index(self) -> int:
+        """Fear & Greed Index 조회"""
+        return self.indicator('fear_greed')
+
+    def estimate_exchange_balance_trend(self) -> float:
+        """거래소 BTC 잔고 추세 추정"""
+        return self.indicator('exchange_balance')
+
+    def estimate_long_term_holder_accumulation(self) -> float:
+        """장기 보유자 축적 추정"""
+        return self.indicator('long_term_holder')
+
+
+def main():
+    """여러 프로필을 한 번의 데이터 수집으로 평가해 출력"""
+    args = sys.argv[1:]
+    asset = DEFAULT_ASSET
+    if '--asset' in args:
+        index = args.index('--asset')
+        asset = args[index + 1].upper()
+        del args[index:index + 2]
+    engine = get_engine(asset)
+    names = args or list(PROFILES)
+    results = engine.evaluate_all(names)
+
+    print("=" * 70)
+    print(f"자산: {asset}")
+    for name, result in results.items():
+        line = f"[{name}] 과열도 {result['heat']['score']:.1f}%"
+        if result['accumulation']['indicators']:
+            line += f" | 축적도 {result['accumulation']['score']:.1f}%"
+        print(line)
+        for group in GROUPS:
+            for indicator, status in result[group]['indicators'].items():
+                print(f"   • {indicator}: {status['value']} {'✅' if status['triggered'] else '❌'}")
+    print("-" * 70)
+    for node, timing in engine.node_timings().items():
+        print(f"   ⏱ {node}: {timing['last_ms']:.2f}ms (계산 {timing['runs']}회 / 재사용 {timing['hits']}회)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
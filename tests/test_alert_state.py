@@ -0,0 +1,79 @@
+from alert_state import AlertState, LevelTracker
+
+
+def heat_level(score):
+    return int(score / 20)
+
+
+def test_jump_commits_only_levels_that_clear_band():
+    tracker = LevelTracker(initial=1, band=3, dwell=0)
+    # 61 -> 레벨 3이지만 60 경계는 band(3)를 넘지 못함 -> 레벨 2까지만
+    assert tracker.update(heat_level(61), 61, heat_level, now=0)
+    assert tracker.level == 2
+
+    assert not tracker.update(heat_level(62), 62, heat_level, now=1)
+    assert tracker.level == 2
+    assert tracker.update(heat_level(63), 63, heat_level, now=2)
+    assert tracker.level == 3
+
+
+def test_jump_down_applies_band_to_each_level():
+    tracker = LevelTracker(initial=4, band=3, dwell=0)
+    assert tracker.update(heat_level(39), 39, heat_level, now=0)
+    assert tracker.level == 2  # 40 경계는 band를 넘지 못함
+
+
+def test_pending_due_at_dwell():
+    tracker = LevelTracker(initial=0, band=0, dwell=600)
+    assert not tracker.update(2, now=100)
+    assert tracker.due_at() == 700
+    assert not tracker.update(2, now=699)
+    assert tracker.update(2, now=700)
+    assert tracker.due_at() is None
+
+
+def test_recheck_scheduled_for_pending(tmp_path):
+    calls = []
+    state = AlertState('test', path=str(tmp_path / 'state.json'),
+                       config={'heat_level': {'band': 0, 'dwell': 600}}, on_due=lambda: calls.append(1))
+    state.level('heat_level', 0)
+    state.update('heat_level', 1)
+    try:
+        assert state.next_due() is not None
+        assert state._timer is not None and state._timer_due == state.next_due()
+    finally:
+        state._timer.cancel()
+    state.update('heat_level', 0)
+    assert state.next_due() is None and state._timer is None
+
+
+def test_halving_alert_reports_committed_level(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # 로그/상태 파일은 임시 디렉터리에
+    from bitcoin_halving_system import BitcoinHalvingStrategy
+
+    strategy = BitcoinHalvingStrategy()
+    config = {key: {'band': 3, 'dwell': 0} for key in ('heat_level', 'accumulation_level', 'halving_phase')}
+    strategy._alert_state = AlertState('test', path=str(tmp_path / 'state.json'), config=config)
+    strategy.alert_state.level('heat_level', 1)
+    strategy.last_heat_level = 1
+
+    sent = []
+    cycle = {'phase': 'mid-bull', 'months_since_halving': 18.0, 'cycle_position': 37.0,
+             'recommendation': '', 'months_to_next_halving': 30.0}
+    heat = {'score': 0}
+    monkeypatch.setattr(strategy, 'get_bitcoin_price_usd', lambda: 100000.0)
+    monkeypatch.setattr(strategy, 'get_bitcoin_price_krw', lambda: 140000000.0)
+    monkeypatch.setattr(strategy, 'calculate_comprehensive_scores', lambda: {
+        'heat_score': heat['score'], 'accumulation_score': 0.0, 'halving_cycle': cycle})
+    monkeypatch.setattr(strategy, 'send_notification',
+                        lambda title, message, key=None, state=None: sent.append((key, state, title)))
+
+    heat['score'] = 61  # 레벨 1 -> 관측 3, band를 넘긴 건 2까지
+    strategy.check_and_alert()
+    heat['score'] = 63  # 60 경계도 band를 넘김 -> 3 확정
+    strategy.check_and_alert()
+
+    heat_alerts = [(state, title) for key, state, title in sent if key == 'heat_level']
+    assert [state for state, _ in heat_alerts] == [2, 3]
+    assert '레벨 2' in heat_alerts[0][1] and '레벨 3' in heat_alerts[1][1]
+    assert strategy.last_heat_level == 3
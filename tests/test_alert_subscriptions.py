@@ -0,0 +1,52 @@
+import pytest
+
+from alert_subscriptions import SubscriptionStore
+
+
+def snapshot(heat_score, heat_level=0):
+    return {'BTC': {'heat': {'score': heat_score, 'level': heat_level}}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SubscriptionStore(str(tmp_path / 'subs.db'), assets=('BTC',))
+
+
+def test_threshold_fires_only_on_crossing(store):
+    store.add('alice', 'heat_score_above', threshold=70)
+    assert store.evaluate(snapshot(60)) == []  # 첫 평가는 상태만 기록
+    alerts = store.evaluate(snapshot(75))
+    assert [(a['user_id'], a['state'], a['previous']) for a in alerts] == [('alice', 1.0, 0.0)]
+    assert store.evaluate(snapshot(80)) == []  # 이미 위에 있음
+    assert store.evaluate(snapshot(65)) == []  # 해제는 조용히
+    assert len(store.evaluate(snapshot(71))) == 1
+
+
+def test_level_change_rule(store):
+    store.add('bob', 'heat_level_change')
+    store.evaluate(snapshot(45, heat_level=2))
+    alerts = store.evaluate(snapshot(61, heat_level=3))
+    assert [(a['previous'], a['state']) for a in alerts] == [(2.0, 3.0)]
+
+
+def test_two_workers_send_transition_once(tmp_path):
+    path = str(tmp_path / 'subs.db')
+    first = SubscriptionStore(path, assets=('BTC',))
+    second = SubscriptionStore(path, assets=('BTC',))
+    first.add('alice', 'heat_score_above', threshold=70)
+    first.evaluate(snapshot(60))
+    second.evaluate(snapshot(60))
+
+    assert len(first.evaluate(snapshot(75))) == 1
+    assert second.evaluate(snapshot(75)) == []  # 비교 후 갱신(CAS)에서 짐
+
+
+def test_add_rejects_untracked_asset_and_non_finite_threshold(store):
+    with pytest.raises(ValueError):
+        store.add('alice', 'heat_score_above', threshold=70, asset='ETH')
+    for threshold in ('nan', float('inf'), None):
+        with pytest.raises(ValueError):
+            store.add('alice', 'heat_score_above', threshold=threshold)
+    with pytest.raises(ValueError):
+        store.add('alice', 'no_such_rule', threshold=1)
+    assert store.list('alice') == []
@@ -0,0 +1,59 @@
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerRegistry
+
+
+def expire(breaker):
+    """복구 대기 시간이 지난 것으로"""
+    breaker.opened_at -= breaker._current_timeout() + 1
+
+
+def test_opens_after_threshold_and_blocks():
+    breaker = CircuitBreaker('binance', failure_threshold=3, recovery_timeout=60)
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure(TimeoutError('timeout'))
+    assert breaker.state == CLOSED
+    breaker.record_failure(TimeoutError('timeout'))
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.to_dict()['last_error'] == 'timeout'
+
+
+def test_half_open_allows_single_probe_and_closes_on_success():
+    breaker = CircuitBreaker('coingecko', failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()  # 시험 호출은 한 번에 하나
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failure_count == 0
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_with_longer_timeout():
+    breaker = CircuitBreaker('upbit', failure_threshold=1, recovery_timeout=60, max_recovery_timeout=100)
+    breaker.record_failure()
+    assert breaker._current_timeout() == 60
+    expire(breaker)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker._current_timeout() == 100  # 120으로 늘지만 최대값에서 멈춤
+    assert not breaker.allow_request()
+
+
+def test_release_probe_returns_half_open_slot():
+    breaker = CircuitBreaker('dunamu', failure_threshold=1)
+    breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow_request()
+    breaker.release_probe()  # 취소된 시험 호출 - 상태는 그대로
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_registry_shares_breaker_per_source():
+    registry = CircuitBreakerRegistry(['binance'], failure_threshold=1)
+    assert registry.get('binance') is registry.get('binance')
+    registry.get('binance').record_failure()
+    assert registry.snapshot()['binance']['state'] == OPEN
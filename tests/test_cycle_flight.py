@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def dashboard(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(tmp_path_factory.mktemp('dashboard'))  # 스냅샷/링/DB 파일은 임시 디렉터리에
+        patch.setenv('PREFORK_WARM_START', '1')  # 수집 스레드를 띄우지 않음
+        import dashboard_with_status
+        yield dashboard_with_status
+
+
+@pytest.fixture
+def cycles(dashboard, monkeypatch):
+    """run_cycle 대신 느린 가짜 사이클 - 실행된 flight 목록"""
+    ran = []
+
+    def fake_run_cycle(flight):
+        ran.append(flight)
+        time.sleep(0.2)
+        flight.finished_at = time.time()
+        flight.done.set()
+
+    monkeypatch.setattr(dashboard, 'run_cycle', fake_run_cycle)
+    monkeypatch.setattr(dashboard, '_flight', None)
+    monkeypatch.setattr(dashboard, 'update_thread', None)
+    return ran
+
+
+def test_concurrent_collects_share_one_cycle(dashboard, cycles):
+    flights = []
+    threads = [threading.Thread(target=lambda: flights.append(dashboard.collect_once())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cycles) == 1
+    assert all(flight is cycles[0] for flight in flights)
+
+
+def test_refresh_joins_then_throttles(dashboard, cycles):
+    status, flight = dashboard.request_refresh()
+    assert status == 'started'
+    assert dashboard.request_refresh() == ('joined', flight)
+    flight.done.wait(5)
+    assert dashboard.request_refresh() == ('throttled', flight)
+    assert len(cycles) == 1
+
+
+def test_refresh_hands_cycle_to_running_loop(dashboard, cycles, monkeypatch):
+    stop = threading.Event()
+    loop = threading.Thread(target=stop.wait, daemon=True)
+    loop.start()
+    woken = []
+    monkeypatch.setattr(dashboard, 'update_thread', loop)
+    monkeypatch.setattr(dashboard.scheduler, 'wake', lambda: woken.append(True))
+    try:
+        status, flight = dashboard.request_refresh()
+        assert status == 'started' and woken == [True]
+        assert not flight.claimed and cycles == []  # 새 스레드 없이 루프에 넘김
+
+        # 깨어난 수집 루프가 그 사이클을 가져가 실행
+        assert dashboard.collect_once() is flight
+        assert cycles == [flight] and flight.done.is_set()
+    finally:
+        stop.set()
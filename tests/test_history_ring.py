@@ -0,0 +1,64 @@
+import pytest
+
+from history_ring import MAX_EPOCH, HistoryRing, to_epoch
+
+
+@pytest.fixture
+def ring(tmp_path):
+    return HistoryRing(str(tmp_path / 'history.ring'), capacity=8, spacing=0)
+
+
+def point(ts, score=50.0):
+    return {'timestamp': ts, 'heat_score': score, 'acc_score': 10.0, 'price': 100.0,
+            'heat_level': 2, 'acc_level': 0}
+
+
+def test_wraparound_keeps_latest_points(ring):
+    for ts in range(1000, 1020):
+        ring.append(point(ts, score=ts - 1000))
+    assert ring.count == 20
+    window = ring.window()
+    # 쓰는 중인 다음 슬롯을 빼고 capacity - 1개
+    assert window['timestamp'].tolist() == list(range(1013, 1020))
+    assert window['heat_score'].tolist() == [float(ts - 1000) for ts in range(1013, 1020)]
+
+
+def test_window_since_until_and_limit(ring):
+    for ts in range(1000, 1006):
+        ring.append(point(ts))
+    assert ring.window(since=1002, until=1004)['timestamp'].tolist() == [1002, 1003, 1004]
+    assert ring.window(limit=2)['timestamp'].tolist() == [1004, 1005]
+    assert ring.window(end=3)['timestamp'].tolist() == [1000, 1001, 1002]  # 스냅샷 시점까지만
+
+
+def test_spacing_skips_dense_points(tmp_path):
+    ring = HistoryRing(str(tmp_path / 'history.ring'), capacity=8, spacing=300)
+    ring.append(point(1000))
+    ring.append(point(1100))
+    ring.append(point(1300))
+    assert ring.window()['timestamp'].tolist() == [1000, 1300]
+
+
+def test_single_writer_and_shared_reader(ring):
+    assert ring.is_writer()
+    reader = HistoryRing(ring.path)
+    assert not reader.is_writer()  # 쓰기 잠금(flock)은 한 곳만
+    count = reader.append(point(1000))  # 읽기 전용은 추가하지 않음
+    assert count == 0 and ring.count == 0
+
+    ring.append(point(1000))
+    assert reader.count == 1  # 같은 파일 매핑으로 바로 보임
+    assert reader.records()[0]['heat_score'] == 50.0
+
+    ring.close()  # 잠금을 놓으면 다른 쪽이 쓰기 가능
+    assert reader.is_writer()
+
+
+def test_to_epoch_rejects_non_finite_and_clamps():
+    for value in ('inf', '-inf', 'nan', '1e400', 'yesterday'):
+        with pytest.raises(ValueError):
+            to_epoch(value)
+    assert to_epoch('-1e30') == 0
+    assert to_epoch('1e30') == MAX_EPOCH
+    assert to_epoch('1700000000.9') == 1700000000
+    assert to_epoch(None) is None and to_epoch('') is None
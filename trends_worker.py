@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Google Trends 저속 레인 워커
+- pytrends 조회(최대 35초, 분당 1회 제한)를 점수 계산 경로에서 분리
+- TrendReq 세션 하나를 재사용하며 자체 주기로 갱신
+- interest_over_time 프레임과 급증 비율(surge ratio)을 캐시
+"""
+
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def surge_ratio_to_score(surge_ratio: float) -> float:
+    """급증 비율을 0-1 점수로 정규화 (1.5배 이상이면 최대값)"""
+    return min((surge_ratio - 1) / 0.5, 1.0) if surge_ratio > 1 else 0
+
+
+class TrendsWorker:
+    """구글 트렌드를 백그라운드에서 주기적으로 갱신하는 워커"""
+
+    def __init__(self, market=None, keyword: str = 'Bitcoin', timeframe: str = 'now 7-d',
+                 interval: float = 900, retry_interval: float = 120):
+        self.market = market
+        self.keyword = keyword
+        self.timeframe = timeframe
+        self.interval = interval
+        self.retry_interval = retry_interval
+
+        self.frame = None
+        self.recent = None
+        self.surge_ratio = None
+        self.last_update = None
+        self.last_error = None
+
+        self._pytrends = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _session(self):
+        """TrendReq 세션 (쿠키/커넥션 재사용)"""
+        if self._pytrends is None:
+            # pytrends는 pandas를 끌고 오므로 워커 스레드에서 첫 갱신 시 로드
+            from market_data import trends_client
+            self._pytrends = trends_client()
+        return self._pytrends
+
+    def _fetch_interest(self):
+        if self.market is not None:
+            self.market.rate_limit('google_trends')
+        pytrends = self._session()
+        pytrends.build_payload([self.keyword], timeframe=self.timeframe)
+        return pytrends.interest_over_time()
+
+    def refresh(self) -> bool:
+        """트렌드 1회 갱신 (성공 여부 반환)"""
+        try:
+            if self.market is not None:
+                interest = self.market.call_upstream('google_trends', self._fetch_interest)
+            else:
+                interest = self._fetch_interest()
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Google Trends 갱신 실패: {e}")
+            return False
+
+        if interest.empty:
+            self.last_error = 'empty interest_over_time frame'
+            return False
+
+        recent = float(interest[self.keyword].iloc[-1])
+        avg = float(interest[self.keyword].mean())
+        surge_ratio = recent / avg if avg > 0 else 1.0
+
+        with self._lock:
+            self.frame = interest
+            self.recent = recent
+            self.surge_ratio = surge_ratio
+            self.last_update = time.time()
+            self.last_error = None
+        logger.info(f"Google Trends 갱신: Recent={recent}, Avg={avg:.1f}, Surge={surge_ratio:.2f}")
+        return True
+
+    def get_trends(self) -> Optional[dict]:
+        """캐시된 최근 관심도/급증 비율 (대기 없음, 아직 없으면 None)"""
+        with self._lock:
+            if self.surge_ratio is None:
+                return None
+            return {'recent': self.recent, 'surge_ratio': self.surge_ratio}
+
+    def get_score(self, default: float = 0.3) -> float:
+        """캐시된 급증 비율로 점수 반환 (대기 없음)"""
+        trends = self.get_trends()
+        if trends is None:
+            return default
+        return surge_ratio_to_score(trends['surge_ratio'])
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                'surge_ratio': self.surge_ratio,
+                'last_update': datetime.fromtimestamp(self.last_update).isoformat() if self.last_update else None,
+                'last_error': self.last_error,
+                'interval': self.interval,
+            }
+
+    def _run(self):
+        while not self._stop.is_set():
+            ok = self.refresh()
+            self._stop.wait(self.interval if ok else self.retry_interval)
+
+    def start(self):
+        """백그라운드 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='trends-worker', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)